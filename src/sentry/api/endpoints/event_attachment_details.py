@@ -4,7 +4,7 @@ from django.http import StreamingHttpResponse
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from sentry import eventstore, features, roles
+from sentry import eventstore, features, options, roles
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases.project import ProjectEndpoint, ProjectPermission
 from sentry.api.serializers import serialize
@@ -49,7 +49,7 @@ class EventAttachmentDetailsEndpoint(ProjectEndpoint):
 
     def download(self, attachment):
         file = File.objects.get(id=attachment.file_id)
-        fp = file.getfile()
+        fp = file.getfile(readahead=options.get("filestore.download-readahead"))
         response = StreamingHttpResponse(
             iter(lambda: fp.read(4096), b""),
             content_type=file.headers.get("content-type", "application/octet-stream"),
@@ -708,6 +708,7 @@ CELERY_IMPORTS = (
     "sentry.tasks.ping",
     "sentry.tasks.post_process",
     "sentry.tasks.process_buffer",
+    "sentry.tasks.ratelimits",
     "sentry.tasks.recap_servers",
     "sentry.tasks.relay",
     "sentry.tasks.release_registry",
@@ -953,6 +954,12 @@ CELERYBEAT_SCHEDULE_REGION = {
         "schedule": crontab(minute="*/5"),
         "options": {"expires": 300},
     },
+    "reap-concurrent-rate-limit-requests": {
+        "task": "sentry.tasks.ratelimits.reap_concurrent_requests",
+        # Run every minute
+        "schedule": crontab(minute="*/1"),
+        "options": {"expires": 60},
+    },
     "clear-expired-raw-events": {
         "task": "sentry.tasks.clear_expired_raw_events",
         # Run every 15 minutes
@@ -3420,6 +3427,9 @@ ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 # Default string indexer cache options
 SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
     "cache_name": "default",
+    # Maximum number of strings kept in a per-process cache in front of the
+    # remote cache. 0 disables the local cache.
+    "local_cache_size": 0,
 }
 SENTRY_POSTGRES_INDEXER_RETRY_COUNT = 2
 
@@ -63,6 +63,17 @@ _METRICS_INDEXER_OPTIONS = [
         default=1,
         type=int,
     ),
+    click.Option(
+        ["--adaptive-batching/--no-adaptive-batching"],
+        default=False,
+        help="Tune batch size and batches in flight from consumer lag and indexer latency.",
+    ),
+    click.Option(["min_msg_batch_size", "--min-msg-batch-size"], type=int, default=10),
+    click.Option(["--max-in-flight-batches"], type=int, default=None),
+    click.Option(
+        ["adaptive_target_latency", "--adaptive-target-latency-ms"], type=int, default=1000
+    ),
+    click.Option(["adaptive_target_lag", "--adaptive-target-lag-ms"], type=int, default=5000),
 ]
 
 _METRICS_LAST_SEEN_UPDATER_OPTIONS = [
@@ -126,6 +126,13 @@ class BaseDeletionTask:
             self.delete_instance(instance)
 
     def delete_children(self, relations):
+        from sentry.deletions.executor import get_executor, throttle
+
+        executor = get_executor(self)
+        if executor is not None:
+            executor.run(relations)
+            return False
+
         # Ideally this runs through the deletion manager
         for relation in relations:
             task = self.manager.get(
@@ -140,6 +147,7 @@ class BaseDeletionTask:
             # by collecting metrics.
             has_more = True
             while has_more:
+                throttle(task)
                 has_more = task.chunk()
                 if has_more:
                     metrics.incr("deletions.should_spawn", tags={"task": type(task).__name__})
@@ -265,16 +273,18 @@ class BulkModelDeletionTask(ModelDeletionTask):
 
         self.partition_key = partition_key
 
-    def chunk(self):
-        return self.delete_instance_bulk()
+    def chunk(self, num_shards=None, shard_id=None):
+        return self.delete_instance_bulk(num_shards=num_shards, shard_id=shard_id)
 
-    def delete_instance_bulk(self):
+    def delete_instance_bulk(self, num_shards=None, shard_id=None):
         try:
             return bulk_delete_objects(
                 model=self.model,
                 limit=self.chunk_size,
                 transaction_id=self.transaction_id,
                 partition_key=self.partition_key,
+                num_shards=num_shards,
+                shard_id=shard_id,
                 **self.query,
             )
         finally:
@@ -4,6 +4,7 @@ from ..base import ModelDeletionTask, ModelRelation
 class ArtifactBundleDeletionTask(ModelDeletionTask):
     def get_child_relations(self, instance):
         from sentry.models import (
+            ArtifactBundleIndex,
             DebugIdArtifactBundle,
             ProjectArtifactBundle,
             ReleaseArtifactBundle,
@@ -13,4 +14,5 @@ class ArtifactBundleDeletionTask(ModelDeletionTask):
             ModelRelation(ReleaseArtifactBundle, {"artifact_bundle_id": instance.id}),
             ModelRelation(DebugIdArtifactBundle, {"artifact_bundle_id": instance.id}),
             ModelRelation(ProjectArtifactBundle, {"artifact_bundle_id": instance.id}),
+            ModelRelation(ArtifactBundleIndex, {"artifact_bundle_id": instance.id}),
         ]
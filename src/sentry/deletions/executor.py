@@ -0,0 +1,287 @@
+"""
+Execution of the child relations of a deletion task.
+
+By default the relations of a task are deleted one after another. With
+``deletions.executor.concurrency`` they are handed to a pool of threads:
+
+- consecutive bulk relations (see ``BulkModelDeletionTask``) whose models have
+  no foreign keys between each other are deleted in parallel,
+- every relation of a model task is split into
+  ``deletions.executor.num-shards`` shards by id, which are deleted
+  concurrently.
+
+All other relations act as barriers, thus the order in which the deletion
+tasks list their relations is kept wherever it matters.
+
+Independently of the concurrency, ``deletions.executor.max-rows-per-second``
+caps the rows deleted per second by all the deletion tasks of a process.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from django.db import connections
+
+from sentry import options
+from sentry.utils import metrics
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled with `rate` tokens per second, holding
+    at most `capacity` tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float) -> float:
+        """
+        Takes `tokens` out of the bucket, waiting until they are available.
+        Requests larger than the capacity wait for a full bucket.
+
+        Returns the seconds waited.
+        """
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+
+            self._sleep(delay)
+            waited += delay
+
+
+_rate_limiter: Optional[TokenBucket] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[TokenBucket]:
+    """
+    Returns the token bucket shared by the deletions of this process, or
+    `None` if the deleted rows are not rate limited.
+    """
+    global _rate_limiter
+
+    rate = options.get("deletions.executor.max-rows-per-second")
+    if not rate:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None or _rate_limiter.rate != rate:
+            _rate_limiter = TokenBucket(rate)
+        return _rate_limiter
+
+
+def throttle(task) -> None:
+    """
+    Waits until `task` may delete its next chunk. A chunk is accounted for
+    with the chunk size of the task, which is the maximum it deletes.
+    """
+    rate_limiter = get_rate_limiter()
+    if rate_limiter is None:
+        return
+
+    waited = rate_limiter.acquire(task.chunk_size)
+    if waited:
+        metrics.timing("deletions.throttled", waited, tags={"task": type(task).__name__})
+
+
+@dataclass
+class RelationProgress:
+    model: str
+    shards: int
+    chunks: int = 0
+    # upper bound, every chunk is counted with the chunk size of its task
+    rows: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def add_chunk(self, rows: int) -> None:
+        with self._lock:
+            self.chunks += 1
+            self.rows += rows
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        duration = self.duration
+        return self.rows / duration if duration else 0.0
+
+
+@lru_cache(maxsize=None)
+def _models_related(model, other) -> bool:
+    if model is other:
+        return True
+    # `get_fields` includes reverse relations, thus one direction is enough.
+    return any(
+        getattr(model_field, "related_model", None) is other
+        for model_field in model._meta.get_fields()
+    )
+
+
+_local = threading.local()
+
+
+class DeletionExecutor:
+    """
+    Deletes the child relations of `task` with up to `concurrency` threads.
+
+    The progress of every relation is kept in `progress`, and reported as
+    metrics and logs once the relation is deleted.
+    """
+
+    def __init__(self, task, concurrency: int, num_shards: int = 1):
+        self.task = task
+        self.concurrency = concurrency
+        self.num_shards = num_shards
+        self.progress: List[RelationProgress] = []
+
+    def _get_task_class(self, relation):
+        if relation.task is not None:
+            return relation.task
+        manager = self.task.manager
+        return manager.tasks.get(relation.params.get("model"), manager.default_task)
+
+    def plan(self, relations) -> List[list]:
+        """
+        Groups consecutive relations into waves. The relations of a wave are
+        deleted in parallel, the waves one after another.
+        """
+        from sentry.deletions.base import BulkModelDeletionTask
+
+        waves: List[list] = []
+        parallel_wave = False
+        for relation in relations:
+            model = relation.params.get("model")
+            parallel = model is not None and issubclass(
+                self._get_task_class(relation), BulkModelDeletionTask
+            )
+            if (
+                parallel
+                and parallel_wave
+                and not any(_models_related(model, other.params["model"]) for other in waves[-1])
+            ):
+                waves[-1].append(relation)
+            else:
+                waves.append([relation])
+            parallel_wave = parallel
+
+        return waves
+
+    def _get_num_shards(self, relation) -> int:
+        from sentry.deletions.base import ModelDeletionTask
+
+        if relation.params.get("model") is None:
+            return 1
+        if not issubclass(self._get_task_class(relation), ModelDeletionTask):
+            return 1
+        return self.num_shards
+
+    def _delete_shard(self, relation, progress: RelationProgress, num_shards: int, shard_id: int):
+        _local.active = True
+        try:
+            task = self.task.manager.get(
+                transaction_id=self.task.transaction_id,
+                actor_id=self.task.actor_id,
+                task=relation.task,
+                **relation.params,
+            )
+            kwargs = {"num_shards": num_shards, "shard_id": shard_id} if num_shards > 1 else {}
+            has_more = True
+            while has_more:
+                throttle(task)
+                has_more = task.chunk(**kwargs)
+                progress.add_chunk(task.chunk_size)
+        finally:
+            _local.active = False
+            # Every thread uses its own connections, do not leave them behind in the pool.
+            connections.close_all()
+
+    def _report(self, progress: RelationProgress):
+        progress.finished = time.monotonic()
+        tags = {"model": progress.model}
+        metrics.incr("deletions.relation.chunks", amount=progress.chunks, tags=tags)
+        metrics.timing("deletions.relation.duration", progress.duration, tags=tags)
+        self.task.logger.info(
+            "object.delete.relation_executed",
+            extra={
+                "transaction_id": self.task.transaction_id,
+                "model": progress.model,
+                "shards": progress.shards,
+                "chunks": progress.chunks,
+                "rows": progress.rows,
+                "duration": progress.duration,
+                "rows_per_second": progress.rows_per_second,
+            },
+        )
+
+    def run(self, relations) -> None:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for wave in self.plan(relations):
+                futures = []
+                wave_progress = []
+                for relation in wave:
+                    model = relation.params.get("model")
+                    num_shards = self._get_num_shards(relation)
+                    progress = RelationProgress(
+                        model=model.__name__ if model is not None else relation.task.__name__,
+                        shards=num_shards,
+                    )
+                    self.progress.append(progress)
+                    wave_progress.append(progress)
+                    for shard_id in range(num_shards):
+                        futures.append(
+                            pool.submit(
+                                self._delete_shard, relation, progress, num_shards, shard_id
+                            )
+                        )
+
+                # The next wave may depend on this one, wait for it and raise its errors.
+                for future in futures:
+                    future.result()
+                for progress in wave_progress:
+                    self._report(progress)
+
+
+def get_executor(task) -> Optional[DeletionExecutor]:
+    """
+    Returns the executor for the child relations of `task`, or `None` if they
+    are to be deleted sequentially.
+
+    Relations of tasks which already run in an executor thread are deleted
+    sequentially, so that the number of threads stays bounded.
+    """
+    concurrency = options.get("deletions.executor.concurrency")
+    if concurrency <= 1 or getattr(_local, "active", False):
+        return None
+    return DeletionExecutor(
+        task, concurrency=concurrency, num_shards=options.get("deletions.executor.num-shards")
+    )
@@ -58,7 +58,17 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_chunks",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options: Any) -> None:
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -168,6 +178,41 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    def digest_chunks(
+        self, key: str, chunk_size: int = 1000, minimum_delay: Optional[int] = None
+    ) -> Any:
+        """
+        Extract records from a timeline for processing, in chunks.
+
+        This behaves like ``digest``, except that the target of the ``as``
+        clause is an iterator of record sequences of at most ``chunk_size``
+        records each (newest first), which are only fetched as the iterator is
+        consumed. This allows very large timelines to be processed without
+        holding all of their records in memory at once.
+
+        When the context manager exits successfully, only the records that
+        were actually read are removed from the timeline.
+        """
+        raise NotImplementedError
+
+    def digest_many(self, timelines: Mapping[str, Optional[int]]) -> Any:
+        """
+        Extract records from several timelines at once.
+
+        ``timelines`` maps timeline keys to their minimum delay (or ``None``
+        to use the backend default.) This method acts as a context manager,
+        and the target of the ``as`` clause is a mapping of timeline keys to
+        their records. Timelines that are not in the "ready" state, or that
+        are currently being digested elsewhere, are omitted.
+
+        When the context manager exits successfully, every digest that is
+        still contained in the mapping is closed as with ``digest``. Removing
+        a timeline from the mapping leaves its records in place so they are
+        delivered the next time the timeline is digested. If an exception is
+        raised, none of the digests are closed.
+        """
+        raise NotImplementedError
+
     def schedule(
         self, deadline: float, timestamp: Optional[float] = None
     ) -> Optional[Iterable["ScheduleEntry"]]:
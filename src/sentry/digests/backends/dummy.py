@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional
 
 from sentry.digests.backends.base import Backend
 
@@ -26,6 +26,16 @@ class DummyBackend(Backend):
     def digest(self, key: str, minimum_delay: Optional[int] = None) -> Any:
         yield []
 
+    @contextmanager
+    def digest_chunks(
+        self, key: str, chunk_size: int = 1000, minimum_delay: Optional[int] = None
+    ) -> Any:
+        yield iter(())
+
+    @contextmanager
+    def digest_many(self, timelines: Mapping[str, Optional[int]]) -> Any:
+        yield {}
+
     def schedule(
         self, deadline: float, timestamp: Optional[float] = None
     ) -> Optional[Iterable["ScheduleEntry"]]:
@@ -1,14 +1,16 @@
 import logging
 import time
+from collections import defaultdict
 from contextlib import contextmanager
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from rb.clients import LocalClient
 from redis.exceptions import ResponseError
 
 from sentry.digests import Record, ScheduleEntry
 from sentry.digests.backends.base import Backend, InvalidState
-from sentry.utils.locking.backends.redis import RedisLockBackend
+from sentry.utils import metrics
+from sentry.utils.locking.backends.redis import RedisLockBackend, delete_lock
 from sentry.utils.locking.lock import Lock
 from sentry.utils.locking.manager import LockManager
 from sentry.utils.redis import check_cluster_versions, get_cluster_from_options, load_script
@@ -141,7 +143,7 @@ class RedisBackend(Backend):
 
     def __schedule_partition(
         self, host: int, deadline: float, timestamp: float
-    ) -> Iterable[Tuple[bytes, float]]:
+    ) -> Sequence[Tuple[bytes, float]]:
         return script(
             self.cluster.get_local_client(host),
             ["-"],
@@ -156,7 +158,12 @@ class RedisBackend(Backend):
 
         for host in self.cluster.hosts:
             try:
-                for key, timestamp in self.__schedule_partition(host, deadline, timestamp):
+                with metrics.timer("digests.schedule.partition", tags={"partition": host}):
+                    entries = self.__schedule_partition(host, deadline, timestamp)
+                metrics.incr(
+                    "digests.schedule.entries", amount=len(entries), tags={"partition": host}
+                )
+                for key, timestamp in entries:
                     yield ScheduleEntry(key.decode("utf-8"), float(timestamp))
             except Exception as error:
                 logger.error(
@@ -177,7 +184,8 @@ class RedisBackend(Backend):
 
         for host in self.cluster.hosts:
             try:
-                self.__maintenance_partition(host, deadline, timestamp)
+                with metrics.timer("digests.maintenance.partition", tags={"partition": host}):
+                    self.__maintenance_partition(host, deadline, timestamp)
             except Exception as error:
                 logger.error(
                     f"Failed to perform maintenance on digest partition {host} due to error: {error}",
@@ -215,29 +223,8 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
-            ]
-
-            # If the record value is `None`, this means the record data was
-            # missing (it was presumably evicted by Redis) so we don't need to
-            # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
-            yield filtered_records
+            records = self.__decode_records(response)
+            yield self.__filter_missing_records(key, records)
 
             script(
                 connection,
@@ -246,6 +233,241 @@ class RedisBackend(Backend):
                 + [record.key for record in records],
             )
 
+    def __decode_records(self, response: Iterable[Tuple[bytes, Any, Any]]) -> List[Record]:
+        return [
+            Record(
+                key.decode(),
+                self.codec.decode(value) if value is not None else None,
+                float(timestamp),
+            )
+            for key, value, timestamp in response
+        ]
+
+    def __filter_missing_records(self, key: str, records: Sequence[Record]) -> List[Record]:
+        # If the record value is `None`, this means the record data was
+        # missing (it was presumably evicted by Redis) so we don't need to
+        # return it here.
+        filtered_records = [record for record in records if record.value is not None]
+        if len(records) != len(filtered_records):
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(records),
+                    "filtered_record_count": len(filtered_records),
+                },
+            )
+        return filtered_records
+
+    @contextmanager
+    def digest_chunks(
+        self,
+        key: str,
+        chunk_size: int = 1000,
+        minimum_delay: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> Any:
+        if minimum_delay is None:
+            minimum_delay = self.minimum_delay
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        connection = self._get_connection(key)
+        # Reading a large digest in chunks takes longer than reading it all at
+        # once, so hold on to the lock for as long as the scheduler waits
+        # before considering a timeline stuck.
+        with self._get_timeline_lock(key, duration=300).acquire():
+            try:
+                size = script(
+                    connection,
+                    [key],
+                    [
+                        "DIGEST_PREPARE",
+                        self.namespace,
+                        self.ttl,
+                        timestamp,
+                        key,
+                        self.capacity if self.capacity else -1,
+                    ],
+                )
+            except ResponseError as e:
+                if "err(invalid_state):" in str(e):
+                    raise InvalidState("Timeline is not in the ready state.") from e
+                else:
+                    raise
+
+            # Only the keys of the records that were actually read are kept
+            # around, so that they (and only they) can be removed when the
+            # digest is closed. Anything left unread stays in the digest set
+            # and will be part of the next delivery.
+            record_keys: List[str] = []
+
+            def chunks() -> Iterator[List[Record]]:
+                for start in range(0, size, chunk_size):
+                    response = script(
+                        connection,
+                        [key],
+                        [
+                            "DIGEST_READ",
+                            self.namespace,
+                            self.ttl,
+                            timestamp,
+                            key,
+                            start,
+                            start + chunk_size - 1,
+                        ],
+                    )
+                    records = self.__decode_records(response)
+                    record_keys.extend(record.key for record in records)
+                    yield self.__filter_missing_records(key, records)
+
+            yield chunks()
+
+            script(
+                connection,
+                [key],
+                ["DIGEST_CLOSE", self.namespace, self.ttl, timestamp, key, minimum_delay]
+                + record_keys,
+            )
+
+    def __get_timeline_lock_key(self, key: str) -> str:
+        return self.locks.backend.prefix_key(f"{self.namespace}:t:{key}")
+
+    def __open_partition(
+        self,
+        host: int,
+        keys: Sequence[str],
+        timestamp: float,
+        lock_duration: int,
+    ) -> Tuple[List[str], MutableMapping[str, List[Record]]]:
+        """
+        Lock and open the digests for all of the given timelines on a single
+        partition, returning the timelines that were locked and the records of
+        the ones that were successfully opened.
+        """
+        client = self.cluster.get_local_client(host)
+
+        # Acquire the same locks that ``digest`` uses, so that the bulk and
+        # single timeline paths can safely run side by side.
+        with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.set(
+                    self.__get_timeline_lock_key(key),
+                    self.locks.backend.uuid,
+                    ex=lock_duration,
+                    nx=True,
+                )
+            acquired = [key for key, locked in zip(keys, pipe.execute()) if locked]
+
+        with client.pipeline(transaction=False) as pipe:
+            for key in acquired:
+                script(
+                    pipe,
+                    [key],
+                    [
+                        "DIGEST_OPEN",
+                        self.namespace,
+                        self.ttl,
+                        timestamp,
+                        key,
+                        self.capacity if self.capacity else -1,
+                    ],
+                )
+            responses = pipe.execute(raise_on_error=False)
+
+        digests: MutableMapping[str, List[Record]] = {}
+        for key, response in zip(acquired, responses):
+            if isinstance(response, ResponseError):
+                if "err(invalid_state):" in str(response):
+                    logger.info("Skipped digest of timeline %s not in the ready state", key)
+                else:
+                    logger.error(
+                        f"Failed to open digest {key} due to error: {response}",
+                        extra={"partition": host},
+                    )
+                continue
+            digests[key] = self.__decode_records(response)
+
+        return acquired, digests
+
+    def __close_partition(
+        self,
+        host: int,
+        locked: Sequence[str],
+        digests: Mapping[str, Sequence[Record]],
+        minimum_delays: Mapping[str, Optional[int]],
+        timestamp: float,
+    ) -> None:
+        """
+        Close the given digests and release the locks of all the given locked
+        timelines on a single partition, in one round trip.
+        """
+        client = self.cluster.get_local_client(host)
+        with client.pipeline(transaction=False) as pipe:
+            for key, records in digests.items():
+                minimum_delay = minimum_delays.get(key)
+                if minimum_delay is None:
+                    minimum_delay = self.minimum_delay
+                script(
+                    pipe,
+                    [key],
+                    ["DIGEST_CLOSE", self.namespace, self.ttl, timestamp, key, minimum_delay]
+                    + [record.key for record in records],
+                )
+            for key in locked:
+                delete_lock(pipe, (self.__get_timeline_lock_key(key),), (self.locks.backend.uuid,))
+            for response in pipe.execute(raise_on_error=False):
+                if isinstance(response, ResponseError):
+                    logger.error(
+                        f"Failed to close digest on partition {host} due to error: {response}"
+                    )
+
+    @contextmanager
+    def digest_many(
+        self, timelines: Mapping[str, Optional[int]], timestamp: Optional[float] = None
+    ) -> Any:
+        if timestamp is None:
+            timestamp = time.time()
+
+        router = self.cluster.get_router()
+        partitions: MutableMapping[int, List[str]] = defaultdict(list)
+        for key in timelines:
+            partitions[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+        # The raw records (including any that were evicted) are kept per
+        # partition so that all of them can be removed when closing.
+        locked: MutableMapping[int, List[str]] = {}
+        opened: MutableMapping[int, MutableMapping[str, List[Record]]] = {}
+        result: MutableMapping[str, List[Record]] = {}
+        try:
+            for host, keys in partitions.items():
+                with metrics.timer("digests.digest_many.open", tags={"partition": host}):
+                    locked[host], opened[host] = self.__open_partition(
+                        host, keys, timestamp, lock_duration=30
+                    )
+                metrics.incr(
+                    "digests.digest_many.claimed",
+                    amount=len(opened[host]),
+                    tags={"partition": host},
+                )
+                for key, records in opened[host].items():
+                    result[key] = self.__filter_missing_records(key, records)
+
+            yield result
+        except Exception:
+            # Nothing is closed, but the locks still need to be released.
+            for host, keys in locked.items():
+                self.__close_partition(host, keys, {}, timelines, timestamp)
+            raise
+
+        for host, keys in locked.items():
+            # Callers can skip closing individual digests (leaving them to be
+            # retried later) by removing them from the yielded mapping.
+            digests = {key: records for key, records in opened[host].items() if key in result}
+            with metrics.timer("digests.digest_many.close", tags={"partition": host}):
+                self.__close_partition(host, keys, digests, timelines, timestamp)
+
     def delete(self, key: str, timestamp: Optional[float] = None) -> None:
         if timestamp is None:
             timestamp = time.time()
@@ -3,8 +3,11 @@ from __future__ import annotations
 import functools
 import itertools
 import logging
-from collections import defaultdict, namedtuple
-from typing import Any, Mapping, MutableMapping, MutableSequence, Sequence
+from collections import ChainMap, Counter, defaultdict, namedtuple
+from datetime import datetime
+from typing import Any
+from typing import Counter as CounterType
+from typing import Iterable, Mapping, MutableMapping, MutableSequence, Sequence
 
 from sentry import tsdb
 from sentry.digests import Digest, Record
@@ -217,3 +220,111 @@ def build_digest(
 
     digest, logs = pipeline(records)
     return digest, logs
+
+
+def build_digest_from_chunks(
+    project: Project,
+    chunks: Iterable[Sequence[Record]],
+    max_groups: int = 100,
+    max_records_per_group: int = 10,
+) -> tuple[Digest | None, Sequence[str]]:
+    """
+    Build a digest from an iterator of record chunks (newest first), such as
+    the one provided by ``digests.digest_chunks``.
+
+    Unlike ``build_digest``, the records are aggregated incrementally: only
+    per-group record counts and the newest ``max_records_per_group`` records
+    of every rule and group are retained, and at most ``max_groups`` groups
+    are rendered. To keep memory bounded regardless of the timeline size,
+    whenever more than twice that many groups are being tracked the least
+    active ones are evicted, which makes the group selection approximate for
+    very noisy timelines.
+    """
+    logs: list[str] = []
+    groups: dict[int, Group] = {}
+    rules: dict[int, Rule] = {}
+    counts: CounterType[int] = Counter()
+    # The status of a group does not change while the digest is built.
+    filtered_group_ids: set[int] = set()
+    retained: dict[tuple[int, int], list[Record]] = defaultdict(list)
+    start: datetime | None = None
+    end: datetime | None = None
+    total = 0
+
+    def prune(size: int) -> None:
+        keep = {group_id for group_id, _ in counts.most_common(size)}
+        for group_id in list(counts):
+            if group_id not in keep:
+                del counts[group_id]
+                groups.pop(group_id, None)
+        for rule_group in list(retained):
+            if rule_group[1] not in keep:
+                del retained[rule_group]
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        total += len(chunk)
+
+        # Chunks, and the records within them, are in reverse chronological order.
+        if end is None:
+            end = chunk[0].datetime
+        start = chunk[-1].datetime
+
+        missing_group_ids = (
+            {record.value.event.group_id for record in chunk} - groups.keys() - filtered_group_ids
+        )
+        missing_rule_ids = {
+            rule_id for record in chunk for rule_id in record.value.rules
+        } - rules.keys()
+        new_groups = Group.objects.in_bulk(missing_group_ids)
+        new_rules = Rule.objects.in_bulk(missing_rule_ids)
+        attach_state(project, new_groups, new_rules, {}, {})
+        rules.update(new_rules)
+
+        # Groups are only tracked once one of their records passed the filters, so that
+        # filtered groups are neither kept in memory nor queried from tsdb.
+        chunk_groups = ChainMap(groups, new_groups)
+        for record in chunk:
+            rewritten = rewrite_record(record, project, chunk_groups, rules)
+            if rewritten is None or not rewritten.value.rules:
+                continue
+            group = rewritten.value.event.group
+            if not check_group_state(rewritten):
+                filtered_group_ids.add(group.id)
+                continue
+
+            groups.setdefault(group.id, group)
+            counts[group.id] += 1
+            for rule in rewritten.value.rules:
+                rule_group_records = retained[(rule.id, group.id)]
+                if len(rule_group_records) < max_records_per_group:
+                    rule_group_records.append(rewritten)
+
+        if len(counts) > max_groups * 2:
+            prune(max_groups)
+
+    logs.append(f"Aggregated {total} records into {len(counts)} groups.")
+    if not counts:
+        return None, logs
+
+    prune(max_groups)
+
+    tenant_ids = {"organization_id": project.organization_id}
+    group_ids = list(groups.keys())
+    for group_id, event_count in tsdb.get_sums(
+        TSDBModel.group, group_ids, start, end, tenant_ids=tenant_ids
+    ).items():
+        groups[group_id].event_count = event_count
+    for group_id, user_count in tsdb.get_distinct_counts_totals(
+        TSDBModel.users_affected_by_group, group_ids, start, end, tenant_ids=tenant_ids
+    ).items():
+        groups[group_id].user_count = user_count
+
+    digest: Digest = defaultdict(dict)
+    for (rule_id, group_id), records in retained.items():
+        if records:
+            digest[rules[rule_id]][groups[group_id]] = records
+
+    logs.append(f"Built digest with {len(digest)} rules from {len(counts)} groups.")
+    return sort_rule_groups(sort_group_contents(digest)), logs
@@ -2,6 +2,7 @@ import sentry_sdk
 from symbolic.proguard import ProguardMapper
 from symbolic.sourcemap import SourceView
 
+from sentry import options
 from sentry.lang.java.processing import deobfuscate_exception_value
 from sentry.lang.java.utils import (
     deobfuscate_view_hierarchy,
@@ -140,6 +141,8 @@ class JavaSourceLookupStacktraceProcessor(StacktraceProcessor):
         self.images = get_jvm_images(self.data)
         self._archives = []
         self.available = len(self.images) > 0
+        # Whether all the debug files of the event were found, only then processed frames are cached.
+        self._has_all_debug_files = False
 
     def close(self):
         for archive in self._archives:
@@ -154,16 +157,41 @@ class JavaSourceLookupStacktraceProcessor(StacktraceProcessor):
         self._handles_frame = platform == "java" and self.available and "module" in frame
         return self._proguard_processor_handles_frame or self._handles_frame
 
+    def preprocess_frame(self, processable_frame):
+        if options.get("processing.frame-cache.java"):
+            # The debug ids identify the contents of the mapping files and source bundles.
+            processable_frame.set_cache_key_from_values(
+                [
+                    self.project.id,
+                    sorted(self.proguard_processor.images),
+                    sorted(self.images),
+                    self.data.get("platform"),
+                    processable_frame.frame,
+                ]
+            )
+
     def preprocess_step(self, processing_task):
         proguard_processor_preprocess_rv = False
+        has_all_mappings = True
         if self._proguard_processor_handles_frame:
             proguard_processor_preprocess_rv = self.proguard_processor.preprocess_step(
                 processing_task
             )
+            has_all_mappings = len(self.proguard_processor.mapping_views) == len(
+                self.proguard_processor.images
+            )
 
         if not self.available:
+            self._has_all_debug_files = has_all_mappings
             return proguard_processor_preprocess_rv
 
+        # Source bundles are only needed to process the frames not restored from the frame cache.
+        if all(
+            processable_frame.cache_value is not None
+            for processable_frame in processing_task.iter_processable_frames(self)
+        ):
+            return True
+
         difs = ProjectDebugFile.objects.find_by_debug_ids(self.project, self.images)
         for key, dif in difs.items():
             try:
@@ -172,6 +200,7 @@ class JavaSourceLookupStacktraceProcessor(StacktraceProcessor):
             except Exception:
                 pass
 
+        self._has_all_debug_files = has_all_mappings and len(self._archives) == len(self.images)
         return proguard_processor_preprocess_rv or self.available
 
     def process_exception(self, exception):
@@ -218,6 +247,15 @@ class JavaSourceLookupStacktraceProcessor(StacktraceProcessor):
         return "~/" + source_file_name
 
     def process_frame(self, processable_frame, processing_task):
+        if processable_frame.cache_value is not None:
+            return processable_frame.cache_value
+
+        rv = self._process_frame(processable_frame, processing_task)
+        if self._has_all_debug_files and rv is not None and rv[0] and not rv[2]:
+            processable_frame.set_cache_value(rv)
+        return rv
+
+    def _process_frame(self, processable_frame, processing_task):
         new_frames = None
         raw_frames = None
         processing_errors = None
@@ -1,8 +1,14 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional, Tuple
+
 from symbolic.sourcemap import SourceView
 
+from sentry import options
+from sentry.utils import metrics
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "ParsedSourceCache", "get_parsed_source_cache"]
 
 
 def is_utf8(codec):
@@ -90,3 +96,110 @@ class SourceMapCache:
             sourcemap = self.get(sourcemap_url)
             return (sourcemap_url, sourcemap)
         return (None, None)
+
+
+class ParsedSourceCache:
+    """
+    A byte budgeted LRU of parsed `SourceView`s and `SmCache`s that is shared
+    by all events processed in a worker, so that the same minified bundle or
+    sourcemap is only parsed once instead of once per event.
+
+    Keys are tuples starting with a kind and the release id, e.g.
+    `("sourceview", release_id, dist, url)`. Every entry remembers the
+    checksum of the content it was parsed from. Looking it up with another
+    checksum means the artifact was re-uploaded, and the stale entry is
+    replaced.
+
+    This is the only invalidation there is: the cache lives in every worker
+    process, thus the process uploading artifacts can not drop the entries.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._size = 0
+        self._entries: "OrderedDict[Hashable, Tuple[str, Any, int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get_or_parse(
+        self, key: Hashable, checksum: str, size: int, parse: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the entry stored under `key` if it was parsed from content
+        with the given `checksum`, otherwise calls `parse` and stores its
+        result with `size` bytes. Exceptions of `parse` are not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == checksum:
+                self._entries.move_to_end(key)
+                metrics.incr("sourcemaps.parsed_cache", tags={"result": "hit"})
+                return entry[1]
+
+        metrics.incr(
+            "sourcemaps.parsed_cache", tags={"result": "miss" if entry is None else "stale"}
+        )
+        value = parse()
+        if size > self.max_size:
+            return value
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (checksum, value, size)
+            self._size += size
+            self._evict()
+
+        return value
+
+    def resize(self, max_size: int) -> None:
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+    def _evict(self) -> None:
+        evicted = 0
+        while self._size > self.max_size:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._size -= size
+            evicted += 1
+
+        if evicted:
+            metrics.incr("sourcemaps.parsed_cache.evicted", amount=evicted)
+        metrics.gauge("sourcemaps.parsed_cache.size", self._size)
+
+
+_parsed_source_cache: Optional[ParsedSourceCache] = None
+
+
+def get_parsed_source_cache() -> Optional[ParsedSourceCache]:
+    """
+    Returns the parsed source cache of this process, sized by the
+    `sourcemaps.parsed-cache.max-size` option, or None if it is disabled.
+    """
+    global _parsed_source_cache
+
+    max_size = options.get("sourcemaps.parsed-cache.max-size")
+    if not max_size:
+        _parsed_source_cache = None
+    elif _parsed_source_cache is None:
+        _parsed_source_cache = ParsedSourceCache(max_size)
+    elif _parsed_source_cache.max_size != max_size:
+        _parsed_source_cache.resize(max_size)
+
+    return _parsed_source_cache
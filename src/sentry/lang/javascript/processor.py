@@ -3,33 +3,41 @@ from __future__ import annotations
 import base64
 import binascii
 import errno
+import hashlib
 import logging
 import re
 import sys
+import threading
 import time
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from io import BytesIO
 from itertools import groupby
 from os.path import splitext
-from typing import IO, Callable, Optional, Tuple
+from typing import IO, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
 from urllib.parse import urlsplit
 
 import sentry_sdk
+from cachetools import TTLCache
 from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
 from django.utils.encoding import force_bytes, force_str
 from requests.utils import get_encoding_from_headers
+from sentry_sdk import Hub
 from symbolic.sourcemap import SourceView
 from symbolic.sourcemapcache import SourceMapCache as SmCache
 
 from sentry import features, http, options
 from sentry.event_manager import set_tag
+from sentry.lang.javascript.cache import get_parsed_source_cache
 from sentry.models import (
     NULL_STRING,
     ArtifactBundle,
     ArtifactBundleArchive,
+    ArtifactBundleIndex,
     EventError,
     Organization,
     ReleaseFile,
@@ -457,6 +465,66 @@ def get_index_entry(release, dist, url) -> Optional[dict]:
     return None
 
 
+# In-process cache of the artifact bundle index lookups, keyed by the release/dist pair, the project and the looked up
+# urls or debug id. Files that are not indexed are cached as well. Only cached for a short time, so that newly uploaded
+# bundles are picked up.
+_artifact_bundle_index_lookups: TTLCache = TTLCache(maxsize=10000, ttl=60)
+_artifact_bundle_index_lookups_lock = threading.Lock()
+_NOT_CACHED = object()
+
+
+@metrics.wraps("sourcemaps.lookup_artifact_bundle_index")
+def lookup_artifact_bundle_index(
+    organization_id,
+    project_id,
+    release_name,
+    dist_name,
+    urls=None,
+    debug_id=None,
+    source_file_type=None,
+) -> Optional[Tuple[int, str]]:
+    """
+    Looks up a file either by any of its `urls` or by its `debug_id` and `source_file_type` in the precomputed index of
+    the artifact bundles of a release/dist pair that are bound to the project, see `ArtifactBundleIndex`.
+
+    Returns the tuple (artifact_bundle_id, file_path) of the most recently uploaded bundle containing the file.
+    """
+    cache_key = (
+        organization_id,
+        project_id,
+        release_name,
+        dist_name,
+        tuple(urls or ()),
+        debug_id,
+        source_file_type,
+    )
+    with _artifact_bundle_index_lookups_lock:
+        entry = _artifact_bundle_index_lookups.get(cache_key, _NOT_CACHED)
+    if entry is not _NOT_CACHED:
+        return entry
+
+    entries = ArtifactBundleIndex.objects.filter(
+        organization_id=organization_id,
+        release_name=release_name,
+        dist_name=dist_name,
+        artifact_bundle__projectartifactbundle__project_id=project_id,
+    )
+    if debug_id is not None:
+        entries = entries.filter(debug_id=debug_id, source_file_type=source_file_type)
+    else:
+        entries = entries.filter(url__in=urls)
+    entry = (
+        entries.order_by("-artifact_bundle__date_uploaded", "-artifact_bundle_id")
+        .values_list("artifact_bundle_id", "file_path")
+        .first()
+    )
+
+    with _artifact_bundle_index_lookups_lock:
+        _artifact_bundle_index_lookups[cache_key] = entry
+
+    return entry
+
+
 @metrics.wraps("sourcemaps.fetch_release_archive")
 def fetch_release_archive_for_url(release, dist, url) -> Optional[IO[bytes]]:
     """Fetch release archive and cache if possible.
@@ -669,6 +737,41 @@ INVALID_ARCHIVE = type("INVALID_ARCHIVE", (), {})()
 # the system from loading an arbitrarily big number of artifacts that might cause high memory and cpu usage.
 MAX_ARTIFACTS_NUMBER = 5
 
+# Thread pool shared by all events of a worker to fetch their files concurrently, see `Fetcher.prefetch`.
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_lock = threading.Lock()
+# Bounds the concurrent fetches of a single organization on the shared thread pool.
+_organization_fetch_slots: Dict[int, Tuple[int, threading.BoundedSemaphore]] = {}
+
+
+def get_fetch_executor(max_workers):
+    """
+    Returns the thread pool used to prefetch files, resized to `max_workers` threads if the option changed.
+    """
+    global _fetch_executor
+
+    with _fetch_executor_lock:
+        if _fetch_executor is None or _fetch_executor._max_workers != max_workers:
+            if _fetch_executor is not None:
+                _fetch_executor.shutdown(wait=False)
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="sourcemaps-fetch"
+            )
+            _organization_fetch_slots.clear()
+        return _fetch_executor
+
+
+def get_organization_fetch_slots(organization_id, limit):
+    limit = max(1, limit)
+    with _fetch_executor_lock:
+        slots = _organization_fetch_slots.get(organization_id)
+        if slots is None or slots[0] != limit:
+            slots = _organization_fetch_slots[organization_id] = (
+                limit,
+                threading.BoundedSemaphore(limit),
+            )
+        return slots[1]
+
 
 class Fetcher:
     """
@@ -694,6 +797,14 @@ class Fetcher:
         # Set that contains all the tuples (release, dist) of a bundle for which the query returned an empty result.
         # Here we also don't put the project for the same reasoning as above.
         self.empty_result_for_releases = set()
+        # Outcomes of the fetches done by `prefetch`, indexed by the fetch method and its arguments. Each one is handed
+        # out once, to the first call of the method with the same arguments.
+        self.prefetched = {}
+        # Guards `open_archives` and `archive_locks` against concurrent fetches, it is never held while fetching.
+        self.archives_lock = threading.Lock()
+        # Mappings between bundle_id -> Lock held while opening the bundle, so that different bundles are downloaded
+        # concurrently, while a bundle shared by many files is only downloaded once.
+        self.archive_locks = {}
 
     def bind_release(self, release=None, dist=None):
         """
@@ -706,7 +817,10 @@ class Fetcher:
         """
         Closes all the open archives in cache.
         """
-        for _, open_archive in self.open_archives.items():
+        self.prefetched.clear()
+        with self.archives_lock:
+            open_archives = list(self.open_archives.values())
+        for open_archive in open_archives:
             if open_archive is not INVALID_ARCHIVE:
                 open_archive.close()
 
@@ -714,7 +828,10 @@ class Fetcher:
         """
         Looks up in open archives if there is one that contains a matching file with debug_id and source_file_type.
         """
-        for artifact_bundle_id, open_archive in self.open_archives.items():
+        with self.archives_lock:
+            open_archives = list(self.open_archives.items())
+
+        for artifact_bundle_id, open_archive in open_archives:
             if open_archive is INVALID_ARCHIVE:
                 continue
 
@@ -731,6 +848,55 @@ class Fetcher:
 
         return None
 
+    def _get_open_archive(self, artifact_bundle_id):
+        with self.archives_lock:
+            return self.open_archives.get(artifact_bundle_id)
+
+    def _open_archive(self, artifact_bundle_id, get_artifact_bundle):
+        """
+        Returns the open archive of the ArtifactBundle with the given id, or INVALID_ARCHIVE if it can't be opened.
+
+        Unless the archive is already open, the bundle returned by `get_artifact_bundle` is fetched and opened. Only
+        one fetch at a time opens a given bundle, while different bundles are opened concurrently.
+        """
+        with self.archives_lock:
+            archive = self.open_archives.get(artifact_bundle_id)
+            if archive is not None:
+                return archive
+            archive_lock = self.archive_locks.setdefault(artifact_bundle_id, threading.Lock())
+
+        with archive_lock:
+            # Another fetch might have opened the bundle while we were waiting.
+            archive = self._get_open_archive(artifact_bundle_id)
+            if archive is not None:
+                return archive
+
+            archive = INVALID_ARCHIVE
+            try:
+                # In case the local cache doesn't have the archive, we will try to load it from memcached and then
+                # directly from the source.
+                with sentry_sdk.start_span(op="Fetcher._open_archive._fetch_artifact_bundle_file"):
+                    artifact_bundle_file = self._fetch_artifact_bundle_file(get_artifact_bundle())
+            except Exception as exc:
+                logger.debug("Failed to fetch artifact bundle %s", artifact_bundle_id, exc_info=exc)
+            else:
+                try:
+                    # We load the entire bundle into an archive and cache it locally. It is very important that this
+                    # opened archive is closed before the processing ends.
+                    with sentry_sdk.start_span(op="Fetcher._open_archive.ArtifactBundleArchive"):
+                        archive = ArtifactBundleArchive(artifact_bundle_file)
+                except Exception as exc:
+                    artifact_bundle_file.seek(0)
+                    logger.debug(
+                        "Failed to initialize archive for the artifact bundle file",
+                        exc_info=exc,
+                        extra={"contents": base64.b64encode(artifact_bundle_file.read(256))},
+                    )
+
+            with self.archives_lock:
+                self.open_archives[artifact_bundle_id] = archive
+            return archive
+
     def _get_artifact_bundle_entry_by_debug_id(self, debug_id, source_file_type):
         """
         Gets the DebugIdArtifactBundle entry that maps the debug_id and source_file_type to a specific ArtifactBundle.
@@ -778,6 +944,11 @@ class Fetcher:
 
         The File object represents the actual .zip bundle file which contains all the required artifacts.
         """
+        # The bundles cached on the local disk are memory mapped instead of being loaded into memory and are shared by
+        # all the workers of the host.
+        if ArtifactBundle.cache.enabled:
+            return fetch_retry_policy(lambda: ArtifactBundle.cache.getfile(artifact_bundle))
+
         # We try to load the bundle file from the cache. The file we are loading here is the entire bundle, not
         # the contents.
         #
@@ -818,8 +989,6 @@ class Fetcher:
         actual File object bound to a specific ArtifactBundle. memcached is persisted across processor runs as opposed
         to the local cache.
         """
-        artifact_bundle_id = None
-
         try:
             # In order to avoid making a multi-join query, we first look if the file is existing in an already cached
             # and opened archive.
@@ -842,22 +1011,6 @@ class Fetcher:
                 artifact_bundle = self._get_artifact_bundle_entry_by_debug_id(
                     debug_id, source_file_type
                 )
-                artifact_bundle_id = artifact_bundle.id
-
-            # Given an artifact bundle id we check in the local cache if we have the archive already opened.
-            cached_open_archive = self.open_archives.get(artifact_bundle_id)
-            if cached_open_archive is not None:
-                # In case we already tried to load an ArtifactBundle with this id, and we failed, we don't want
-                # to try and fetch again the bundle.
-                if cached_open_archive is INVALID_ARCHIVE:
-                    return None
-
-                return cached_open_archive
-
-            # In case the local cache doesn't have the archive, we will try to load it from memcached and then directly
-            # from the source.
-            with sentry_sdk.start_span(op="Fetcher.fetch_by_debug_id._fetch_artifact_bundle_file"):
-                artifact_bundle_file = self._fetch_artifact_bundle_file(artifact_bundle)
         except Exception as exc:
             logger.debug(
                 "Failed to load the artifact bundle for debug_id %s and source_file_type %s",
@@ -865,39 +1018,98 @@ class Fetcher:
                 source_file_type,
                 exc_info=exc,
             )
-            if artifact_bundle_id:
-                self.open_archives[artifact_bundle_id] = INVALID_ARCHIVE
+            return None
+
+        # In case we already tried to load an ArtifactBundle with this id, and we failed, we don't want to try and
+        # fetch again the bundle.
+        archive = self._open_archive(artifact_bundle.id, lambda: artifact_bundle)
+        return None if archive is INVALID_ARCHIVE else archive
 
+    def _get_indexed_file(self, url=None, debug_id=None, source_file_type=None):
+        """
+        Looks up the artifact bundle and the path of the file within it in the index of the bound release/dist pair.
+
+        Returns the tuple (artifact_bundle_id, file_path) or None if the file is not indexed, for example because its
+        bundle was uploaded before the index existed.
+        """
+        if self.release is None or self.project is None:
             return None
+
+        if debug_id is not None:
+            normalized_debug_id = ArtifactBundleArchive.normalize_debug_id(debug_id)
+            if normalized_debug_id is None or source_file_type is None:
+                return None
+            lookup = {"debug_id": normalized_debug_id, "source_file_type": source_file_type.value}
+        elif url is not None:
+            lookup = {"urls": ReleaseFile.normalize(url)}
         else:
-            archive = None
+            return None
 
-            try:
-                # We load the entire bundle into an archive and cache it locally. It is very important that this opened
-                # archive is closed before the processing ends.
-                with sentry_sdk.start_span(op="Fetcher.fetch_by_debug_id.ArtifactBundleArchive"):
-                    archive = ArtifactBundleArchive(artifact_bundle_file)
-                    self.open_archives[artifact_bundle_id] = archive
-            except Exception as exc:
-                artifact_bundle_file.seek(0)
-                logger.debug(
-                    "Failed to initialize archive for the artifact bundle file",
-                    exc_info=exc,
-                    extra={"contents": base64.b64encode(artifact_bundle_file.read(256))},
+        try:
+            entry = lookup_artifact_bundle_index(
+                self.organization.id,
+                self.project.id,
+                self.release.version,
+                self.dist.name if self.dist else NULL_STRING,
+                **lookup,
+            )
+        except Exception as exc:
+            logger.error("sourcemaps.artifact_bundle_index_read_failed", exc_info=exc)
+            return None
+
+        metrics.incr(
+            "sourcemaps.artifact_bundle_index.lookup",
+            tags={
+                "type": "debug_id" if debug_id is not None else "url",
+                "result": "hit" if entry is not None else "miss",
+            },
+        )
+        return entry
+
+    def _open_indexed_archive(self, url=None, debug_id=None, source_file_type=None):
+        """
+        Opens only the ArtifactBundle that the index points to for a file, and returns the tuple (archive, file_path)
+        or (None, None) in case the file must be looked up in all the bundles of the release/dist pair.
+        """
+        entry = self._get_indexed_file(url, debug_id, source_file_type)
+        if entry is None:
+            return None, None
+
+        artifact_bundle_id, file_path = entry
+
+        def get_artifact_bundle():
+            # Raises in case the bundle has been deleted after it was indexed.
+            with sentry_sdk.start_span(op="Fetcher._open_indexed_archive.get_artifact_bundle"):
+                return ArtifactBundle.objects.select_related("file").get(
+                    id=artifact_bundle_id, organization_id=self.organization.id
                 )
-                if artifact_bundle_id:
-                    self.open_archives[artifact_bundle_id] = INVALID_ARCHIVE
 
-            return archive
+        archive = self._open_archive(artifact_bundle_id, get_artifact_bundle)
+        if archive is INVALID_ARCHIVE:
+            return None, None
+
+        # The bundle might have been uploaded again with different contents after the index was cached.
+        if archive.get_file_info(file_path) is None:
+            return None, None
+
+        return archive, file_path
 
     def fetch_by_debug_id(self, debug_id, source_file_type):
         """
         Pulls down the file indexed by debug_id and source_file_type from an ArtifactBundle and returns a UrlResult
         object that "falsely" emulates an HTTP response connected to an HTTP request for fetching the file.
         """
+        if ("debug_id", debug_id, source_file_type) in self.prefetched:
+            return self._take_prefetched(("debug_id", debug_id, source_file_type))
+
         with sentry_sdk.start_span(op="Fetcher.fetch_by_debug_id._open_artifact_bundle_archive"):
-            # We first try to open the entire .zip artifact bundle given the debug_id and the source_file_type.
-            archive = self._open_artifact_bundle_archive(debug_id, source_file_type)
+            # We first try to open the entire .zip artifact bundle given the debug_id and the source_file_type, either
+            # directly through the index of the release or by querying the bundles containing the debug_id.
+            archive, _ = self._open_indexed_archive(
+                debug_id=debug_id, source_file_type=source_file_type
+            )
+            if archive is None:
+                archive = self._open_artifact_bundle_archive(debug_id, source_file_type)
             if archive is None:
                 return None
 
@@ -986,8 +1198,6 @@ class Fetcher:
         The idea of opening all connected archives is because we upper bound them, and we know that for most frames,
         they will be resolved by files within the same archive.
         """
-        artifact_bundle_files = []
-        failed_artifact_bundle_ids = set()
 
         def file_by_url_candidates_lookup(open_archive):
             try_get_with_normalized_urls(
@@ -1005,39 +1215,6 @@ class Fetcher:
                 op="Fetcher.fetch_by_url_new._get_artifact_bundle_entries_by_release_dist_pair"
             ):
                 artifact_bundles = self._get_artifact_bundle_entries_by_release_dist_pair()
-
-            for artifact_bundle in artifact_bundles:
-                cached_open_archive = self.open_archives.get(artifact_bundle.id)
-
-                # In case the archive is marked as INVALID_ARCHIVE we are just going to continue in the hope of
-                # finding other cached archives.
-                if cached_open_archive is INVALID_ARCHIVE:
-                    continue
-
-                # Only if we find a valid open archive we return the archive itself.
-                if cached_open_archive is not None:
-                    return cached_open_archive
-
-                try:
-                    # In case we didn't find the archive in the cache, we want to fetch the artifact bundle to put later
-                    # in the cache.
-                    with sentry_sdk.start_span(
-                        op="Fetcher.fetch_by_url_new._fetch_artifact_bundle_file"
-                    ):
-                        artifact_bundle_file = self._fetch_artifact_bundle_file(artifact_bundle)
-                        artifact_bundle_files.append((artifact_bundle.id, artifact_bundle_file))
-                except Exception as exc:
-                    logger.debug(
-                        "Failed to fetch artifact bundle %s", artifact_bundle.id, exc_info=exc
-                    )
-                    failed_artifact_bundle_ids.add(artifact_bundle.id)
-
-            # In case during the loading we ended up not being able to load anything and we got at least one error, we
-            # can't do much.
-            if len(artifact_bundle_files) == 0 and len(failed_artifact_bundle_ids) > 0:
-                raise Exception(
-                    "Failed to fetch at least one artifact bundle given a release/dist pair"
-                )
         except Exception as exc:
             logger.debug(
                 "Failed to load the artifact bundles for release %s and dist %s",
@@ -1045,45 +1222,40 @@ class Fetcher:
                 self.dist,
                 exc_info=exc,
             )
-            # In case we got an exception we want to mark all the ids that we failed to fetch as invalid. In case
-            # an exception is thrown before fetching any bundles, the set will be empty, thus no bundles will be marked
-            # as invalid.
-            for failed_artifact_bundle_id in failed_artifact_bundle_ids:
-                self.open_archives[failed_artifact_bundle_id] = INVALID_ARCHIVE
-
             return None
-        else:
-            for artifact_bundle_id, artifact_bundle_file in artifact_bundle_files:
-                try:
-                    with sentry_sdk.start_span(op="Fetcher.fetch_by_url_new.ArtifactBundleArchive"):
-                        archive = ArtifactBundleArchive(artifact_bundle_file)
-                        self.open_archives[artifact_bundle_id] = archive
-                except Exception as exc:
-                    artifact_bundle_file.seek(0)
-                    logger.debug(
-                        "Failed to initialize archive for the artifact bundle file",
-                        exc_info=exc,
-                        extra={"contents": base64.b64encode(artifact_bundle_file.read(256))},
-                    )
-                    if artifact_bundle_id:
-                        self.open_archives[artifact_bundle_id] = INVALID_ARCHIVE
-
-            # After having loaded all the archives into memory, we want to look if we have the file again. Technically
-            # we could recursively implement this behavior but that would require the usage of a discriminator variable
-            # that will immediately return if the lookup is not successful. The repetition of the lookup seems a more
-            # explicit way to do the work.
-            with sentry_sdk.start_span(op="Fetcher.fetch_by_url_new._post_lookup_in_open_archives"):
-                cached_open_archive = self._lookup_in_open_archives(file_by_url_candidates_lookup)
-                if cached_open_archive:
-                    return cached_open_archive
 
-            return None
+        for artifact_bundle in artifact_bundles:
+            cached_open_archive = self._get_open_archive(artifact_bundle.id)
+
+            # In case the archive is marked as INVALID_ARCHIVE we are just going to continue in the hope of finding
+            # other cached archives.
+            if cached_open_archive is INVALID_ARCHIVE:
+                continue
+
+            # Only if we find a valid open archive we return the archive itself.
+            if cached_open_archive is not None:
+                return cached_open_archive
+
+        # In case we didn't find the archives in the cache, we want to fetch the artifact bundles and open them. Those
+        # that fail to load are marked as INVALID_ARCHIVE.
+        for artifact_bundle in artifact_bundles:
+            self._open_archive(artifact_bundle.id, lambda bundle=artifact_bundle: bundle)
+
+        # After having loaded all the archives into memory, we want to look if we have the file again. Technically we
+        # could recursively implement this behavior but that would require the usage of a discriminator variable that
+        # will immediately return if the lookup is not successful. The repetition of the lookup seems a more explicit
+        # way to do the work.
+        with sentry_sdk.start_span(op="Fetcher.fetch_by_url_new._post_lookup_in_open_archives"):
+            return self._lookup_in_open_archives(file_by_url_candidates_lookup)
 
     def fetch_by_url_new(self, url):
         """
         Pulls down the file indexed by url using the data in the ReleaseArtifactBundle table and returns a UrlResult
         object that "falsely" emulates an HTTP response connected to an HTTP request for fetching the file.
         """
+        if ("url_new", url) in self.prefetched:
+            return self._take_prefetched(("url_new", url))
+
         if self.release is None:
             return None
 
@@ -1094,9 +1266,12 @@ class Fetcher:
         if result:
             return result_from_cache(url, result)
 
-        # We want to first look for the file by url in the new tables ReleaseArtifactBundle and ArtifactBundle.
+        # We want to first look for the file by url in the new tables ReleaseArtifactBundle and ArtifactBundle. The
+        # index of the release tells us the exact bundle and file, otherwise we have to open all the bundles.
         with sentry_sdk.start_span(op="Fetcher.fetch_by_url_new._open_archive_by_url"):
-            archive = self._open_archive_by_url(url)
+            archive, file_path = self._open_indexed_archive(url=url)
+            if archive is None:
+                archive = self._open_archive_by_url(url)
             if archive is not None:
                 try:
                     # We know that if we have an archive which is not None, that the url will be found internally but
@@ -1105,9 +1280,12 @@ class Fetcher:
                     #
                     # Technically we could return the matched candidate url from _open_archive_by_url() but considering
                     # that try_get_with_normalized_urls() is O(1) the benefits will not outweigh the clean code.
-                    fp, headers = try_get_with_normalized_urls(
-                        url, lambda candidate: archive.get_file_by_url(candidate)
-                    )
+                    if file_path is not None:
+                        fp, headers = archive.get_file(file_path)
+                    else:
+                        fp, headers = try_get_with_normalized_urls(
+                            url, lambda candidate: archive.get_file_by_url(candidate)
+                        )
                     result = fetch_and_cache_artifact(
                         url,
                         lambda: fp,
@@ -1208,6 +1386,9 @@ class Fetcher:
         separately, whether those attempts are successful. Used for both
         source files and source maps.
         """
+        if ("url", url) in self.prefetched:
+            return self._take_prefetched(("url", url))
+
         # In case we know that this url has resulted in a failure while processing previous frame, we want to fail
         # early in order to avoid wasting resources. This is done under the assumption that a failed url can't become
         # successful after an arbitrary amount of time, in which case it would be sensible to properly retry.
@@ -1342,6 +1523,96 @@ class Fetcher:
 
         return result
 
+    def _take_prefetched(self, key):
+        result, exc = self.prefetched.pop(key)
+        if exc is not None:
+            raise exc
+        return result
+
+    def _prefetch_one(self, key, fetch_fn, *args):
+        try:
+            result = fetch_fn(*args)
+        except Exception as exc:
+            self.prefetched[key] = (None, exc)
+            raise
+        else:
+            self.prefetched[key] = (result, None)
+            return result
+
+    def _prefetch_file(self, url, debug_id):
+        """
+        Fetches a minified file and its sourcemap in the same order of lookups the processor makes, stopping at the
+        first lookup that finds the file.
+        """
+        if debug_id is not None:
+            result = self._prefetch_one(
+                ("debug_id", debug_id, SourceFileType.MINIFIED_SOURCE),
+                self.fetch_by_debug_id,
+                debug_id,
+                SourceFileType.MINIFIED_SOURCE,
+            )
+            if result is not None:
+                self._prefetch_one(
+                    ("debug_id", debug_id, SourceFileType.SOURCE_MAP),
+                    self.fetch_by_debug_id,
+                    debug_id,
+                    SourceFileType.SOURCE_MAP,
+                )
+                return
+
+        for kind, fetch_fn in (("url_new", self.fetch_by_url_new), ("url", self.fetch_by_url)):
+            result = self._prefetch_one((kind, url), fetch_fn, url)
+            if result is None:
+                continue
+
+            sourcemap_url = discover_sourcemap(result)
+            if sourcemap_url and not is_data_uri(sourcemap_url):
+                self._prefetch_one((kind, sourcemap_url), fetch_fn, sourcemap_url)
+            return
+
+    def prefetch(
+        self, files: Sequence[Tuple[str, Optional[str]]], max_workers, max_per_organization
+    ):
+        """
+        Concurrently fetches the given `(url, debug_id)` minified files together with their sourcemaps on a thread
+        pool shared by the worker, with at most `max_per_organization` files of this organization in flight.
+
+        The outcome of every fetch, including exceptions, is kept and handed out to the next `fetch_by_*` call with
+        the same arguments. The processor then resolves the files sequentially as before, so results and errors are
+        exactly the ones a sequential fetch would produce.
+        """
+        executor = get_fetch_executor(max_workers)
+        slots = get_organization_fetch_slots(self.organization.id, max_per_organization)
+        hub = Hub.current
+
+        def prefetch_file(url, debug_id, on_pool=True):
+            try:
+                with Hub(hub):
+                    self._prefetch_file(url, debug_id)
+            except Exception:
+                # The error has been recorded and will surface during the sequential resolution.
+                pass
+            finally:
+                slots.release()
+                if on_pool:
+                    # The threads of the pool outlive the event, thus their database connections are released like at
+                    # the end of a request, and broken ones are not reused after a database restart.
+                    close_old_connections()
+
+        futures = []
+        with metrics.timer("sourcemaps.prefetch.duration"):
+            for url, debug_id in files:
+                slots.acquire()
+                try:
+                    futures.append(executor.submit(prefetch_file, url, debug_id))
+                except RuntimeError:
+                    # The pool was shut down because it got resized in the meantime.
+                    prefetch_file(url, debug_id, on_pool=False)
+            for future in futures:
+                future.result()
+
+        metrics.incr("sourcemaps.prefetch.files", amount=len(files))
+
 
 class FetcherSource(Enum):
     """
@@ -1360,6 +1631,15 @@ class FetcherSource(Enum):
     DEBUG_ID = 3
 
 
+class CachedToken(NamedTuple):
+    """
+    Stands in for the sourcemap token of a frame restored from the frame cache, of which the next frames only need the
+    name to resolve their function names.
+    """
+
+    name: Optional[str]
+
+
 class JavaScriptStacktraceProcessor(StacktraceProcessor):
     """
     Modern SourceMap processor using symbolic-sourcemapcache.
@@ -1422,6 +1702,9 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         # Contains a mapping between the debug id and the sourcemap url resolved with that debug id.
         self.sourcemap_debug_id_to_sourcemap_url = {}
 
+        # Parsed sourceviews and sourcemap caches shared with the other events processed by this worker.
+        self.parsed_source_cache = get_parsed_source_cache()
+
         # Component responsible for fetching the files.
         self.fetcher = Fetcher(
             organization=self.organization,
@@ -1472,6 +1755,15 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         ):
             self.build_abs_path_debug_id_cache()
 
+        # The files of frames restored from the frame cache don't need to be fetched.
+        if options.get("processing.frame-cache.javascript"):
+            cached_frames = {
+                id(processable_frame.frame)
+                for processable_frame in processing_task.iter_processable_frames(self)
+                if processable_frame.cache_value is not None
+            }
+            frames = [frame for frame in frames if id(frame) not in cached_frames]
+
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.preprocess_step.populate_source_cache"
         ):
@@ -1488,10 +1780,66 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         # frames for function name resolution by call site.
         processable_frame.data = {"token": None}
 
+        if options.get("processing.frame-cache.javascript"):
+            processable_frame.set_cache_key_from_values(
+                self.get_frame_cache_values(processable_frame)
+            )
+
+    def get_frame_cache_values(self, processable_frame):
+        """
+        Returns the values that determine the outcome of processing a frame: the frame itself, the debug id its files
+        are fetched with and the call site used to resolve its function name.
+
+        Only frames with a debug id are cached. Artifacts found by url can be re-uploaded under the same release and
+        dist, which would not change the key, whereas the files of a debug id don't change.
+        """
+        frame = processable_frame.frame
+        if not self.abs_path_debug_id:
+            self.build_abs_path_debug_id_cache()
+        debug_id = self.abs_path_debug_id.get(frame.get("abs_path"))
+        if debug_id is None:
+            return None
+
+        previous_frame = processable_frame.previous_frame
+        return [
+            self.project.id,
+            self.data.get("platform"),
+            debug_id,
+            frame,
+            previous_frame
+            and [
+                previous_frame.get("abs_path"),
+                previous_frame.get("lineno"),
+                previous_frame.get("colno"),
+                self.abs_path_debug_id.get(previous_frame.get("abs_path")),
+            ],
+        ]
+
+    def process_cached_frame(self, processable_frame):
+        cache_value = processable_frame.cache_value
+        if cache_value["token_name"] is not None:
+            processable_frame.data["token"] = CachedToken(name=cache_value["token_name"])
+        processable_frame.data["resolved_with_debug_id"] = True
+        self.sourcemaps_touched.add(cache_value["sourcemap_url"])
+
+        new_frames = cache_value["frames"]
+        try:
+            if features.has(
+                "organizations:javascript-console-error-tag", self.organization, actor=None
+            ):
+                self.tag_suspected_console_errors(new_frames)
+        except Exception as exc:
+            logger.exception("Failed to tag suspected console errors", exc_info=exc)
+
+        return new_frames, cache_value["raw_frames"], []
+
     def process_frame(self, processable_frame, processing_task):
         """
         Attempt to demangle the given frame.
         """
+        if processable_frame.cache_value is not None:
+            return self.process_cached_frame(processable_frame)
+
         frame = processable_frame.frame
 
         all_errors = []
@@ -1736,6 +2084,30 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             new_frames = [new_frame]
             raw_frames = [raw_frame] if changed_raw else None
 
+            # Only frames that were fully resolved with the files of their debug id are cached, see
+            # `get_frame_cache_values`. This includes the call site that the function name was resolved with.
+            resolved_with_debug_id = (
+                resolved_sv_with == FetcherSource.DEBUG_ID
+                and resolved_smc_with == FetcherSource.DEBUG_ID
+            )
+            processable_frame.data["resolved_with_debug_id"] = resolved_with_debug_id
+            previous_frame = processable_frame.previous_frame
+            if (
+                sourcemap_applied
+                and not all_errors
+                and resolved_with_debug_id
+                and (previous_frame is None or previous_frame.data.get("resolved_with_debug_id"))
+            ):
+                token = processable_frame.data["token"]
+                processable_frame.set_cache_value(
+                    {
+                        "frames": new_frames,
+                        "raw_frames": raw_frames,
+                        "token_name": token.name if token is not None else None,
+                        "sourcemap_url": sourcemap_url,
+                    }
+                )
+
             try:
                 if features.has(
                     "organizations:javascript-console-error-tag", self.organization, actor=None
@@ -1868,7 +2240,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 span.set_data("debug_id", debug_id)
                 result = self.fetcher.fetch_by_debug_id(debug_id, source_file_type)
                 if result is not None:
-                    sourceview = SourceView.from_bytes(result.body)
+                    sourceview = self._parse_sourceview(result.body, debug_id=debug_id)
                     self.fetch_by_debug_id_sourceviews[debug_id, source_file_type] = sourceview
                     return sourceview, FetcherSource.DEBUG_ID
 
@@ -1879,7 +2251,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             span.set_data("url", url)
             result = self.fetcher.fetch_by_url_new(url)
             if result is not None:
-                sourceview = SourceView.from_bytes(result.body)
+                sourceview = self._parse_sourceview(result.body, url=url)
                 self.fetch_by_url_new_sourceviews[url] = sourceview
 
                 sourcemap_url = discover_sourcemap(result)
@@ -1907,7 +2279,7 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             if result is None:
                 return None, FetcherSource.NONE
 
-            sourceview = SourceView.from_bytes(result.body)
+            sourceview = self._parse_sourceview(result.body, url=url)
             self.fetch_by_url_sourceviews[url] = sourceview
 
             sourcemap_url = discover_sourcemap(result)
@@ -1992,8 +2364,10 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     # We want to keep track of the sourcemap url of the sourcemap resolved with this specific debug id.
                     self.sourcemap_debug_id_to_sourcemap_url[debug_id] = result.url
                     # This is an expensive operation that should be executed as few times as possible.
-                    return SmCache.from_bytes(
-                        minified_sourceview.get_source().encode("utf-8"), result.body
+                    return self._parse_sourcemap_cache(
+                        minified_sourceview.get_source().encode("utf-8"),
+                        result.body,
+                        debug_id=debug_id,
                     )
             except Exception as exc:
                 # This is in debug because the product shows an error already.
@@ -2095,18 +2469,62 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.fetch_sourcemap_view_by_url.SmCache.from_bytes"
             ):
                 # This is an expensive operation that should be executed as few times as possible.
-                return SmCache.from_bytes(source, body)
+                # Inline sourcemaps are not shared, their url is the whole sourcemap.
+                return self._parse_sourcemap_cache(
+                    source, body, url=None if is_data_uri(url) else url
+                )
         except Exception as exc:
             # This is in debug because the product shows an error already.
             logger.debug(str(exc), exc_info=True)
             raise UnparseableSourcemap({"url": http.expose_url(url)})
 
+    def _parse_sourceview(self, body, url=None, debug_id=None):
+        return self._parse_shared(
+            "sourceview", (body,), lambda: SourceView.from_bytes(body), url, debug_id
+        )
+
+    def _parse_sourcemap_cache(self, source, sourcemap, url=None, debug_id=None):
+        return self._parse_shared(
+            "sourcemap_cache",
+            (source, sourcemap),
+            lambda: SmCache.from_bytes(source, sourcemap),
+            url,
+            debug_id,
+        )
+
+    def _parse_shared(self, kind, contents, parse, url, debug_id):
+        """
+        Parses a file through the parsed source cache that is shared by all the events of this worker.
+
+        Files looked up by url are cached per release and dist, files looked up by debug id are the same in every
+        release.
+        """
+        if self.parsed_source_cache is None or (url is None and debug_id is None):
+            return parse()
+
+        if debug_id is not None:
+            key = (kind, None, None, debug_id)
+        else:
+            release = self.fetcher.release
+            dist = self.fetcher.dist
+            key = (kind, release.id if release else None, dist.name if dist else None, url)
+
+        checksum = hashlib.sha1()
+        for content in contents:
+            checksum.update(content)
+            checksum.update(b"\0")
+
+        return self.parsed_source_cache.get_or_parse(
+            key, checksum.hexdigest(), sum(len(content) for content in contents), parse
+        )
+
     def populate_source_cache(self, frames):
         """
         Fetch all sources that we know are required (being referenced directly
         in frames).
         """
-        pending_file_list = set()
+        # Kept in the order of the frames, so that the files are resolved in a deterministic order.
+        pending_file_list = {}
         for f in frames:
             # We can't even attempt to fetch source if abs_path is None
             if f.get("abs_path") is None:
@@ -2120,7 +2538,24 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # we cannot fetch any other files than those uploaded by user
             if self.data.get("platform") == "node" and not f.get("abs_path").startswith("app:"):
                 continue
-            pending_file_list.add(f["abs_path"])
+            pending_file_list[f["abs_path"]] = None
+
+        max_workers = options.get("sourcemaps.fetch-concurrency")
+        if max_workers > 1 and len(pending_file_list) > 1:
+            with sentry_sdk.start_span(
+                op="JavaScriptStacktraceProcessor.populate_source_cache.prefetch"
+            ):
+                # Files beyond the fetch limit are never fetched.
+                self.fetcher.prefetch(
+                    [
+                        (url, self.abs_path_debug_id.get(url))
+                        for url in list(pending_file_list)[: self.max_fetches - self.fetch_count]
+                    ],
+                    max_workers=max_workers,
+                    max_per_organization=options.get(
+                        "sourcemaps.fetch-concurrency.per-organization"
+                    ),
+                )
 
         for idx, url in enumerate(pending_file_list):
             with sentry_sdk.start_span(
@@ -1,6 +1,8 @@
+import os
+import threading
 import zipfile
 from enum import Enum
-from typing import IO, Callable, Dict, List, Mapping, Optional, Tuple
+from typing import IO, Callable, ClassVar, Dict, List, Mapping, Optional, Tuple
 
 from django.db import models
 from django.db.models.signals import post_delete
@@ -8,6 +10,7 @@ from django.utils import timezone
 from symbolic.debuginfo import normalize_debug_id
 from symbolic.exceptions import SymbolicError
 
+from sentry import options
 from sentry.db.models import (
     BoundedBigIntegerField,
     BoundedPositiveIntegerField,
@@ -15,7 +18,8 @@ from sentry.db.models import (
     Model,
     region_silo_only_model,
 )
-from sentry.utils import json
+from sentry.models.files.utils import MappedFile, evict_cached_files
+from sentry.utils import json, metrics
 from sentry.utils.hashlib import sha1_text
 
 NULL_UUID = "00000000-00000000-00000000-00000000"
@@ -63,6 +67,8 @@ class ArtifactBundle(Model):
     # association has been added or any of its fields have been modified.
     date_last_modified = models.DateTimeField(null=True)
 
+    cache: ClassVar["ArtifactBundleFileCache"]
+
     class Meta:
         app_label = "sentry"
         db_table = "sentry_artifactbundle"
@@ -90,6 +96,80 @@ class ArtifactBundle(Model):
         return sha1_text(url).hexdigest()
 
 
+class ArtifactBundleFileCache:
+    """
+    Cache of artifact bundle files on the local disk, shared by all the processes of a host.
+
+    Bundles are downloaded once and then opened as memory mapped files, thus they are not copied into the memory of
+    every worker reading them. The least recently used bundles are evicted once the cache grows over
+    `artifactbundle.cache-max-size`.
+
+    Like the `FileBlobCache`, a process only scans the cache for eviction after its first download and then whenever
+    it downloaded another `EVICTION_THRESHOLD` share of the budget since.
+    """
+
+    EVICTION_THRESHOLD = 0.1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # bytes downloaded by this process since the last eviction, None until the first one
+        self._downloaded = None
+
+    def _maybe_evict(self, size):
+        with self._lock:
+            if self._downloaded is not None:
+                self._downloaded += size
+                if self._downloaded < self.max_size * self.EVICTION_THRESHOLD:
+                    return
+            self._downloaded = 0
+
+        evicted = evict_cached_files(self.cache_path, self.max_size)
+        metrics.incr("artifact_bundle.cache.evicted", amount=evicted)
+
+    @property
+    def cache_path(self):
+        return options.get("artifactbundle.cache-path")
+
+    @property
+    def max_size(self):
+        return options.get("artifactbundle.cache-max-size")
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get_path(self, artifact_bundle):
+        return os.path.join(
+            self.cache_path, str(artifact_bundle.organization_id), str(artifact_bundle.file_id)
+        )
+
+    def getfile(self, artifact_bundle):
+        file_size = artifact_bundle.file.size
+        if file_size > self.max_size:
+            metrics.incr("artifact_bundle.cache.get", tags={"result": "too_large"})
+            return artifact_bundle.file.getfile()
+
+        file_path = self.get_path(artifact_bundle)
+        try:
+            # Bumping the modification time marks the bundle as recently used for the eviction.
+            os.utime(file_path)
+            result = "hit"
+        except FileNotFoundError:
+            artifact_bundle.file.save_to(file_path)
+            self._maybe_evict(file_size)
+            result = "miss"
+
+        metrics.incr("artifact_bundle.cache.get", tags={"result": result})
+        try:
+            return MappedFile(file_path)
+        except FileNotFoundError:
+            # Another process evicted the bundle in the meantime.
+            return artifact_bundle.file.getfile()
+
+
+ArtifactBundle.cache = ArtifactBundleFileCache()
+
+
 def delete_file_for_artifact_bundle(instance, **kwargs):
     instance.file.delete()
 
@@ -151,6 +231,38 @@ class ProjectArtifactBundle(Model):
         unique_together = (("project_id", "artifact_bundle"),)
 
 
+@region_silo_only_model
+class ArtifactBundleIndex(Model):
+    """
+    Precomputed lookup index of the files contained in the artifact bundles of a release/dist pair.
+
+    Every entry maps the url, and the debug_id if the file has one, of a file to the bundle containing it and to the
+    path of the file within the bundle archive. This allows processing to open only the bundle it needs instead of
+    opening all the bundles of a release and scanning their manifests.
+    """
+
+    __include_in_export__ = False
+
+    organization_id = BoundedBigIntegerField()
+    release_name = models.CharField(max_length=250)
+    dist_name = models.CharField(max_length=64, default=NULL_STRING)
+    url = models.TextField()
+    file_path = models.TextField()
+    debug_id = models.UUIDField(null=True)
+    source_file_type = models.IntegerField(choices=SourceFileType.choices(), null=True)
+    artifact_bundle = FlexibleForeignKey("sentry.ArtifactBundle")
+    date_added = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = "sentry"
+        db_table = "sentry_artifactbundleindex"
+
+        index_together = (
+            ("organization_id", "release_name", "dist_name", "url"),
+            ("organization_id", "debug_id"),
+        )
+
+
 class ArtifactBundleArchive:
     """Read-only view of uploaded ZIP artifact bundle."""
 
@@ -2,6 +2,7 @@ import io
 import mmap
 import os
 import tempfile
+from bisect import bisect_right
 from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha1
 
@@ -15,13 +16,44 @@ from sentry.models.files.utils import DEFAULT_BLOB_SIZE, AssembleChecksumMismatc
 from sentry.utils import metrics
 from sentry.utils.db import atomic_transaction
 
+# Reads from the blobs of a chunked file are done in at least this size, so
+# that many small reads (eg: parsing a zip file) do not hit the storage.
+READ_AHEAD_SIZE = 65536
+
+
+def _download_blob(blob):
+    with blob.getfile() as f:
+        return io.BytesIO(f.read())
+
+
+def _close_download(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
 
 class ChunkedFileBlobIndexWrapper:
-    def __init__(self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    """A file object over the blobs of a chunked file.
+
+    Without prefetching, blobs are opened on demand: seeking looks up the
+    blob at the target offset and reads go through a small read-ahead
+    buffer.  With `readahead` the next blobs are downloaded concurrently
+    (at most `readahead` at a time) while the current one is read.
+    """
+
+    def __init__(
+        self, indexes, mode=None, prefetch=False, prefetch_to=None, delete=True, readahead=0
+    ):
         # eager load from database incase its a queryset
         self._indexes = list(indexes)
+        self._offsets = [idx.offset for idx in self._indexes]
         self._curfile = None
         self._curidx = None
+        self._pos = 0
+        self._buffer = b""
+        self._buffer_offset = 0
+        self._readahead = readahead
+        self._executor = None
+        self._pending = {}
         if prefetch:
             self.prefetched = True
             self._prefetch(prefetch_to, delete)
@@ -45,23 +77,47 @@ class ChunkedFileBlobIndexWrapper:
         rv.seek(0)
         return rv
 
-    def _nextidx(self):
+    def _openidx(self, n):
         assert not self.prefetched, "this makes no sense"
         old_file = self._curfile
         try:
-            try:
-                self._curidx = next(self._idxiter)
+            self._curidx = self._indexes[n]
+            future = self._pending.pop(n, None)
+            if future is not None:
+                self._curfile = future.result()
+            else:
                 self._curfile = self._curidx.blob.getfile()
-            except StopIteration:
-                self._curidx = None
-                self._curfile = None
         finally:
             if old_file is not None:
                 old_file.close()
 
+        if self._readahead:
+            self._schedule_readahead(n)
+
+    def _schedule_readahead(self, n):
+        window = range(n + 1, min(n + 1 + self._readahead, len(self._indexes)))
+        for pending in list(self._pending):
+            if pending not in window:
+                self._discard_pending(pending)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._readahead)
+        for pending in window:
+            if pending not in self._pending:
+                self._pending[pending] = self._executor.submit(
+                    _download_blob, self._indexes[pending].blob
+                )
+
+    def _discard_pending(self, n):
+        future = self._pending.pop(n)
+        if not future.cancel():
+            future.add_done_callback(_close_download)
+
     @property
     def size(self):
-        return sum(i.blob.size for i in self._indexes)
+        if not hasattr(self, "_size"):
+            self._size = sum(i.blob.size for i in self._indexes)
+        return self._size
 
     def open(self):
         self.closed = False
@@ -98,10 +154,16 @@ class ChunkedFileBlobIndexWrapper:
         self._curfile = f
 
     def close(self):
+        for n in list(self._pending):
+            self._discard_pending(n)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         if self._curfile:
             self._curfile.close()
         self._curfile = None
         self._curidx = None
+        self._buffer = b""
         self.closed = True
 
     def _seek(self, pos):
@@ -113,19 +175,9 @@ class ChunkedFileBlobIndexWrapper:
 
         if pos < 0:
             raise OSError("Invalid argument")
-        if pos == 0 and not self._indexes:
-            # Empty file, there's no seeking to be done.
-            return
-
-        for n, idx in enumerate(self._indexes[::-1]):
-            if idx.offset <= pos:
-                if idx != self._curidx:
-                    self._idxiter = iter(self._indexes[-(n + 1) :])
-                    self._nextidx()
-                break
-        else:
+        if pos > 0 and not self._indexes:
             raise ValueError("Cannot seek to pos")
-        self._curfile.seek(pos - self._curidx.offset)
+        self._pos = pos
 
     def seek(self, pos, whence=io.SEEK_SET):
         if whence == io.SEEK_SET:
@@ -142,9 +194,32 @@ class ChunkedFileBlobIndexWrapper:
             raise ValueError("I/O operation on closed file")
         if self.prefetched:
             return self._curfile.tell()
-        if self._curfile is None:
-            return self.size
-        return self._curidx.offset + self._curfile.tell()
+        return self._pos
+
+    def _fill_buffer(self, want):
+        """Fills the buffer with at least `READ_AHEAD_SIZE` bytes (or `want`
+        if more are requested) of the blob at the current position.
+        """
+        n = bisect_right(self._offsets, self._pos) - 1
+        if self._indexes[n] is not self._curidx:
+            self._openidx(n)
+
+        blob_pos = self._pos - self._curidx.offset
+        if self._curfile.tell() != blob_pos:
+            self._curfile.seek(blob_pos)
+
+        blob_end = self._offsets[n + 1] if n + 1 < len(self._offsets) else self.size
+        remaining = min(max(want, READ_AHEAD_SIZE), blob_end - self._pos)
+        chunks = []
+        while remaining > 0:
+            chunk = self._curfile.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        self._buffer = b"".join(chunks)
+        self._buffer_offset = self._pos
 
     def read(self, n=-1):
         if self.closed:
@@ -153,26 +228,23 @@ class ChunkedFileBlobIndexWrapper:
         if self.prefetched:
             return self._curfile.read(n)
 
-        result = bytearray()
-
-        # Read to the end of the file
+        size = self.size
         if n < 0:
-            while self._curfile is not None:
-                blob_result = self._curfile.read(32768)
-                if not blob_result:
-                    self._nextidx()
-                else:
-                    result.extend(blob_result)
-
-        # Read until a certain number of bytes are read
-        else:
-            while n > 0 and self._curfile is not None:
-                blob_result = self._curfile.read(min(n, 32768))
-                if not blob_result:
-                    self._nextidx()
-                else:
-                    n -= len(blob_result)
-                    result.extend(blob_result)
+            n = size - self._pos
+
+        result = bytearray()
+        while n > 0 and self._pos < size:
+            start = self._pos - self._buffer_offset
+            if not 0 <= start < len(self._buffer):
+                self._fill_buffer(n)
+                start = 0
+                if not self._buffer:
+                    break
+
+            data = self._buffer[start : start + n]
+            result.extend(data)
+            self._pos += len(data)
+            n -= len(data)
 
         return bytes(result)
 
@@ -194,7 +266,9 @@ class AbstractFile(Model):
     FILE_BLOB_INDEX_MODEL = None
     DELETE_UNREFERENCED_BLOB_TASK = None
 
-    def _get_chunked_blob(self, mode=None, prefetch=False, prefetch_to=None, delete=True):
+    def _get_chunked_blob(
+        self, mode=None, prefetch=False, prefetch_to=None, delete=True, readahead=0
+    ):
         return ChunkedFileBlobIndexWrapper(
             self.FILE_BLOB_INDEX_MODEL.objects.filter(file=self)
             .select_related("blob")
@@ -203,14 +277,16 @@ class AbstractFile(Model):
             prefetch=prefetch,
             prefetch_to=prefetch_to,
             delete=delete,
+            readahead=readahead,
         )
 
-    def getfile(self, mode=None, prefetch=False):
+    def getfile(self, mode=None, prefetch=False, readahead=0):
         """Returns a file object.  By default the file is fetched on
         demand but if prefetch is enabled the file is fully prefetched
-        into a tempfile before reading can happen.
+        into a tempfile before reading can happen.  With `readahead` the
+        next chunks are fetched concurrently while the file is read.
         """
-        impl = self._get_chunked_blob(mode, prefetch)
+        impl = self._get_chunked_blob(mode, prefetch, readahead=readahead)
         return FileObj(impl, self.name)
 
     def save_to(self, path):
@@ -1,24 +1,32 @@
+import os
+import tempfile
+import threading
 from concurrent.futures import ThreadPoolExecutor
-from threading import Semaphore
+from contextlib import ExitStack
+from hashlib import sha1
+from typing import ClassVar
 from uuid import uuid4
 
-from django.db import IntegrityError, models, router
+from django.core.files.base import File
+from django.db import models
 from django.utils import timezone
 
+from sentry import options
 from sentry.db.models import BoundedPositiveIntegerField, Model
 from sentry.locks import locks
 from sentry.models.files.utils import (
     UPLOAD_RETRY_TIME,
     _get_size_and_checksum,
+    evict_cached_files,
     get_storage,
     locked_blob,
     nooplogger,
 )
 from sentry.utils import metrics
-from sentry.utils.db import atomic_transaction
 from sentry.utils.retries import TimedRetryPolicy
 
 MULTI_BLOB_UPLOAD_CONCURRENCY = 8
+MULTI_BLOB_LOCK_BATCH_SIZE = 50
 
 
 class AbstractFileBlob(Model):
@@ -35,6 +43,8 @@ class AbstractFileBlob(Model):
     FILE_BLOB_OWNER_MODEL = None
     DELETE_FILE_TASK = None
 
+    cache: ClassVar["FileBlobCache"]
+
     @classmethod
     def from_files(cls, files, organization=None, logger=nooplogger):
         """A faster version of `from_file` for multiple files at the time.
@@ -42,120 +52,129 @@ class AbstractFileBlob(Model):
         entries.  Files can be a list of files or tuples of file and checksum.
         If both are provided then a checksum check is performed.
 
+        Existing blobs are looked up in a single query, only the missing
+        chunks are uploaded (concurrently) and the new blobs and owners are
+        inserted in bulk, holding the upload locks of their checksums.
+
         If the checksums mismatch an `IOError` is raised.
         """
         logger.debug("FileBlob.from_files.start")
 
-        files_with_checksums = []
+        # Before we go and do something with the files we calculate the
+        # checksums and compare them against the references.  This also
+        # deduplicates chunks uploaded twice in the same request.
+        files_by_checksum = {}
         for fileobj in files:
             if isinstance(fileobj, tuple):
-                files_with_checksums.append(fileobj)
+                fileobj, reference_checksum = fileobj
             else:
-                files_with_checksums.append((fileobj, None))
+                reference_checksum = None
+
+            size, checksum = _get_size_and_checksum(fileobj)
+            if reference_checksum is not None and checksum != reference_checksum:
+                raise OSError("Checksum mismatch")
+            files_by_checksum.setdefault(checksum, (fileobj, size))
 
-        checksums_seen = set()
-        blobs_created = []
-        blobs_to_save = []
-        locks = set()
-        semaphore = Semaphore(value=MULTI_BLOB_UPLOAD_CONCURRENCY)
+        existing = set(
+            cls.objects.filter(checksum__in=list(files_by_checksum)).values_list(
+                "checksum", flat=True
+            )
+        )
+        missing = [
+            (checksum, fileobj, size)
+            for checksum, (fileobj, size) in files_by_checksum.items()
+            if checksum not in existing
+        ]
+        metrics.incr(
+            "filestore.from_files.blobs", amount=len(existing), tags={"status": "existing"}
+        )
+        metrics.incr("filestore.from_files.blobs", amount=len(missing), tags={"status": "missing"})
 
-        def _upload_and_pend_chunk(fileobj, size, checksum, lock):
+        def _upload_chunk(item):
+            checksum, fileobj, size = item
             logger.debug(
-                "FileBlob.from_files._upload_and_pend_chunk.start",
+                "FileBlob.from_files._upload_chunk.start",
                 extra={"checksum": checksum, "size": size},
             )
-            blob = cls(size=size, checksum=checksum)
-            blob.path = cls.generate_unique_path()
+            blob = cls(size=size, checksum=checksum, path=cls.generate_unique_path())
             storage = get_storage(cls._storage_config())
             storage.save(blob.path, fileobj)
-            blobs_to_save.append((blob, lock))
             metrics.timing("filestore.blob-size", size, tags={"function": "from_files"})
             logger.debug(
-                "FileBlob.from_files._upload_and_pend_chunk.end",
+                "FileBlob.from_files._upload_chunk.end",
                 extra={"checksum": checksum, "path": blob.path},
             )
+            return blob
 
-        def _ensure_blob_owned(blob):
-            if organization is None:
-                return
-            try:
-                with atomic_transaction(using=router.db_for_write(cls.FILE_BLOB_OWNER_MODEL)):
-                    cls.FILE_BLOB_OWNER_MODEL.objects.create(
-                        organization_id=organization.id, blob=blob
+        uploaded = {}
+        if missing:
+            # The pool bounds the number of chunks that are in flight (and
+            # buffered by the storage backend) at any point in time.
+            with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
+                uploaded = {blob.checksum: blob for blob in exe.map(_upload_chunk, missing)}
+
+        # Blobs are deleted while holding their upload lock, thus the blobs
+        # are read back and their owners inserted under the same locks, else
+        # a blob could be deleted before its owner references it.  Chunks are
+        # uploaded before, so the locks are only held briefly.  They are
+        # taken in sorted order, so that concurrent requests cannot deadlock,
+        # and in batches, to bound the number of locks held at once.
+        storage = get_storage(cls._storage_config())
+        checksums = sorted(files_by_checksum)
+        for idx in range(0, len(checksums), MULTI_BLOB_LOCK_BATCH_SIZE):
+            batch = checksums[idx : idx + MULTI_BLOB_LOCK_BATCH_SIZE]
+            with ExitStack() as stack:
+                for checksum in batch:
+                    lock = locks.get(
+                        f"fileblob:upload:{checksum}",
+                        duration=UPLOAD_RETRY_TIME,
+                        name="fileblob_upload_model",
+                    )
+                    stack.enter_context(
+                        TimedRetryPolicy(UPLOAD_RETRY_TIME, metric_instance="lock.fileblob.upload")(
+                            lock.acquire
+                        )
                     )
-            except IntegrityError:
-                pass
-
-        def _save_blob(blob):
-            logger.debug("FileBlob.from_files._save_blob.start", extra={"path": blob.path})
-            blob.save()
-            _ensure_blob_owned(blob)
-            logger.debug("FileBlob.from_files._save_blob.end", extra={"path": blob.path})
-
-        def _flush_blobs():
-            while True:
-                try:
-                    blob, lock = blobs_to_save.pop()
-                except IndexError:
-                    break
 
-                _save_blob(blob)
-                lock.__exit__(None, None, None)
-                locks.discard(lock)
-                semaphore.release()
+                blobs = {blob.checksum: blob for blob in cls.objects.filter(checksum__in=batch)}
+                new_blobs = []
+                for checksum in batch:
+                    if checksum in blobs:
+                        continue
+                    if checksum not in uploaded:
+                        # The blob was deleted since it was looked up.
+                        fileobj, size = files_by_checksum[checksum]
+                        uploaded[checksum] = _upload_chunk((checksum, fileobj, size))
+                    new_blobs.append(uploaded[checksum])
+
+                if new_blobs:
+                    # Writers which do not take the locks may have stored the
+                    # same chunks in the meantime, so conflicting rows are
+                    # skipped and the stored blobs are read back.
+                    cls.objects.bulk_create(new_blobs, ignore_conflicts=True)
+                    blobs.update(
+                        (blob.checksum, blob)
+                        for blob in cls.objects.filter(
+                            checksum__in=[blob.checksum for blob in new_blobs]
+                        )
+                    )
 
-        try:
-            with ThreadPoolExecutor(max_workers=MULTI_BLOB_UPLOAD_CONCURRENCY) as exe:
-                for fileobj, reference_checksum in files_with_checksums:
-                    logger.debug(
-                        "FileBlob.from_files.executor_start", extra={"checksum": reference_checksum}
+                if organization is not None and blobs:
+                    cls.FILE_BLOB_OWNER_MODEL.objects.bulk_create(
+                        [
+                            cls.FILE_BLOB_OWNER_MODEL(organization_id=organization.id, blob=blob)
+                            for blob in blobs.values()
+                        ],
+                        ignore_conflicts=True,
                     )
-                    _flush_blobs()
-
-                    # Before we go and do something with the files we calculate
-                    # the checksums and compare it against the reference.  This
-                    # also deduplicates duplicates uploaded in the same request.
-                    # This is necessary because we acquire multiple locks in one
-                    # go which would let us deadlock otherwise.
-                    size, checksum = _get_size_and_checksum(fileobj)
-                    if reference_checksum is not None and checksum != reference_checksum:
-                        raise OSError("Checksum mismatch")
-                    if checksum in checksums_seen:
-                        continue
-                    checksums_seen.add(checksum)
-
-                    # Check if we need to lock the blob.  If we get a result back
-                    # here it means the blob already exists.
-                    lock = locked_blob(cls, checksum, logger=logger)
-                    existing = lock.__enter__()
-                    if existing is not None:
-                        lock.__exit__(None, None, None)
-                        blobs_created.append(existing)
-                        _ensure_blob_owned(existing)
-                        continue
 
-                    # Remember the lock to force unlock all at the end if we
-                    # encounter any difficulties.
-                    locks.add(lock)
-
-                    # Otherwise we leave the blob locked and submit the task.
-                    # We use the semaphore to ensure we never schedule too
-                    # many.  The upload will be done with a certain amount
-                    # of concurrency controlled by the semaphore and the
-                    # `_flush_blobs` call will take all those uploaded
-                    # blobs and associate them with the database.
-                    semaphore.acquire()
-                    exe.submit(_upload_and_pend_chunk(fileobj, size, checksum, lock))
-                    logger.debug("FileBlob.from_files.end", extra={"checksum": reference_checksum})
-
-            _flush_blobs()
-        finally:
-            for lock in locks:
-                try:
-                    lock.__exit__(None, None, None)
-                except Exception:
-                    pass
-            logger.debug("FileBlob.from_files.end")
+            # Copies of ours that lost the race are dropped.
+            for checksum in batch:
+                blob = uploaded.get(checksum)
+                if blob is not None and blobs[checksum].path != blob.path:
+                    storage.delete(blob.path)
+
+        logger.debug("FileBlob.from_files.end")
 
     @classmethod
     def from_file(cls, fileobj, logger=nooplogger):
@@ -229,5 +248,105 @@ class AbstractFileBlob(Model):
         """
         assert self.path
 
+        if self.cache.enabled:
+            return self.cache.getfile(self)
+        return self._open_stored()
+
+    def _open_stored(self):
         storage = get_storage(self._storage_config())
         return storage.open(self.path)
+
+
+class FileBlobCache:
+    """
+    Content addressed cache of blobs on the local disk, shared by all the processes of a host.
+
+    Blobs are stored under their checksum, so the same chunk is downloaded only once per host no matter which
+    file it belongs to. Downloads are written to a temporary file that is moved into place once the checksum was
+    verified. The least recently used blobs are evicted once the cache grows over `fileblob.cache-max-size`.
+
+    Eviction scans the whole cache directory, thus a process only evicts after its first download and then
+    whenever it downloaded another `EVICTION_THRESHOLD` share of the budget since. Depending on the number of
+    processes the cache may temporarily exceed its budget by that much.
+    """
+
+    EVICTION_THRESHOLD = 0.1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # bytes downloaded by this process since the last eviction, None until the first one
+        self._downloaded = None
+
+    def _maybe_evict(self, size):
+        with self._lock:
+            if self._downloaded is not None:
+                self._downloaded += size
+                if self._downloaded < self.max_size * self.EVICTION_THRESHOLD:
+                    return
+            self._downloaded = 0
+
+        evicted = evict_cached_files(self.cache_path, self.max_size)
+        metrics.incr("filestore.blob-cache.evicted", amount=evicted)
+
+    @property
+    def cache_path(self):
+        return options.get("fileblob.cache-path")
+
+    @property
+    def max_size(self):
+        return options.get("fileblob.cache-max-size")
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def get_path(self, checksum):
+        return os.path.join(self.cache_path, checksum[:2], checksum)
+
+    def _download(self, blob, file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        # dotfiles are skipped by the eviction, see `evict_cached_files`
+        fd, tmp_path = tempfile.mkstemp(prefix="._download-", dir=os.path.dirname(file_path))
+        try:
+            checksum = sha1()
+            with os.fdopen(fd, "wb") as dst, blob._open_stored() as src:
+                for chunk in iter(lambda: src.read(65536), b""):
+                    checksum.update(chunk)
+                    dst.write(chunk)
+
+            if checksum.hexdigest() != blob.checksum:
+                return False
+            os.replace(tmp_path, file_path)
+            return True
+        finally:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def getfile(self, blob):
+        if blob.size is None or blob.size > self.max_size:
+            metrics.incr("filestore.blob-cache.get", tags={"result": "too_large"})
+            return blob._open_stored()
+
+        file_path = self.get_path(blob.checksum)
+        try:
+            # Bumping the modification time marks the blob as recently used for the eviction.
+            os.utime(file_path)
+            result = "hit"
+        except FileNotFoundError:
+            if not self._download(blob, file_path):
+                metrics.incr("filestore.blob-cache.get", tags={"result": "checksum_mismatch"})
+                return blob._open_stored()
+            self._maybe_evict(blob.size)
+            result = "miss"
+
+        metrics.incr("filestore.blob-cache.get", tags={"result": result})
+        try:
+            return File(open(file_path, "rb"))
+        except FileNotFoundError:
+            # Another process evicted the blob in the meantime.
+            return blob._open_stored()
+
+
+AbstractFileBlob.cache = FileBlobCache()
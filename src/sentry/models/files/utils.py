@@ -1,3 +1,4 @@
+import mmap
 import os
 import time
 from contextlib import contextmanager
@@ -111,3 +112,83 @@ def clear_cached_files(cache_path):
                     os.remove(cached_file)
                 except OSError:
                     pass
+
+
+def evict_cached_files(cache_path, max_size):
+    """Removes the least recently modified files of a cache directory until
+    the files left take up at most `max_size` bytes.
+
+    Returns the number of removed files.
+    """
+    entries = []
+    for dirpath, _, filenames in os.walk(cache_path):
+        for filename in filenames:
+            # skip temporary files of writes in progress, see `File.save_to`
+            if filename.startswith("."):
+                continue
+            cached_file = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(cached_file)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cached_file))
+
+    total_size = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, cached_file in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(cached_file)
+        except OSError:
+            continue
+        total_size -= size
+        evicted += 1
+
+    return evicted
+
+
+class MappedFile:
+    """Read-only file object backed by a memory map of a file on disk.
+
+    Reading does not copy the file into the memory of the process, and the
+    pages are shared with all other processes mapping the same file.
+    """
+
+    def __init__(self, path):
+        self.name = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    @property
+    def size(self):
+        return self._mmap.size()
+
+    @property
+    def closed(self):
+        return self._mmap.closed
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, n=-1):
+        return self._mmap.read(n if n is not None and n >= 0 else None)
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        self._mmap.seek(pos, whence)
+        return self._mmap.tell()
+
+    def tell(self):
+        return self._mmap.tell()
+
+    def close(self):
+        self._mmap.close()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, Sequence
 
 from django.db import models
 
@@ -117,6 +117,42 @@ class ProjectOptionManager(OptionManager["Project"]):
 
         return self._option_cache.get(cache_key, {})
 
+    def prefetch_all_values(self, project_ids: Iterable[int]) -> None:
+        """
+        Loads the options of many projects into the local cache, so that the
+        following `get_all_values` calls for them do not hit the cache or the
+        database one project at a time.
+        """
+        cache_keys = {
+            self._make_key(project_id): project_id
+            for project_id in project_ids
+            if self._make_key(project_id) not in self._option_cache
+        }
+        if not cache_keys:
+            return
+
+        cached = {
+            cache_key: result
+            for cache_key, result in cache.get_many(list(cache_keys)).items()
+            if result is not None
+        }
+        self._option_cache.update(cached)
+
+        missing: Dict[int, Dict[str, Value]] = {
+            project_id: {}
+            for cache_key, project_id in cache_keys.items()
+            if cache_key not in cached
+        }
+        if not missing:
+            return
+
+        for option in self.filter(project__in=list(missing)):
+            missing[option.project_id][option.key] = option.value
+
+        results = {self._make_key(project_id): result for project_id, result in missing.items()}
+        cache.set_many(results)
+        self._option_cache.update(results)
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         from sentry.tasks.relay import schedule_invalidate_project_config
 
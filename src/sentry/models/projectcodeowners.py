@@ -87,12 +87,17 @@ class ProjectCodeOwners(DefaultFieldsModel):
 
         return merged_code_owners
 
-    def update_schema(self, organization: Organization, raw: str | None = None) -> None:
+    def update_schema(
+        self, organization: Organization, raw: str | None = None, use_cache: bool = False
+    ) -> None:
         """
         Updating the schema goes through the following steps:
         1. parsing the original codeowner file to get the associations
         2. convert the codeowner file to the ownership syntax
         3. convert the ownership syntax to the schema
+
+        `use_cache` allows actor resolution to be served from a short lived
+        cache, which is what the background sync tasks want.
         """
         from sentry.api.validators.project_codeowners import validate_codeowners_associations
         from sentry.utils.codeowners import MAX_RAW_LENGTH
@@ -122,7 +127,7 @@ class ProjectCodeOwners(DefaultFieldsModel):
         # Convert IssueOwner syntax into schema syntax
         try:
             schema = create_schema_from_issue_owners(
-                issue_owners=issue_owner_rules, project_id=self.project.id
+                issue_owners=issue_owner_rules, project_id=self.project.id, use_cache=use_cache
             )
             # Convert IssueOwner syntax into schema syntax
             if schema:
@@ -126,6 +126,32 @@ register(
     default=1024 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+register(
+    "artifactbundle.cache-path",
+    type=String,
+    default="/tmp/sentry-artifactbundle-cache",
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Total size in bytes of the artifact bundles cached on disk, 0 disables the cache.
+register(
+    "artifactbundle.cache-max-size",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "fileblob.cache-path",
+    type=String,
+    default="/tmp/sentry-fileblob-cache",
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Total size in bytes of the file blobs cached on disk, 0 disables the cache.
+register(
+    "fileblob.cache-max-size",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 
 # Mail
@@ -1347,3 +1373,51 @@ register(
     default=False,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+
+# Digests are built from the timeline in chunks instead of loading it into
+# memory all at once. The number of groups that are kept in memory (and
+# rendered) is bounded by `digests.streaming.max-groups`.
+register("digests.streaming.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("digests.streaming.chunk-size", default=1000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("digests.streaming.max-groups", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Number of ready timelines handed to a single `deliver_digests` task. With the
+# default of 1 every timeline is delivered by its own `deliver_digest` task.
+register("digests.delivery.batch-size", default=1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Number of ids each Postgres indexer process leases from the id sequence at a
+# time. New strings are then inserted with their ids assigned, and only the
+# ones that conflict with a concurrent insert are read back. 0 disables leasing.
+register("sentry-metrics.indexer.id-leasing.block-size", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Bytes of parsed source views and sourcemaps each JavaScript processing worker
+# keeps across events. 0 disables the cache.
+register("sourcemaps.parsed-cache.max-size", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Threads each JavaScript processing worker uses to fetch the files and
+# sourcemaps of an event concurrently, and how many of them a single
+# organization can occupy. 0 or 1 fetches the files one after another.
+register("sourcemaps.fetch-concurrency", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "sourcemaps.fetch-concurrency.per-organization", default=4, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
+# Processed frames are cached for `processing.frame-cache.ttl` seconds, keyed by
+# the processor, the release or debug files and the frame. Every worker keeps up
+# to `processing.frame-cache.local-max-size` of them in memory in front of the
+# default cache. The processors that use the cache are opted in one by one.
+register("processing.frame-cache.ttl", default=3600, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("processing.frame-cache.local-max-size", default=10000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("processing.frame-cache.javascript", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("processing.frame-cache.java", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Chunks of a file that downloads of attachments and debug files fetch ahead
+# of the one being streamed. 0 fetches the chunks one after another.
+register("filestore.download-readahead", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Threads deleting the child relations of a deletion task, and the number of
+# shards by id each relation is split into. 0 or 1 deletes the relations one
+# after another. The rows deleted per second by the deletions of a process are
+# capped by `deletions.executor.max-rows-per-second`, 0 disables the limit.
+register("deletions.executor.concurrency", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("deletions.executor.num-shards", default=1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("deletions.executor.max-rows-per-second", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
@@ -24,9 +24,11 @@ from rest_framework.serializers import ValidationError
 from sentry.eventstore.models import EventSubjectTemplateData
 from sentry.models import ActorTuple, OrganizationMember, RepositoryProjectPathConfig
 from sentry.services.hybrid_cloud.user.service import user_service
+from sentry.utils.cache import cache
 from sentry.utils.codeowners import codeowners_match
 from sentry.utils.event_frames import find_stack_frames, get_sdk_name, munged_filename_and_frames
 from sentry.utils.glob import glob_match
+from sentry.utils.hashlib import hash_values, md5_text
 from sentry.utils.safe import PathSearchable, get_path
 
 __all__ = ("parse_rules", "dump_schema", "load_schema")
@@ -38,6 +40,12 @@ PATH = "path"
 MODULE = "module"
 CODEOWNERS = "codeowners"
 
+# Conversion results are content addressed, so they never go stale and can be
+# kept around for a while. Actor resolution depends on team membership and is
+# only cached briefly.
+CODEOWNERS_CACHE_DURATION = 3600
+RESOLVE_ACTORS_CACHE_DURATION = 60
+
 # Grammar is defined in EBNF syntax.
 ownership_grammar = Grammar(
     rf"""
@@ -409,8 +417,22 @@ def convert_schema_to_rules_text(schema: Mapping[str, Any]) -> str:
     return text
 
 
+def _get_codeowners_cache_key(kind: str, *values: Any) -> str:
+    return f"codeowners:{kind}:{VERSION}:{hash_values(values)}"
+
+
 def parse_code_owners(data: str) -> Tuple[List[str], List[str], List[str]]:
     """Parse a CODEOWNERS text and returns the list of team names, list of usernames"""
+    cache_key = _get_codeowners_cache_key("parse", md5_text(data).hexdigest())
+    result = cache.get(cache_key)
+    if result is None:
+        result = _parse_code_owners(data)
+        cache.set(cache_key, result, CODEOWNERS_CACHE_DURATION)
+    teams, usernames, emails = result
+    return list(teams), list(usernames), list(emails)
+
+
+def _parse_code_owners(data: str) -> Tuple[List[str], List[str], List[str]]:
     teams = []
     usernames = []
     emails = []
@@ -450,8 +472,28 @@ def convert_codeowners_syntax(
     codeowners: CODEOWNERS text
     associations: dict of {externalName: sentryName}
     code_mapping: RepositoryProjectPathConfig object
+
+    Results are cached by the hash of the CODEOWNERS text, the code mapping
+    roots and the associations, so re-syncing an unchanged file is free.
     """
+    cache_key = _get_codeowners_cache_key(
+        "convert",
+        md5_text(codeowners).hexdigest(),
+        getattr(code_mapping, "id", None),
+        code_mapping.source_root,
+        code_mapping.stack_root,
+        dict(associations),
+    )
+    result: Optional[str] = cache.get(cache_key)
+    if result is None:
+        result = _convert_codeowners_syntax(codeowners, associations, code_mapping)
+        cache.set(cache_key, result, CODEOWNERS_CACHE_DURATION)
+    return result
+
 
+def _convert_codeowners_syntax(
+    codeowners: str, associations: Mapping[str, Any], code_mapping: RepositoryProjectPathConfig
+) -> str:
     result = ""
 
     for rule in codeowners.splitlines():
@@ -521,33 +563,74 @@ def get_source_code_path_from_stacktrace_path(
     return None
 
 
-def resolve_actors(owners: Iterable[Owner], project_id: int) -> Mapping[Owner, ActorTuple]:
+def _get_resolve_actors_cache_key(project_id: int, owner_type: str, identifier: str) -> str:
+    return f"codeowners:actor:{project_id}:{md5_text(owner_type, identifier).hexdigest()}"
+
+
+def resolve_actors(
+    owners: Iterable[Owner], project_id: int, use_cache: bool = False
+) -> Mapping[Owner, ActorTuple]:
     """Convert a list of Owner objects into a dictionary
     of {Owner: Actor} pairs. Actors not identified are returned
-    as None."""
-    from sentry.models import ActorTuple, Team, User
+    as None.
+
+    With `use_cache`, previously resolved owners are read from the cache
+    in a single `get_many` and only the misses are looked up.
+    """
+    from sentry.models import Team, User
 
     if not owners:
         return {}
 
+    owner_keys = {(o.type, o.identifier.lower()) for o in owners}
+    actors: Dict[Tuple[str, str], Optional[ActorTuple]] = {}
+
+    cache_keys = {}
+    if use_cache:
+        actor_types = {"user": User, "team": Team}
+        cache_keys = {key: _get_resolve_actors_cache_key(project_id, *key) for key in owner_keys}
+        cached = cache.get_many(list(cache_keys.values()))
+        for key, cache_key in cache_keys.items():
+            if cache_key in cached:
+                # Unresolved owners are cached as a 0 id.
+                actor_id, actor_type = cached[cache_key]
+                actors[key] = ActorTuple(actor_id, actor_types[actor_type]) if actor_id else None
+
+    missing = owner_keys - actors.keys()
+    if missing:
+        resolved = _resolve_actors(missing, project_id)
+        actors.update(resolved)
+        if use_cache:
+            cache.set_many(
+                {
+                    cache_keys[key]: (actor.id, key[0]) if actor else (0, key[0])
+                    for key, actor in resolved.items()
+                },
+                RESOLVE_ACTORS_CACHE_DURATION,
+            )
+
+    return {o: actors.get((o.type, o.identifier.lower())) for o in owners}
+
+
+def _resolve_actors(
+    owner_keys: Iterable[Tuple[str, str]], project_id: int
+) -> Dict[Tuple[str, str], Optional[ActorTuple]]:
+    from sentry.models import Team, User
+
     users, teams = [], []
-    owners_lookup = {}
 
-    for owner in owners:
+    for owner_type, identifier in owner_keys:
         # teams aren't technical case insensitive, but teams also
         # aren't allowed to have non-lowercase in slugs, so
         # this kinda works itself out correctly since they won't match
-        owners_lookup[(owner.type, owner.identifier.lower())] = owner
-        if owner.type == "user":
-            users.append(owner)
-        elif owner.type == "team":
-            teams.append(owner)
+        if owner_type == "user":
+            users.append(identifier)
+        elif owner_type == "team":
+            teams.append(identifier)
 
-    actors = {}
+    actors: Dict[Tuple[str, str], Optional[ActorTuple]] = {}
     if users:
-        owner_users = user_service.get_many(
-            filter=dict(emails=[o.identifier for o in users], is_active=True)
-        )
+        owner_users = user_service.get_many(filter=dict(emails=users, is_active=True))
         in_project_user_ids = set(
             OrganizationMember.objects.filter(
                 teams__projectteam__project__in=[project_id],
@@ -576,12 +659,12 @@ def resolve_actors(owners: Iterable[Owner], project_id: int) -> Mapping[Owner, A
             {
                 ("team", slug): ActorTuple(t_id, Team)
                 for t_id, slug in Team.objects.filter(
-                    slug__in=[o.identifier for o in teams], projectteam__project_id=project_id
+                    slug__in=teams, projectteam__project_id=project_id
                 ).values_list("id", "slug")
             }
         )
 
-    return {o: actors.get((o.type, o.identifier.lower())) for o in owners}
+    return {key: actors.get(key) for key in owner_keys}
 
 
 def remove_deleted_owners_from_schema(
@@ -616,6 +699,7 @@ def create_schema_from_issue_owners(
     project_id: int,
     add_owner_ids: bool = False,
     remove_deleted_owners: bool = False,
+    use_cache: bool = False,
 ) -> Mapping[str, Any]:
     try:
         rules = parse_rules(issue_owners)
@@ -628,7 +712,7 @@ def create_schema_from_issue_owners(
 
     owners = {o for rule in rules for o in rule.owners}
     owners_id = {}
-    actors = resolve_actors(owners, project_id)
+    actors = resolve_actors(owners, project_id, use_cache=use_cache)
 
     bad_actors = []
     for owner, actor in actors.items():
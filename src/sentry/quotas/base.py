@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import IntEnum, unique
-from typing import TYPE_CHECKING, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Sequence, Tuple
 
 from django.conf import settings
 from django.core.cache import cache
@@ -12,7 +12,7 @@ from sentry.utils.json import prune_empty_keys
 from sentry.utils.services import Service
 
 if TYPE_CHECKING:
-    from sentry.models import Project
+    from sentry.models import Project, ProjectKey
 
 
 @unique
@@ -169,6 +169,20 @@ class RateLimited(RateLimit):
         super().__init__(True, **kwargs)
 
 
+class QuotaItem(NamedTuple):
+    """
+    A quantity of data in a category, consumed in a project through an
+    (optional) project key. Used to check or refund quotas in bulk, see
+    ``Quota.is_rate_limited_many`` and ``Quota.refund_many``.
+    """
+
+    project: Project
+    key: Optional[ProjectKey] = None
+    category: DataCategory = DataCategory.ERROR
+    quantity: int = 1
+    timestamp: Optional[float] = None
+
+
 def _limit_from_settings(x: Any) -> int | None:
     """
     limit=0 (or any falsy value) in database means "no limit". Convert that to
@@ -211,8 +225,10 @@ class Quota(Service):
         "get_project_quota",
         "get_organization_quota",
         "is_rate_limited",
+        "is_rate_limited_many",
         "validate",
         "refund",
+        "refund_many",
         "get_event_retention",
         "get_quotas",
         "get_blended_sample_rate",
@@ -290,6 +306,35 @@ class Quota(Service):
                           attachment in bytes.
         """
 
+    def is_rate_limited_many(self, items: Sequence[QuotaItem]) -> Sequence[RateLimit]:
+        """
+        Checks and consumes quotas for many items at once, returning a
+        ``RateLimit`` for each item in the same order. Every item is checked
+        and counted separately, exactly as if ``is_rate_limited`` was called
+        for each of them in sequence, but backends may do so with fewer round
+        trips.
+
+        :param items: A sequence of ``QuotaItem``.
+        """
+        return [self.is_rate_limited(item.project, key=item.key) for item in items]
+
+    def refund_many(self, items: Sequence[QuotaItem]) -> None:
+        """
+        Refunds previously consumed quotas for many items at once, see
+        ``refund``.
+
+        :param items: A sequence of ``QuotaItem``. Items without a timestamp
+                      are refunded to the current quota window.
+        """
+        for item in items:
+            self.refund(
+                item.project,
+                key=item.key,
+                timestamp=item.timestamp,
+                category=item.category,
+                quantity=item.quantity,
+            )
+
     def get_event_retention(self, organization):
         """
         Returns the retention for events in the given organization in days.
@@ -1,9 +1,17 @@
+from collections import defaultdict
 from time import time
 
 import sentry_sdk
 
 from sentry.constants import DataCategory
-from sentry.quotas.base import NotRateLimited, Quota, QuotaConfig, QuotaScope, RateLimited
+from sentry.quotas.base import (
+    NotRateLimited,
+    Quota,
+    QuotaConfig,
+    QuotaScope,
+    RateLimit,
+    RateLimited,
+)
 from sentry.utils.redis import (
     get_dynamic_cluster_from_options,
     load_script,
@@ -194,6 +202,21 @@ class RedisQuota(Quota):
         if timestamp is None:
             timestamp = time()
 
+        prepared = self.__prepare_rate_limit(project, key, timestamp, DataCategory.ERROR, 1)
+        if isinstance(prepared, RateLimit):
+            return prepared
+
+        quotas, keys, args = prepared
+        client = self.__get_redis_client(str(project.organization_id))
+        rejections = is_rate_limited(client, keys, args)
+        return self.__get_rate_limit(project, timestamp, quotas, rejections)
+
+    def __prepare_rate_limit(self, project, key, timestamp, category, quantity):
+        """
+        Returns the quotas to check along with the keys and arguments for the
+        ``is_rate_limited`` script, or a ``RateLimit`` if the outcome is known
+        without checking the counters.
+        """
         # Relay supports separate rate limiting per data category and and can
         # handle scopes explicitly. This function implements a simplified logic
         # that treats all events the same and ignores transaction rate limits.
@@ -202,7 +225,7 @@ class RedisQuota(Quota):
         quotas = [
             q
             for q in self.get_quotas(project, key=key)
-            if not q.categories or DataCategory.ERROR in q.categories
+            if not q.categories or category in q.categories
         ]
 
         # If there are no quotas to actually check, skip the trip to the database.
@@ -236,9 +259,13 @@ class RedisQuota(Quota):
         if not keys or not args:
             return NotRateLimited()
 
-        client = self.__get_redis_client(str(project.organization_id))
-        rejections = is_rate_limited(client, keys, args)
+        # The script consumes a quantity of 1 unless told otherwise.
+        if quantity != 1:
+            args.append(quantity)
 
+        return quotas, keys, args
+
+    def __get_rate_limit(self, project, timestamp, quotas, rejections):
         if not any(rejections):
             return NotRateLimited()
 
@@ -253,3 +280,86 @@ class RedisQuota(Quota):
                 worst_case = (delay, quota.reason_code)
 
         return RateLimited(retry_after=worst_case[0], reason_code=worst_case[1])
+
+    def __get_shard(self, organization_id):
+        # Every key of an organization is routed by the organization id, so
+        # organizations living on the same host can share a pipeline.
+        if self.is_redis_cluster:
+            return None
+        return self.cluster.get_router().get_host_for_key(str(organization_id))
+
+    def __get_shard_client(self, shard):
+        if self.is_redis_cluster:
+            return self.cluster
+        return self.cluster.get_local_client(shard)
+
+    def is_rate_limited_many(self, items):
+        results = [None] * len(items)
+        pending = defaultdict(list)
+
+        for index, item in enumerate(items):
+            timestamp = item.timestamp if item.timestamp is not None else time()
+            prepared = self.__prepare_rate_limit(
+                item.project, item.key, timestamp, item.category, item.quantity
+            )
+            if isinstance(prepared, RateLimit):
+                results[index] = prepared
+            else:
+                shard = self.__get_shard(item.project.organization_id)
+                pending[shard].append((index, item.project, timestamp, prepared))
+
+        for shard, checks in pending.items():
+            client = self.__get_shard_client(shard)
+            if self.is_redis_cluster:
+                # Scripts cannot be pipelined across a redis cluster.
+                all_rejections = [
+                    is_rate_limited(client, keys, args) for *_, (_, keys, args) in checks
+                ]
+            else:
+                # The checks are executed in order, one script call per item,
+                # so each item is still checked and counted atomically.
+                with client.pipeline(transaction=False) as pipe:
+                    for *_, (_, keys, args) in checks:
+                        is_rate_limited(pipe, keys, args)
+                    all_rejections = pipe.execute()
+
+            for (index, project, timestamp, (quotas, _, _)), rejections in zip(
+                checks, all_rejections
+            ):
+                results[index] = self.__get_rate_limit(project, timestamp, quotas, rejections)
+
+        return results
+
+    def refund_many(self, items):
+        # Refunds for the same counter are merged into a single increment.
+        quantities = defaultdict(int)
+        expiries = {}
+
+        for item in items:
+            timestamp = item.timestamp if item.timestamp is not None else time()
+            organization_id = item.project.organization_id
+            shard = self.__get_shard(organization_id)
+            for quota in self.get_quotas(item.project, key=item.key):
+                if not quota.should_track or item.category not in quota.categories:
+                    continue
+
+                shift = organization_id % quota.window
+                expiry = self.get_next_period_start(quota.window, shift, timestamp) + self.grace
+                return_key = self.get_refunded_quota_key(
+                    self.__get_redis_key(quota, timestamp, shift, organization_id)
+                )
+                quantities[(shard, return_key)] += item.quantity
+                expiries[(shard, return_key)] = max(
+                    expiries.get((shard, return_key), 0), int(expiry)
+                )
+
+        by_shard = defaultdict(list)
+        for (shard, return_key), quantity in quantities.items():
+            by_shard[shard].append((return_key, quantity, expiries[(shard, return_key)]))
+
+        for shard, refunds in by_shard.items():
+            pipe = self.__get_shard_client(shard).pipeline()
+            for return_key, quantity, expiry in refunds:
+                pipe.incr(return_key, quantity)
+                pipe.expireat(return_key, expiry)
+            pipe.execute()
@@ -1,4 +1,6 @@
-from typing import Mapping, Optional, Sequence, Tuple
+import threading
+import time
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Set, Tuple
 
 from sentry_redis_tools.cardinality_limiter import CardinalityLimiter as CardinalityLimiterBase
 from sentry_redis_tools.cardinality_limiter import GrantedQuota, Quota
@@ -22,6 +24,66 @@ class CardinalityLimiter(Service, CardinalityLimiterBase):
     pass
 
 
+class LocalAdmissionCache:
+    """
+    A per-process set of unit hashes that have already been admitted and
+    written to Redis, scoped to the current granule of each prefix.
+
+    Within a granule, `use_quotas` writes a hash to the same Redis sets no
+    matter how often it is admitted, and a hash that Redis already knows
+    about is always admitted. Hashes in this cache can therefore skip the
+    roundtrip entirely until the granule rolls over, at which point the
+    entries of that prefix are discarded.
+
+    `max_size` bounds the total number of cached hashes. When it is
+    exceeded, the whole cache is dropped and repopulated from Redis.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._size = 0
+        self._entries: Dict[str, Tuple[int, FrozenSet[Hash]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _granule(quota: Quota, timestamp: Timestamp) -> int:
+        return timestamp // quota.granularity_seconds
+
+    def get(self, prefix: str, quota: Quota, timestamp: Timestamp) -> FrozenSet[Hash]:
+        granule = self._granule(quota, timestamp)
+        with self._lock:
+            entry = self._entries.get(prefix)
+            if entry is None or entry[0] != granule:
+                return frozenset()
+            return entry[1]
+
+    def add(self, prefix: str, quota: Quota, timestamp: Timestamp, hashes: Sequence[Hash]) -> None:
+        granule = self._granule(quota, timestamp)
+        with self._lock:
+            entry = self._entries.get(prefix)
+            if entry is None:
+                previous: FrozenSet[Hash] = frozenset()
+            else:
+                self._size -= len(entry[1])
+                previous = entry[1] if entry[0] == granule else frozenset()
+
+            # Replace rather than mutate, so that sets handed out by `get`
+            # stay stable while other threads keep admitting hashes.
+            admitted = previous.union(hashes)
+            self._entries[prefix] = (granule, admitted)
+            self._size += len(admitted)
+
+            if self._size > self.max_size:
+                metrics.incr("ratelimits.cardinality.local_cache.overflow")
+                self._entries.clear()
+                self._size = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
 class RedisCardinalityLimiter(CardinalityLimiter):
     def __init__(
         self,
@@ -29,6 +91,7 @@ class RedisCardinalityLimiter(CardinalityLimiter):
         num_shards: int = 3,
         num_physical_shards: int = 3,
         metric_tags: Optional[Mapping[str, str]] = None,
+        local_cache_size: int = 0,
     ) -> None:
         """
         :param cluster: Name of the redis cluster to use, to be configured with
@@ -41,6 +104,9 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             Redis. The ratio `cluster_num_physical_shards / cluster_num_shards`
             is a sampling rate, the lower it is, the less precise accounting
             will be.
+        :param local_cache_size: The maximum number of admitted hashes to
+            remember in-process for the current granule. Requests for those
+            hashes are granted without asking Redis. `0` disables the cache.
         """
         is_redis_cluster, client, _ = redis.get_dynamic_cluster_from_options(
             "", {"cluster": cluster}
@@ -57,17 +123,109 @@ class RedisCardinalityLimiter(CardinalityLimiter):
             num_physical_shards=num_physical_shards,
             metrics_backend=RedisToolsMetricsBackend(metrics.backend, tags=metric_tags),
         )
+        self.metric_tags = metric_tags
+        self.local_cache = LocalAdmissionCache(local_cache_size) if local_cache_size > 0 else None
 
         super().__init__()
 
     def check_within_quotas(
         self, requests: Sequence[RequestedQuota], timestamp: Optional[Timestamp] = None
     ) -> Tuple[Timestamp, Sequence[GrantedQuota]]:
-        return self.impl.check_within_quotas(requests, timestamp)
+        if self.local_cache is None:
+            return self.impl.check_within_quotas(requests, timestamp)
+
+        if timestamp is None:
+            timestamp = int(time.time())
+        else:
+            timestamp = int(timestamp)
+
+        known_hashes: List[FrozenSet[Hash]] = []
+        remote_indices: List[Optional[int]] = []
+        remote_requests: List[RequestedQuota] = []
+        hits = misses = 0
+
+        for request in requests:
+            known = self.local_cache.get(request.prefix, request.quota, timestamp)
+            unknown = [hash for hash in request.unit_hashes if hash not in known]
+            known_hashes.append(known)
+            hits += len(request.unit_hashes) - len(unknown)
+            misses += len(unknown)
+            if unknown:
+                remote_indices.append(len(remote_requests))
+                remote_requests.append(
+                    RequestedQuota(prefix=request.prefix, unit_hashes=unknown, quota=request.quota)
+                )
+            else:
+                remote_indices.append(None)
+
+        metrics.incr(
+            "ratelimits.cardinality.local_cache",
+            amount=hits,
+            tags={**(self.metric_tags or {}), "result": "hit"},
+        )
+        metrics.incr(
+            "ratelimits.cardinality.local_cache",
+            amount=misses,
+            tags={**(self.metric_tags or {}), "result": "miss"},
+        )
+
+        remote_grants: Sequence[GrantedQuota] = []
+        if remote_requests:
+            timestamp, remote_grants = self.impl.check_within_quotas(remote_requests, timestamp)
+
+        grants = []
+        for request, known, remote_index in zip(requests, known_hashes, remote_indices):
+            if remote_index is None:
+                granted_hashes: Set[Hash] = set()
+                reached_quota = None
+            else:
+                remote_grant = remote_grants[remote_index]
+                granted_hashes = set(remote_grant.granted_unit_hashes)
+                reached_quota = remote_grant.reached_quota
+
+            grants.append(
+                GrantedQuota(
+                    request=request,
+                    granted_unit_hashes=[
+                        hash
+                        for hash in request.unit_hashes
+                        if hash in known or hash in granted_hashes
+                    ],
+                    reached_quota=reached_quota,
+                )
+            )
+
+        return timestamp, grants
 
     def use_quotas(
         self,
         grants: Sequence[GrantedQuota],
         timestamp: Timestamp,
     ) -> None:
-        return self.impl.use_quotas(grants, timestamp)
+        if self.local_cache is None:
+            return self.impl.use_quotas(grants, timestamp)
+
+        # Hashes that were admitted from the local cache have already been
+        # written for this granule, only the new ones need to go to Redis.
+        remote_grants = []
+        for grant in grants:
+            request = grant.request
+            known = self.local_cache.get(request.prefix, request.quota, timestamp)
+            unknown = [hash for hash in grant.granted_unit_hashes if hash not in known]
+            if unknown:
+                remote_grants.append(
+                    GrantedQuota(
+                        request=request,
+                        granted_unit_hashes=unknown,
+                        reached_quota=grant.reached_quota,
+                    )
+                )
+
+        if remote_grants:
+            self.impl.use_quotas(remote_grants, timestamp)
+
+        for grant in remote_grants:
+            request = grant.request
+            self.local_cache.add(
+                request.prefix, request.quota, timestamp, grant.granted_unit_hashes
+            )
@@ -1,21 +1,26 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
 from dataclasses import dataclass
 from time import time
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from django.conf import settings
+from rediscluster import RedisCluster
 
 from sentry.exceptions import InvalidConfiguration
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 
 logger = logging.getLogger(__name__)
 
 
 ErrorLimit = float("inf")
 DEFAULT_MAX_TTL_SECONDS = 30
+DEFAULT_REAP_BATCH_SIZE = 1000
 
 rate_limit_info = redis.load_script("ratelimits/api_limiter.lua")
+batch_rate_limit_info = redis.load_script("ratelimits/api_limiter_batch.lua")
 
 
 @dataclass
@@ -41,6 +46,9 @@ class ConcurrentRateLimiter:
     def namespaced_key(self, key: str) -> str:
         return f"concurrent_limit:{key}"
 
+    def _is_redis_cluster(self) -> bool:
+        return isinstance(self.client, RedisCluster)
+
     def start_request(self, key: str, limit: int, request_uid: str) -> ConcurrentLimitInfo:
         redis_key = self.namespaced_key(key)
         current_executions, request_allowed, cleaned_up_requests = (-1, True, 0)
@@ -66,6 +74,62 @@ class ConcurrentRateLimiter:
             )
         return ConcurrentLimitInfo(limit, int(current_executions), not bool(request_allowed))
 
+    def start_requests(self, requests: Sequence[Tuple[str, int, str]]) -> List[ConcurrentLimitInfo]:
+        """
+        Starts many `(key, limit, request_uid)` requests at once. Requests
+        against the same key and limit are started by a single script call,
+        in the order they were passed, so the result is the same as calling
+        `start_request` for each of them. Returns one `ConcurrentLimitInfo`
+        per request, in order.
+
+        Like `start_request`, the whole batch fails open if redis errors.
+        """
+        grouped: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for index, (key, limit, _) in enumerate(requests):
+            grouped[(key, limit)].append(index)
+
+        now = time()
+        calls = [
+            (
+                [self.namespaced_key(key)],
+                [limit, now, self.max_ttl_seconds, *(requests[i][2] for i in indexes)],
+            )
+            for (key, limit), indexes in grouped.items()
+        ]
+
+        try:
+            if self._is_redis_cluster():
+                # Scripts cannot be pipelined across a redis cluster.
+                all_results = [
+                    batch_rate_limit_info(self.client, keys, args) for keys, args in calls
+                ]
+            else:
+                with self.client.pipeline(transaction=False) as pipe:
+                    for keys, args in calls:
+                        batch_rate_limit_info(pipe, keys, args)
+                    all_results = pipe.execute()
+        except Exception:
+            logger.exception("Could not start requests", dict(num_requests=len(requests)))
+            return [ConcurrentLimitInfo(limit, -1, False) for _, limit, _ in requests]
+
+        infos: List[Optional[ConcurrentLimitInfo]] = [None] * len(requests)
+        for ((key, limit), indexes), (cleaned_up_requests, *results) in zip(
+            grouped.items(), all_results
+        ):
+            if cleaned_up_requests != 0:
+                logger.info(
+                    "Cleaned up concurrent executions: %s",
+                    cleaned_up_requests,
+                    extra={"cleaned_up_requests": cleaned_up_requests, "key": key, "limit": limit},
+                )
+            for n, index in enumerate(indexes):
+                current_executions, request_allowed = results[2 * n : 2 * n + 2]
+                infos[index] = ConcurrentLimitInfo(
+                    limit, int(current_executions), not bool(request_allowed)
+                )
+
+        return infos  # type: ignore[return-value]
+
     def get_concurrent_requests(self, key: str) -> int:
         redis_key = self.namespaced_key(key)
         # this can fail loudly as it is only meant for observability
@@ -77,3 +141,52 @@ class ConcurrentRateLimiter:
             self.client.zrem(self.namespaced_key(key), request_uid)
         except Exception:
             logger.exception("Could not finish request", dict(key=key, request_uid=request_uid))
+
+    def finish_requests(self, requests: Sequence[Tuple[str, str]]) -> None:
+        """
+        Finishes many `(key, request_uid)` requests with a single `ZREM` per
+        key, pipelined into one round trip.
+        """
+        grouped: Dict[str, List[str]] = defaultdict(list)
+        for key, request_uid in requests:
+            grouped[key].append(request_uid)
+
+        try:
+            with self.client.pipeline(transaction=False) as pipe:
+                for key, request_uids in grouped.items():
+                    pipe.zrem(self.namespaced_key(key), *request_uids)
+                pipe.execute()
+        except Exception:
+            logger.exception("Could not finish requests", dict(num_requests=len(requests)))
+
+    def reap_expired_requests(self, batch_size: int = DEFAULT_REAP_BATCH_SIZE) -> int:
+        """
+        Removes requests that are older than the max TTL from every key in a
+        single `SCAN` pass. `start_request` only cleans up the key it is
+        called for, so requests that leaked on a key that is not used again
+        would otherwise stay around. Returns the number of removed requests.
+        """
+        cutoff = time() - self.max_ttl_seconds
+        reaped = 0
+        keys_seen = 0
+
+        def reap(keys: List[str]) -> int:
+            with self.client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.zremrangebyscore(key, "-inf", cutoff)
+                return sum(pipe.execute())
+
+        batch: List[str] = []
+        for key in self.client.scan_iter(match=self.namespaced_key("*"), count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                reaped += reap(batch)
+                keys_seen += len(batch)
+                batch = []
+        if batch:
+            reaped += reap(batch)
+            keys_seen += len(batch)
+
+        metrics.incr("ratelimits.concurrent.reaped", amount=reaped)
+        metrics.gauge("ratelimits.concurrent.keys", keys_seen)
+        return reaped
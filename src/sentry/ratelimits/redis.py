@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
+import threading
+from dataclasses import dataclass
 from time import time
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from django.conf import settings
 from redis.exceptions import RedisError
@@ -28,11 +30,33 @@ def _bucket_start_time(bucket_number: int, window: int) -> int:
     return bucket_number * window
 
 
+@dataclass
+class _Lease:
+    """A block of rate limit tokens taken from redis, handed out locally."""
+
+    redis_key: str
+    next_value: int
+    last_value: int
+
+
 class RedisRateLimiter(RateLimiter):
     def __init__(self, **options: Any) -> None:
         cluster_key = settings.SENTRY_RATE_LIMIT_REDIS_CLUSTER
         self.client = redis.redis_clusters.get(cluster_key)
 
+        # When ``lease_size`` is larger than 1, each process takes blocks of
+        # (up to) that many tokens from redis with a single INCRBY and answers
+        # from them locally until they run out. A block never exceeds a tenth
+        # of the limit, and single tokens are requested once a key gets close
+        # to its limit, so no more than ``limit`` requests are ever granted.
+        # Unused tokens of a block are lost at the end of the window, which
+        # means a key can be limited slightly early, by at most
+        # ``lease_size - 1`` requests per process.
+        self.lease_size: int = options.get("lease_size", 0)
+        self.max_leases: int = options.get("max_leases", 10000)
+        self._leases: Dict[Tuple[str, Optional[int], int], _Lease] = {}
+        self._leases_lock = threading.Lock()
+
     def _construct_redis_key(
         self,
         key: str,
@@ -106,8 +130,16 @@ class RedisRateLimiter(RateLimiter):
         # Reset Time = next time bucket's start time
         reset_time = _bucket_start_time(_time_bucket(request_time, window) + 1, window)
         try:
-            result = self.client.incr(redis_key)
-            self.client.expire(redis_key, expiration)
+            if self.lease_size > 1:
+                result = self._take_leased_token(
+                    (key, project.id if project is not None else None, window),
+                    redis_key,
+                    limit,
+                    expiration,
+                )
+            else:
+                result = self.client.incr(redis_key)
+                self.client.expire(redis_key, expiration)
         except RedisError:
             # We don't want rate limited endpoints to fail when ratelimits
             # can't be updated. We do want to know when that happens.
@@ -115,3 +147,36 @@ class RedisRateLimiter(RateLimiter):
             return False, 0, reset_time
 
         return result > limit, result, reset_time
+
+    def _take_leased_token(
+        self, lease_key: Tuple[str, Optional[int], int], redis_key: str, limit: int, expiration: int
+    ) -> int:
+        """
+        Return the counter value of the next token for ``redis_key``, taking it
+        from the local lease if one is available.
+        """
+        block = min(self.lease_size, max(1, limit // 10))
+        with self._leases_lock:
+            lease = self._leases.get(lease_key)
+            if lease is not None and lease.redis_key == redis_key:
+                if lease.next_value <= lease.last_value:
+                    value = lease.next_value
+                    lease.next_value += 1
+                    return value
+                if lease.last_value + block > limit:
+                    block = 1
+
+        with self.client.pipeline() as pipe:
+            pipe.incrby(redis_key, block)
+            pipe.expire(redis_key, expiration)
+            result, _ = pipe.execute()
+
+        first_value = result - block + 1
+        with self._leases_lock:
+            self._leases.pop(lease_key, None)
+            if len(self._leases) >= self.max_leases:
+                # Evict the least recently leased key.
+                del self._leases[next(iter(self._leases))]
+            self._leases[lease_key] = _Lease(redis_key, first_value + 1, result)
+
+        return first_value
@@ -0,0 +1,162 @@
+"""
+Offline simulation of the sliding window rate limiter.
+
+Replays a synthetic stream of requests against a `SlidingWindowRateLimiter`
+and compares the grants with an exact (per-second) sliding window, to find
+out how much the granularity of a quota costs in accuracy and how many Redis
+commands a quota configuration needs. See `bin/benchmark-sliding-windows`.
+"""
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from sentry.ratelimits.sliding_windows import (
+    InMemorySlidingWindowRateLimiter,
+    Quota,
+    RequestedQuota,
+    SlidingWindowRateLimiter,
+)
+
+
+@dataclass(frozen=True)
+class SimulatedRequest:
+    timestamp: int
+    prefix: str
+    requested: int
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    quota: Quota
+    requests: int
+    requested: int
+    granted: int
+    # what an exact sliding window would have granted for the same stream
+    ideal_granted: int
+    # only known for limiters that count them
+    redis_ops: Optional[int]
+    duration: float
+
+    @property
+    def accuracy(self) -> float:
+        if self.ideal_granted == 0:
+            return 1.0 if self.granted == 0 else float("inf")
+        return self.granted / self.ideal_granted
+
+    @property
+    def redis_ops_per_request(self) -> Optional[float]:
+        if self.redis_ops is None or not self.requests:
+            return None
+        return self.redis_ops / self.requests
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+
+def generate_requests(
+    duration: int,
+    rate: float,
+    num_prefixes: int = 10,
+    max_units: int = 1,
+    burst_every: int = 0,
+    burst_factor: float = 1.0,
+    start: int = 0,
+    seed: Optional[int] = None,
+) -> List[SimulatedRequest]:
+    """
+    Generates `duration` seconds of requests arriving at `rate` requests per
+    second on average. Prefixes follow a zipf-like distribution, so a few
+    prefixes (organizations) dominate the stream like they do in production.
+
+    With `burst_every`, every `burst_every` seconds the rate is multiplied by
+    `burst_factor` for one tenth of that period.
+    """
+    rng = random.Random(seed)
+    prefixes = [f"org-{i}" for i in range(num_prefixes)]
+    weights = [1 / (i + 1) for i in range(num_prefixes)]
+
+    requests = []
+    for second in range(duration):
+        second_rate = rate
+        if burst_every and second % burst_every < max(1, burst_every // 10):
+            second_rate *= burst_factor
+
+        # poisson arrivals within each second
+        elapsed = rng.expovariate(second_rate) if second_rate > 0 else 1.0
+        while elapsed < 1.0:
+            requests.append(
+                SimulatedRequest(
+                    timestamp=start + second,
+                    prefix=rng.choices(prefixes, weights)[0],
+                    requested=rng.randint(1, max_units),
+                )
+            )
+            elapsed += rng.expovariate(second_rate)
+
+    return requests
+
+
+def _ideal_grants(quota: Quota, requests: Sequence[SimulatedRequest]) -> int:
+    """
+    Replays `requests` against an exact sliding window over the last
+    `window_seconds` seconds, without any granules.
+    """
+    history: Dict[str, Deque[Tuple[int, int]]] = defaultdict(deque)
+    used: Dict[str, int] = defaultdict(int)
+    total = 0
+
+    for request in requests:
+        prefix = quota.prefix_override or request.prefix
+        window = history[prefix]
+        while window and window[0][0] <= request.timestamp - quota.window_seconds:
+            _, granted = window.popleft()
+            used[prefix] -= granted
+
+        granted = min(request.requested, max(0, quota.limit - used[prefix]))
+        if granted:
+            window.append((request.timestamp, granted))
+            used[prefix] += granted
+            total += granted
+
+    return total
+
+
+def simulate(
+    quota: Quota,
+    requests: Sequence[SimulatedRequest],
+    limiter: Optional[SlidingWindowRateLimiter] = None,
+) -> SimulationResult:
+    """
+    Feeds `requests` one by one through `check_and_use_quotas` of `limiter`
+    (a fresh in-memory limiter by default) with the given quota.
+    """
+    if limiter is None:
+        limiter = InMemorySlidingWindowRateLimiter()
+
+    redis_ops_before = getattr(limiter, "redis_ops", None)
+    granted = 0
+    start = time.perf_counter()
+    for request in requests:
+        (grant,) = limiter.check_and_use_quotas(
+            [RequestedQuota(prefix=request.prefix, requested=request.requested, quotas=[quota])],
+            timestamp=request.timestamp,
+        )
+        granted += grant.granted
+    duration = time.perf_counter() - start
+
+    redis_ops = None
+    if redis_ops_before is not None:
+        redis_ops = limiter.redis_ops - redis_ops_before  # type: ignore[attr-defined]
+
+    return SimulationResult(
+        quota=quota,
+        requests=len(requests),
+        requested=sum(request.requested for request in requests),
+        granted=granted,
+        ideal_granted=_ideal_grants(quota, requests),
+        redis_ops=redis_ops,
+        duration=duration,
+    )
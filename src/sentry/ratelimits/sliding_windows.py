@@ -1,4 +1,6 @@
-from typing import Any, Optional, Sequence, Tuple
+from collections import defaultdict
+from time import time
+from typing import Any, Dict, MutableMapping, Optional, Sequence, Tuple
 
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 from sentry_redis_tools.sliding_windows_rate_limiter import GrantedQuota, Quota
@@ -144,3 +146,129 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         timestamp: Timestamp,
     ) -> None:
         return self.impl.use_quotas(requests, grants, timestamp)
+
+
+class InMemorySlidingWindowRateLimiter(SlidingWindowRateLimiter):
+    """
+    A sliding window rate limiter that keeps its counters in process memory,
+    with the same semantics as `RedisSlidingWindowRateLimiter`: the same
+    granules are summed up, global quotas (`prefix_override`) are shared
+    across requests in the same way, and counters expire `window_seconds`
+    after they were last incremented.
+
+    Expiry is measured in request timestamps rather than wall-clock time,
+    which is the same thing as long as timestamps track the current time.
+
+    This is meant for tests and for simulating the rate limiter offline.
+    `redis_ops` counts the commands the Redis implementation would have
+    issued for the same calls.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        # key -> (value, expires at)
+        self.counters: Dict[Tuple[str, int, int, int], Tuple[int, int]] = {}
+        self.redis_ops = 0
+        self.__last_purge = 0
+        super().__init__(**options)
+
+    def _build_key(
+        self, request: RequestedQuota, quota: Quota, granule: int
+    ) -> Tuple[str, int, int, int]:
+        prefix = quota.prefix_override or request.prefix
+        if "{" in prefix or "}" in prefix:
+            raise ValueError("Explicit sharding not allowed in RequestedQuota.prefix")
+        return (prefix, quota.window_seconds, quota.granularity_seconds, granule)
+
+    def _get(self, key: Tuple[str, int, int, int], timestamp: Timestamp) -> int:
+        value, expires_at = self.counters.get(key, (0, 0))
+        return value if expires_at > timestamp else 0
+
+    def _purge(self, timestamp: Timestamp) -> None:
+        self.counters = {
+            key: (value, expires_at)
+            for key, (value, expires_at) in self.counters.items()
+            if expires_at > timestamp
+        }
+        self.__last_purge = timestamp
+
+    def check_within_quotas(
+        self, requests: Sequence[RequestedQuota], timestamp: Optional[Timestamp] = None
+    ) -> Tuple[Timestamp, Sequence[GrantedQuota]]:
+        if timestamp is None:
+            timestamp = int(time())
+        else:
+            timestamp = int(timestamp)
+
+        keys_to_fetch = set()
+        for request in requests:
+            assert request.quotas
+            for quota in request.quotas:
+                for granule in quota.iter_window(timestamp):
+                    keys_to_fetch.add(self._build_key(request, quota, granule))
+        self.redis_ops += len(keys_to_fetch)
+
+        results = []
+        # see RedisSlidingWindowRateLimiter: global quotas are only handed
+        # out once per call, even if multiple requests fit into them
+        quota_used_cache: MutableMapping[int, int] = defaultdict(int)
+
+        for request in requests:
+            granted_quota = request.requested
+            reached_quotas = []
+
+            for quota in request.quotas:
+                used_quota = (
+                    sum(
+                        self._get(self._build_key(request, quota, granule), timestamp)
+                        for granule in quota.iter_window(timestamp)
+                    )
+                    + quota_used_cache[id(quota)]
+                )
+                remaining_quota = max(0, quota.limit - used_quota)
+                if remaining_quota < granted_quota:
+                    granted_quota = remaining_quota
+                    reached_quotas.append(quota)
+
+            for quota in request.quotas:
+                if quota.prefix_override:
+                    quota_used_cache[id(quota)] += granted_quota
+
+            results.append(
+                GrantedQuota(
+                    prefix=request.prefix,
+                    granted=granted_quota,
+                    reached_quotas=reached_quotas,
+                )
+            )
+
+        return timestamp, results
+
+    def use_quotas(
+        self,
+        requests: Sequence[RequestedQuota],
+        grants: Sequence[GrantedQuota],
+        timestamp: Timestamp,
+    ) -> None:
+        assert len(requests) == len(grants)
+
+        keys_to_incr: Dict[Tuple[str, int, int, int], int] = {}
+        keys_ttl: Dict[Tuple[str, int, int, int], int] = {}
+        for request, grant in zip(requests, grants):
+            assert request.prefix == grant.prefix
+            for quota in request.quotas:
+                # only incr the most recent granule
+                granule = next(quota.iter_window(timestamp))
+                key = self._build_key(request, quota, granule)
+                keys_to_incr[key] = keys_to_incr.get(key, 0) + grant.granted
+                keys_ttl[key] = quota.window_seconds
+
+        for key, amount in keys_to_incr.items():
+            self.counters[key] = (
+                self._get(key, timestamp) + amount,
+                timestamp + keys_ttl[key],
+            )
+        # INCRBY and EXPIRE per key
+        self.redis_ops += 2 * len(keys_to_incr)
+
+        if timestamp - self.__last_purge > max(keys_ttl.values(), default=0):
+            self._purge(timestamp)
@@ -38,7 +38,7 @@ from sentry.ingest.transaction_clusterer.rules import (
     get_sorted_rules,
 )
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
-from sentry.models import Project, ProjectKey
+from sentry.models import Project, ProjectKey, ProjectOption
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
@@ -312,13 +312,84 @@ def _should_extract_abnormal_mechanism(project: Project) -> bool:
     )
 
 
+def get_project_configs(
+    project_keys: Sequence[ProjectKey], full_config: bool = True
+) -> Dict[str, "ProjectConfig"]:
+    """Constructs the ProjectConfig information of many project keys at once.
+    :param project_keys: The keys to load configuration for. Ensure that
+        project and organization are bound on these objects; otherwise they
+        will be loaded from the database one at a time.
+    :param full_config: True if only the full config is required, False
+        if only the restricted (for external relays) is required
+        (default True, i.e. full configuration)
+    :return: a mapping of public key to a ProjectConfig object that is
+        equivalent to `get_project_config(key.project, project_keys=[key])`
+
+    The options of all projects are loaded in bulk, and the parts of the
+    config that do not depend on the key are only computed once per project.
+    """
+    projects = {key.project_id: key.project for key in project_keys}
+    with metrics.timer("relay.config.get_project_configs.duration"):
+        ProjectOption.objects.prefetch_all_values(projects)
+
+        project_configs: Dict[int, Optional[MutableMapping[str, Any]]] = {}
+        configs = {}
+        for key in project_keys:
+            project = projects[key.project_id]
+            with sentry_sdk.push_scope() as scope:
+                scope.set_tag("project", project.id)
+                if project.id not in project_configs:
+                    project_configs[project.id] = _get_project_config_for_all_keys(
+                        project, full_config=full_config
+                    )
+                configs[key.public_key] = _get_project_config_for_keys(
+                    project, project_configs[project.id], full_config, project_keys=[key]
+                )
+
+    metrics.incr("relay.config.get_project_configs.projects", amount=len(projects))
+    return configs
+
+
 def _get_project_config(
     project: Project, full_config: bool = True, project_keys: Optional[Sequence[ProjectKey]] = None
 ) -> "ProjectConfig":
-    if project.status != ObjectStatus.ACTIVE:
+    cfg = _get_project_config_for_all_keys(project, full_config=full_config)
+    return _get_project_config_for_keys(project, cfg, full_config, project_keys=project_keys)
+
+
+def _get_project_config_for_keys(
+    project: Project,
+    cfg: Optional[Mapping[str, Any]],
+    full_config: bool,
+    project_keys: Optional[Sequence[ProjectKey]] = None,
+) -> "ProjectConfig":
+    """Completes a config from `_get_project_config_for_all_keys` with the
+    parts that depend on the project keys. `cfg` itself is not modified, so
+    that it can be shared between the keys of a project."""
+    if cfg is None:
         return ProjectConfig(project, disabled=True)
 
-    public_keys = get_public_key_configs(project, full_config, project_keys=project_keys)
+    key_cfg: Dict[str, Any] = {
+        **cfg,
+        "publicKeys": get_public_key_configs(project, full_config, project_keys=project_keys),
+    }
+
+    if full_config:
+        config = key_cfg["config"] = dict(cfg["config"])
+        with Hub.current.start_span(op="get_all_quotas"):
+            if quotas_config := get_quotas(project, keys=project_keys):
+                config["quotas"] = quotas_config
+
+    return ProjectConfig(project, **key_cfg)
+
+
+def _get_project_config_for_all_keys(
+    project: Project, full_config: bool = True
+) -> Optional[MutableMapping[str, Any]]:
+    """Computes the parts of the config that are the same for every key of
+    the project, or None if the project is disabled."""
+    if project.status != ObjectStatus.ACTIVE:
+        return None
 
     with Hub.current.start_span(op="get_public_config"):
         now = datetime.utcnow().replace(tzinfo=utc)
@@ -328,7 +399,8 @@ def _get_project_config(
             "lastFetch": now,
             "lastChange": project.get_option("sentry:relay-rev-lastchange", now),
             "rev": project.get_option("sentry:relay-rev", uuid.uuid4().hex),
-            "publicKeys": public_keys,
+            # filled in per key by _get_project_config_for_keys
+            "publicKeys": [],
             "config": {
                 "allowedDomains": list(get_origins(project)),
                 "trustedRelays": [
@@ -369,7 +441,7 @@ def _get_project_config(
 
     if not full_config:
         # This is all we need for external Relay processors
-        return ProjectConfig(project, **cfg)
+        return cfg
 
     config["breakdownsV2"] = project.get_option("sentry:breakdowns")
 
@@ -413,11 +485,8 @@ def _get_project_config(
         event_retention = quotas.backend.get_event_retention(project.organization)
         if event_retention is not None:
             config["eventRetention"] = event_retention
-    with Hub.current.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
-            config["quotas"] = quotas_config
 
-    return ProjectConfig(project, **cfg)
+    return cfg
 
 
 class _ConfigBase:
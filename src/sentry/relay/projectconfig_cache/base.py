@@ -2,7 +2,7 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "update_many", "delete_many", "get")
 
     def __init__(self, **options):
         pass
@@ -10,6 +10,12 @@ class ProjectConfigCache(Service):
     def set_many(self, configs):
         pass
 
+    def update_many(self, configs):
+        """Like :meth:`set_many`, but backends may skip writing configs that
+        did not change. Returns the public keys that were written."""
+        self.set_many(configs)
+        return set(configs)
+
     def delete_many(self, public_keys):
         pass
 
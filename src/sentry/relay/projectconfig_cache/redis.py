@@ -4,11 +4,16 @@ import zstandard
 
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
+from sentry.utils.hashlib import md5_text
 from sentry.utils.redis import validate_dynamic_cluster
 
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
 COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
+#: Fields that differ on every computation of a config without the config
+#: actually changing. They are not hashed.
+VOLATILE_FIELDS = frozenset(["lastFetch", "lastChange", "rev"])
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,27 +33,102 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_redis_hashes_key(self, public_key):
+        return f"relayconfig-hashes:{public_key}"
+
     def set_many(self, configs):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
         for public_key, config in configs.items():
-            serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
-            metrics.timing("relay.projectconfig_cache.uncompressed_size", len(serialized))
-            metrics.timing("relay.projectconfig_cache.size", len(compressed))
-
-            p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+            self.__set(p, public_key, config)
 
         p.execute()
 
+    def __set(self, pipeline, public_key, config, section_hashes=None):
+        serialized = json.dumps(config).encode()
+        compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+        metrics.timing("relay.projectconfig_cache.uncompressed_size", len(serialized))
+        metrics.timing("relay.projectconfig_cache.size", len(compressed))
+
+        if section_hashes is None:
+            section_hashes = get_section_hashes(config)
+
+        pipeline.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+        pipeline.setex(
+            self.__get_redis_hashes_key(public_key),
+            REDIS_CACHE_TIMEOUT,
+            json.dumps(section_hashes),
+        )
+
+    def update_many(self, configs):
+        """Writes the configs whose content changed since they were last
+        written, and only refreshes the TTL of the others.
+
+        Every section of a config is hashed individually, so the metrics show
+        which sections cause invalidations to write.
+        """
+        section_hashes = {
+            public_key: get_section_hashes(config) for public_key, config in configs.items()
+        }
+
+        with self.cluster.pipeline() as p:
+            for public_key in configs:
+                p.get(self.__get_redis_hashes_key(public_key))
+            stored_hashes = dict(zip(configs, p.execute()))
+
+        changed = {}
+        unchanged = []
+        for public_key, hashes in section_hashes.items():
+            stored = stored_hashes[public_key]
+            previous = json.loads(stored) if stored is not None else None
+            if previous == hashes:
+                unchanged.append(public_key)
+                continue
+
+            changed[public_key] = configs[public_key]
+            if previous is not None:
+                for section in hashes.keys() | previous.keys():
+                    if hashes.get(section) != previous.get(section):
+                        metrics.incr(
+                            "relay.projectconfig_cache.section_changed", tags={"section": section}
+                        )
+
+        if unchanged:
+            with self.cluster.pipeline() as p:
+                for public_key in unchanged:
+                    p.expire(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+                    p.expire(self.__get_redis_hashes_key(public_key), REDIS_CACHE_TIMEOUT)
+                refreshed = p.execute()[::2]
+
+            # The config itself might have been evicted or deleted in the meantime.
+            for public_key, exists in zip(unchanged, refreshed):
+                if not exists:
+                    changed[public_key] = configs[public_key]
+
+        metrics.incr(
+            "relay.projectconfig_cache.write",
+            amount=len(configs) - len(changed),
+            tags={"action": "unchanged"},
+        )
+        metrics.incr("relay.projectconfig_cache.write", amount=len(changed), tags={"action": "set"})
+
+        if changed:
+            with self.cluster.pipeline() as p:
+                for public_key, config in changed.items():
+                    self.__set(p, public_key, config, section_hashes[public_key])
+                p.execute()
+
+        return set(changed)
+
     def delete_many(self, public_keys):
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
-            return_values = p.execute()
+                p.delete(self.__get_redis_hashes_key(public_key))
+            return_values = p.execute()[::2]
 
         metrics.incr(
             "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
@@ -64,3 +144,25 @@ class RedisProjectConfigCache(ProjectConfigCache):
                 pass
             return json.loads(rv)
         return None
+
+
+def get_section_hashes(config):
+    """Hashes every section of a project config individually.
+
+    Sections are the top-level fields and the fields of ``config``, e.g.
+    ``config.filterSettings``. Volatile fields are skipped, so computing the
+    same config twice results in the same hashes.
+    """
+    if not isinstance(config, dict):
+        return {"": md5_text(json.dumps(config)).hexdigest()}
+
+    hashes = {}
+    for field, value in config.items():
+        if field in VOLATILE_FIELDS:
+            continue
+        if field == "config" and isinstance(value, dict):
+            for section, section_value in value.items():
+                hashes[f"config.{section}"] = md5_text(json.dumps(section_value)).hexdigest()
+        else:
+            hashes[field] = md5_text(json.dumps(value)).hexdigest()
+    return hashes
@@ -21,6 +21,7 @@ from sentry.release_health.release_monitor.base import BaseReleaseMonitorBackend
 from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.strings import SESSION_METRIC_NAMES
+from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.sentry_metrics.utils import resolve_tag_key
 from sentry.snuba.dataset import Dataset, EntityKey
 from sentry.snuba.metrics.naming_layer.mri import SessionMRI
@@ -164,13 +165,14 @@ class MetricReleaseMonitorBackend(BaseReleaseMonitorBackend):
                     if more_results:
                         data = data[:-1]
 
+                    strings = indexer.bulk_reverse_resolve(
+                        UseCaseID.SESSIONS,
+                        org_id,
+                        {row[key] for row in data for key in (env_key, release_key)},
+                    )
                     for row in data:
-                        env_name = indexer.reverse_resolve(
-                            UseCaseKey.RELEASE_HEALTH, org_id, row[env_key]
-                        )
-                        release_name = indexer.reverse_resolve(
-                            UseCaseKey.RELEASE_HEALTH, org_id, row[release_key]
-                        )
+                        env_name = strings.get(row[env_key])
+                        release_name = strings.get(row[release_key])
                         row_totals = totals[row["project_id"]].setdefault(
                             env_name, {"total_sessions": 0, "releases": defaultdict(int)}  # type: ignore
                         )
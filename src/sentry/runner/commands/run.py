@@ -603,6 +603,15 @@ def occurrences_ingest_consumer(**options):
 @click.option("max_msg_batch_time", "--max-msg-batch-time-ms", type=int, default=10000)
 @click.option("max_parallel_batch_size", "--max-parallel-batch-size", type=int, default=50)
 @click.option("max_parallel_batch_time", "--max-parallel-batch-time-ms", type=int, default=10000)
+@click.option(
+    "--adaptive-batching/--no-adaptive-batching",
+    default=False,
+    help="Tune batch size and batches in flight from consumer lag and indexer latency.",
+)
+@click.option("min_msg_batch_size", "--min-msg-batch-size", type=int, default=10)
+@click.option("--max-in-flight-batches", type=int, default=None)
+@click.option("adaptive_target_latency", "--adaptive-target-latency-ms", type=int, default=1000)
+@click.option("adaptive_target_lag", "--adaptive-target-lag-ms", type=int, default=5000)
 def metrics_parallel_consumer(**options):
     from sentry.sentry_metrics.consumers.indexer.parallel import get_parallel_metrics_consumer
 
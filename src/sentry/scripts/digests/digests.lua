@@ -266,7 +266,7 @@ local function add_record_to_timeline(configuration, timeline_id, record_id, val
     return ready
 end
 
-local function digest_timeline(configuration, timeline_id, timeline_capacity)
+local function prepare_digest(configuration, timeline_id, timeline_capacity)
     -- Check to ensure that the timeline is in the correct state.
     if redis.call('ZSCORE', configuration:get_schedule_ready_key(), timeline_id) == false then
         error('err(invalid_state): timeline is not in the ready state, cannot be digested')
@@ -294,8 +294,14 @@ local function digest_timeline(configuration, timeline_id, timeline_capacity)
         redis.call('EXPIRE', digest_key, configuration.ttl)
     end
 
+    return redis.call('ZCARD', digest_key)
+end
+
+local function read_digest(configuration, timeline_id, start, stop)
+    local digest_key = configuration:get_timeline_digest_key(timeline_id)
+
     local results = {}
-    local records = redis.call('ZREVRANGE', digest_key, 0, -1, 'WITHSCORES')
+    local records = redis.call('ZREVRANGE', digest_key, start, stop, 'WITHSCORES')
     local i = 0
     for key, score in zrange_scored_iterator(records) do
         i = i + 1
@@ -309,6 +315,11 @@ local function digest_timeline(configuration, timeline_id, timeline_capacity)
     return results
 end
 
+local function digest_timeline(configuration, timeline_id, timeline_capacity)
+    prepare_digest(configuration, timeline_id, timeline_capacity)
+    return read_digest(configuration, timeline_id, 0, -1)
+end
+
 local function close_digest(configuration, timeline_id, delay_minimum, record_ids)
     local timeline_key = configuration:get_timeline_key(timeline_id)
     local digest_key = configuration:get_timeline_digest_key(timeline_id)
@@ -439,6 +450,23 @@ local commands = {
         )(cursor, arguments)
         return digest_timeline(configuration, timeline_id, timeline_capacity)
     end,
+    DIGEST_PREPARE = function (cursor, arguments)
+        local cursor, configuration, timeline_id, timeline_capacity = multiple_argument_parser(
+            configuration_argument_parser,
+            argument_parser(),
+            argument_parser(tonumber)
+        )(cursor, arguments)
+        return prepare_digest(configuration, timeline_id, timeline_capacity)
+    end,
+    DIGEST_READ = function (cursor, arguments)
+        local cursor, configuration, timeline_id, start, stop = multiple_argument_parser(
+            configuration_argument_parser,
+            argument_parser(),
+            argument_parser(tonumber),
+            argument_parser(tonumber)
+        )(cursor, arguments)
+        return read_digest(configuration, timeline_id, start, stop)
+    end,
     DIGEST_CLOSE = function (cursor, arguments)
         local cursor, configuration, timeline_id, delay_minimum, record_ids = multiple_argument_parser(
             configuration_argument_parser,
@@ -17,9 +17,14 @@
 -- quotas are unaffected. The result is a Lua table/array (Redis multi bulk
 -- reply) that specifies whether or not the item was *rejected* based on the
 -- provided limit.
-assert(#KEYS == #ARGV, "incorrect number of keys and arguments provided")
+--
+-- An optional trailing ``ARGV`` value specifies the quantity that is checked
+-- and consumed, which defaults to ``1``.
+assert(#KEYS == #ARGV or #KEYS + 1 == #ARGV, "incorrect number of keys and arguments provided")
 assert(#KEYS % 2 == 0, "there must be an even number of keys")
 
+local quantity = tonumber(ARGV[#KEYS + 1] or 1)
+
 local results = {}
 local failed = false
 for i=1, #KEYS, 2 do
@@ -27,7 +32,7 @@ for i=1, #KEYS, 2 do
     local rejected = false
     -- limit=-1 means "no limit"
     if limit >= 0 then
-        rejected = (redis.call('GET', KEYS[i]) or 0) - (redis.call('GET', KEYS[i + 1]) or 0) + 1 > limit
+        rejected = (redis.call('GET', KEYS[i]) or 0) - (redis.call('GET', KEYS[i + 1]) or 0) + quantity > limit
     end
 
     if rejected then
@@ -38,7 +43,7 @@ end
 
 if not failed then
     for i=1, #KEYS, 2 do
-        redis.call('INCR', KEYS[i])
+        redis.call('INCRBY', KEYS[i], quantity)
         redis.call('EXPIREAT', KEYS[i], ARGV[i + 1])
     end
 end
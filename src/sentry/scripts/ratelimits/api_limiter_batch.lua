@@ -0,0 +1,39 @@
+-- Batched variant of api_limiter.lua: starts any number of requests against the same
+-- concurrent rate limit key in a single script execution.
+--
+-- Only one key is touched so the script is safe to run on a redis cluster. Batches spanning
+-- multiple keys run this script once per key.
+--
+-- Input:
+-- keys:
+--  redis_key,
+-- args:
+--  concurrent_limit, current_time, max_tll_seconds, request_uid...
+--
+-- Output:
+-- cleaned_up_requests, followed by a (current_executions, request_allowed?) pair per request uid
+-- in the order they were passed
+local key = KEYS[1]
+
+local concurrent_limit = tonumber(ARGV[1])
+local cur_time = tonumber(ARGV[2])
+local max_tll_seconds = tonumber(ARGV[3])
+
+local current_executions_pre_cleanup = redis.call("zcard", key)
+redis.call("zremrangebyscore", key, "-inf", cur_time - max_tll_seconds)
+local current_executions = redis.call("zcard", key)
+
+local results = { current_executions_pre_cleanup - current_executions }
+
+for i = 4, #ARGV do
+  local allowed = 0
+  if current_executions < concurrent_limit then
+    allowed = 1
+    -- zadd returns 0 if the uid is already executing, in which case it is not counted twice
+    current_executions = current_executions + redis.call("zadd", key, cur_time, ARGV[i])
+  end
+  table.insert(results, current_executions)
+  table.insert(results, allowed)
+end
+
+return results
@@ -31,7 +31,7 @@ from sentry.sentry_metrics.consumers.indexer.parsed_message import ParsedMessage
 from sentry.sentry_metrics.consumers.indexer.routing_producer import RoutingPayload
 from sentry.sentry_metrics.indexer.base import Metadata
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
-from sentry.utils import json, metrics
+from sentry.utils import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,12 @@ MRI_RE_PATTERN = re.compile("^([c|s|d|g|e]):([a-zA-Z0-9_]+)/.*$")
 
 OrgId = int
 
+# Reusable codec instances. Payloads are decoded straight from the raw kafka
+# bytes, without an intermediate ``str`` copy or a tracing span per message,
+# and re-encoded with the same options ``rapidjson.dumps`` would use.
+_decode_payload = rapidjson.Decoder()
+_encode_payload = rapidjson.Encoder()
+
 
 class PartitionIdxOffset(NamedTuple):
     partition_idx: int
@@ -81,9 +87,10 @@ def extract_use_case_id(mri: str) -> UseCaseID:
     Returns the use case ID given the MRI, returns None if MRI is invalid.
     """
     if matched := MRI_RE_PATTERN.match(mri):
-        use_case_str = matched.group(2)
-        if use_case_str in {id.value for id in UseCaseID}:
-            return UseCaseID(use_case_str)
+        try:
+            return UseCaseID(matched.group(2))
+        except ValueError:
+            pass
     raise ValidationError(f"Invalid mri: {mri}")
 
 
@@ -116,10 +123,8 @@ class IndexerBatch:
             partition_offset = PartitionIdxOffset(msg.value.partition.index, msg.value.offset)
 
             try:
-                parsed_payload: ParsedMessage = json.loads(
-                    msg.payload.value.decode("utf-8"), use_rapid_json=True
-                )
-            except rapidjson.JSONDecodeError:
+                parsed_payload: ParsedMessage = _decode_payload(msg.payload.value)
+            except (rapidjson.JSONDecodeError, UnicodeDecodeError):
                 self.skipped_offsets.add(partition_offset)
                 logger.error(
                     "process_messages.invalid_json",
@@ -446,7 +451,7 @@ class IndexerBatch:
 
             kafka_payload = KafkaPayload(
                 key=message.payload.key,
-                value=rapidjson.dumps(new_payload_value).encode(),
+                value=_encode_payload(new_payload_value).encode(),
                 headers=[
                     *message.payload.headers,
                     ("mapping_sources", mapping_header_content),
@@ -1,13 +1,14 @@
 import logging
 import time
-from typing import Any, List, MutableMapping, MutableSequence, Optional, Union
+from collections import deque
+from typing import Any, Deque, List, MutableMapping, MutableSequence, Optional, Union
 
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.backends.kafka.configuration import build_kafka_consumer_configuration
 from arroyo.processing.strategies import MessageRejected
 from arroyo.processing.strategies import ProcessingStrategy
 from arroyo.processing.strategies import ProcessingStrategy as ProcessingStep
-from arroyo.types import Message, Value
+from arroyo.types import BrokerValue, Message, Value
 
 from sentry.sentry_metrics.consumers.indexer.routing_producer import RoutingPayload
 from sentry.utils import kafka_config, metrics
@@ -38,6 +39,124 @@ def get_config(
     return consumer_config
 
 
+class AdaptiveBatchController:
+    """
+    Tunes the size of the batches built by `BatchMessages` and the number of
+    batches allowed in flight in the parallel transform step.
+
+    Two signals are observed:
+
+    - consumer lag, as the age of the newest message in each batch when it is
+      flushed.
+    - processing latency, as the time it takes a batch to travel from
+      `BatchMessages` to the `Unbatcher`. This is dominated by the Postgres
+      and cache roundtrips of the indexer.
+
+    Every `adjust_interval` seconds the controller compares the worst lag and
+    the average latency against their targets. Lag means that we need more
+    throughput, so batches grow to amortize the indexer roundtrips. Slow
+    batches without lag mean batching adds latency, so batches shrink.
+    Batches also shrink slowly whenever both signals are healthy, to keep
+    latency low off-peak. The number of batches in flight is raised while
+    lagging with healthy latency and lowered when latency degrades.
+
+    All decisions stay within the configured bounds and are reported as
+    gauges.
+    """
+
+    def __init__(
+        self,
+        min_batch_size: int,
+        max_batch_size: int,
+        min_in_flight: int,
+        max_in_flight: int,
+        target_latency: float,
+        target_lag: float,
+        adjust_interval: float = 10.0,
+    ) -> None:
+        assert 0 < min_batch_size <= max_batch_size
+        assert 0 < min_in_flight <= max_in_flight
+
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.min_in_flight = min_in_flight
+        self.max_in_flight = max_in_flight
+        self.target_latency = target_latency
+        self.target_lag = target_lag
+        self.adjust_interval = adjust_interval
+
+        self.batch_size = max_batch_size
+        self.in_flight_limit = max_in_flight
+
+        self.__in_flight: Deque[float] = deque()
+        self.__next_adjustment = time.time() + adjust_interval
+        self.__reset_observations()
+
+    def __reset_observations(self) -> None:
+        self.__max_lag = 0.0
+        self.__latency_sum = 0.0
+        self.__latency_count = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.__in_flight)
+
+    def has_capacity(self) -> bool:
+        return self.in_flight < self.in_flight_limit
+
+    def batch_submitted(self, messages: MessageBatch) -> None:
+        now = time.time()
+        self.__in_flight.append(now)
+
+        last = messages[-1].value
+        if isinstance(last, BrokerValue):
+            self.__max_lag = max(self.__max_lag, now - last.timestamp.timestamp())
+
+    def batch_finished(self) -> None:
+        if not self.__in_flight:
+            return
+        self.__latency_sum += time.time() - self.__in_flight.popleft()
+        self.__latency_count += 1
+
+    def reset_in_flight(self) -> None:
+        """
+        Forget about batches in flight, to be called when the processing
+        strategy is recreated and any pending batches were dropped.
+        """
+        self.__in_flight.clear()
+
+    def maybe_adjust(self, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.time()
+        if now < self.__next_adjustment:
+            return
+        self.__next_adjustment = now + self.adjust_interval
+
+        latency = self.__latency_sum / self.__latency_count if self.__latency_count else 0.0
+        lagging = self.__max_lag > self.target_lag
+        slow = latency > self.target_latency
+
+        batch_size = self.batch_size
+        in_flight_limit = self.in_flight_limit
+        if lagging:
+            batch_size *= 2
+            in_flight_limit += -1 if slow else 1
+        elif slow:
+            batch_size //= 2
+        else:
+            batch_size = batch_size * 3 // 4
+
+        self.batch_size = min(max(batch_size, self.min_batch_size), self.max_batch_size)
+        self.in_flight_limit = min(max(in_flight_limit, self.min_in_flight), self.max_in_flight)
+
+        metrics.gauge("metrics_consumer.adaptive.lag", self.__max_lag)
+        metrics.gauge("metrics_consumer.adaptive.latency", latency)
+        metrics.gauge("metrics_consumer.adaptive.batch_size", self.batch_size)
+        metrics.gauge("metrics_consumer.adaptive.in_flight_limit", self.in_flight_limit)
+        metrics.gauge("metrics_consumer.adaptive.in_flight", self.in_flight)
+        self.__reset_observations()
+
+
 class MetricsBatchBuilder:
     """
     Batches up individual messages - type: Message[KafkaPayload] - into a
@@ -81,6 +200,10 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
     Flushing the batch here means wrapping the batch in a Message, the batch
     itself being the payload. This is what the ParallelTransformStep will
     process in the process_message function.
+
+    If an `AdaptiveBatchController` is passed, it decides the batch size
+    (bounded by `max_batch_size`) and how many batches may be in flight
+    before backpressure is applied.
     """
 
     def __init__(
@@ -88,9 +211,11 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
         next_step: ProcessingStrategy[MessageBatch],
         max_batch_time: float,
         max_batch_size: int,
+        controller: Optional[AdaptiveBatchController] = None,
     ):
         self.__max_batch_size = max_batch_size
         self.__max_batch_time = max_batch_time
+        self.__controller = controller
 
         self.__next_step = next_step
         self.__batch: Optional[MetricsBatchBuilder] = None
@@ -105,6 +230,9 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
 
         self.__next_step.poll()
 
+        if self.__controller is not None:
+            self.__controller.maybe_adjust()
+
         if self.__batch and self.__batch.ready():
             self.__flush()
 
@@ -113,8 +241,15 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
             raise MessageRejected
 
         if self.__batch is None:
+            max_batch_size = self.__max_batch_size
+            if self.__controller is not None:
+                if not self.__controller.has_capacity():
+                    metrics.incr("batch_messages.in_flight_limit_reached")
+                    raise MessageRejected
+                max_batch_size = min(max_batch_size, self.__controller.batch_size)
+
             self.__batch_start = time.time()
-            self.__batch = MetricsBatchBuilder(self.__max_batch_size, self.__max_batch_time)
+            self.__batch = MetricsBatchBuilder(max_batch_size, self.__max_batch_time)
 
         self.__batch.append(message)
 
@@ -133,6 +268,8 @@ class BatchMessages(ProcessingStep[KafkaPayload]):
 
         try:
             self.__next_step.submit(new_message)
+            if self.__controller is not None:
+                self.__controller.batch_submitted(self.__batch.messages)
             if self.__apply_backpressure is True:
                 self.__apply_backpressure = False
             self.__batch_start = None
@@ -17,6 +17,7 @@ from sentry.sentry_metrics.configuration import (
     initialize_subprocess_state,
 )
 from sentry.sentry_metrics.consumers.indexer.common import (
+    AdaptiveBatchController,
     BatchMessages,
     IndexerOutputMessageBatch,
     get_config,
@@ -37,8 +38,10 @@ class Unbatcher(ProcessingStep[Union[FilteredPayload, IndexerOutputMessageBatch]
     def __init__(
         self,
         next_step: ProcessingStep[Union[KafkaPayload, RoutingPayload]],
+        controller: Optional[AdaptiveBatchController] = None,
     ) -> None:
         self.__next_step = next_step
+        self.__controller = controller
         self.__closed = False
 
     def poll(self) -> None:
@@ -51,6 +54,11 @@ class Unbatcher(ProcessingStep[Union[FilteredPayload, IndexerOutputMessageBatch]
         for transformed_message in cast(IndexerOutputMessageBatch, message.payload):
             self.__next_step.submit(transformed_message)
 
+        # Only once the whole batch was submitted, a `MessageRejected` above
+        # makes arroyo submit the same batch again.
+        if self.__controller is not None:
+            self.__controller.batch_finished()
+
     def close(self) -> None:
         self.__closed = True
 
@@ -83,6 +91,10 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
       together. The load tests show it is still useful.
     - messages are exploded back into individual ones after the parallel
       transform step.
+
+    With `adaptive_batching`, `max_msg_batch_size` becomes an upper bound and
+    an `AdaptiveBatchController` tunes the actual batch size and the number
+    of batches in flight from the observed consumer lag and indexer latency.
     """
 
     def __init__(
@@ -96,6 +108,11 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         output_block_size: int,
         ingest_profile: str,
         indexer_db: str,
+        adaptive_batching: bool = False,
+        min_msg_batch_size: int = 10,
+        max_in_flight_batches: Optional[int] = None,
+        adaptive_target_latency: float = 1000,
+        adaptive_target_lag: float = 5000,
     ):
         from sentry.sentry_metrics.configuration import (
             IndexerStorage,
@@ -128,6 +145,22 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.__output_block_size = output_block_size
         self.__slicing_router = slicing_router
 
+        self.__controller: Optional[AdaptiveBatchController] = None
+        if adaptive_batching:
+            if max_in_flight_batches is None:
+                max_in_flight_batches = processes * max_parallel_batch_size
+            self.__controller = AdaptiveBatchController(
+                min_batch_size=min(min_msg_batch_size, max_msg_batch_size),
+                max_batch_size=max_msg_batch_size,
+                # fewer batches in flight than a parallel batch would only make
+                # the parallel step wait for `max_parallel_batch_time`
+                min_in_flight=min(max_parallel_batch_size, max_in_flight_batches),
+                max_in_flight=max_in_flight_batches,
+                # These are in milliseconds
+                target_latency=adaptive_target_latency / 1000,
+                target_lag=adaptive_target_lag / 1000,
+            )
+
     def create_with_partitions(
         self,
         commit: Commit,
@@ -138,9 +171,13 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             commit=commit,
             slicing_router=self.__slicing_router,
         )
+        if self.__controller is not None:
+            # batches in flight of a previous assignment have been dropped
+            self.__controller.reset_in_flight()
+
         parallel_strategy = RunTaskWithMultiprocessing(
             function=MessageProcessor(self.config).process_messages,
-            next_step=Unbatcher(next_step=producer),
+            next_step=Unbatcher(next_step=producer, controller=self.__controller),
             num_processes=self.__processes,
             max_batch_size=self.__max_parallel_batch_size,
             # This is in seconds
@@ -158,7 +195,10 @@ class MetricsConsumerStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         )
 
         strategy = BatchMessages(
-            parallel_strategy, self.__max_msg_batch_time, self.__max_msg_batch_size
+            parallel_strategy,
+            self.__max_msg_batch_time,
+            self.__max_msg_batch_size,
+            controller=self.__controller,
         )
 
         return strategy
@@ -196,6 +236,11 @@ def get_parallel_metrics_consumer(
     strict_offset_reset: bool,
     ingest_profile: str,
     indexer_db: str,
+    adaptive_batching: bool = False,
+    min_msg_batch_size: int = 10,
+    max_in_flight_batches: Optional[int] = None,
+    adaptive_target_latency: float = 1000,
+    adaptive_target_lag: float = 5000,
 ) -> StreamProcessor[KafkaPayload]:
     processing_factory = MetricsConsumerStrategyFactory(
         max_msg_batch_size=max_msg_batch_size,
@@ -207,6 +252,11 @@ def get_parallel_metrics_consumer(
         output_block_size=output_block_size,
         ingest_profile=ingest_profile,
         indexer_db=indexer_db,
+        adaptive_batching=adaptive_batching,
+        min_msg_batch_size=min_msg_batch_size,
+        max_in_flight_batches=max_in_flight_batches,
+        adaptive_target_latency=adaptive_target_latency,
+        adaptive_target_lag=adaptive_target_lag,
     )
 
     return StreamProcessor(
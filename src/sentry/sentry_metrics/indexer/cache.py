@@ -1,6 +1,9 @@
 import logging
 import random
-from typing import Collection, Mapping, MutableMapping, Optional, Sequence, Set
+import threading
+import time
+from collections import OrderedDict
+from typing import Collection, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import caches
@@ -24,13 +27,67 @@ logger = logging.getLogger(__name__)
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
+
+class LocalStringIndexerCache:
+    """
+    A per-process LRU cache of indexed strings, holding at most `max_size`
+    entries. Keys are formatted like "use_case_id:org_id:string", and every
+    entry expires after the TTL it was stored with.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Collection[str]) -> MutableMapping[str, int]:
+        now = time.time()
+        results: MutableMapping[str, int] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                results[key] = value
+        return results
+
+    def set_many(self, key_values: Mapping[str, int], ttl: int) -> None:
+        expires_at = time.time() + ttl
+        with self._lock:
+            for key, value in key_values.items():
+                self._entries[key] = (value, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete_many(self, keys: Collection[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 
 class StringIndexerCache:
-    def __init__(self, cache_name: str, partition_key: str):
+    def __init__(self, cache_name: str, partition_key: str, local_cache_size: int = 0):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
+        # An optional in-process tier that is consulted before the remote
+        # cache. Most strings in an indexer batch are the same handful of tag
+        # keys and values, so this saves most of the remote round trips.
+        self.local_cache = (
+            LocalStringIndexerCache(local_cache_size) if local_cache_size > 0 else None
+        )
 
     @property
     def randomized_ttl(self) -> int:
@@ -66,7 +123,18 @@ class StringIndexerCache:
         return formatted
 
     def get(self, key: str) -> int:
+        if self.local_cache is not None:
+            local_result = self.local_cache.get_many([key]).get(key)
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": str(local_result is not None).lower(), "caller": "get"},
+            )
+            if local_result is not None:
+                return local_result
+
         result: int = self.cache.get(self.make_cache_key(key), version=self.version)
+        if self.local_cache is not None and result is not None:
+            self.local_cache.set_many({key: result}, self.randomized_ttl)
         return result
 
     def set(self, key: str, value: int) -> None:
@@ -76,25 +144,56 @@ class StringIndexerCache:
             timeout=self.randomized_ttl,
             version=self.version,
         )
+        if self.local_cache is not None:
+            self.local_cache.set_many({key: value}, self.randomized_ttl)
 
     def get_many(self, keys: Sequence[str]) -> MutableMapping[str, Optional[int]]:
+        local_results: Mapping[str, int] = {}
+        if self.local_cache is not None:
+            local_results = self.local_cache.get_many(keys)
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": "true", "caller": "get_many"},
+                amount=len(local_results),
+            )
+            metrics.incr(
+                _INDEXER_LOCAL_CACHE_METRIC,
+                tags={"cache_hit": "false", "caller": "get_many"},
+                amount=len(keys) - len(local_results),
+            )
+            keys = [key for key in keys if key not in local_results]
+
         cache_keys = {self.make_cache_key(key): key for key in keys}
         results: Mapping[str, Optional[int]] = self.cache.get_many(
             cache_keys.keys(), version=self.version
         )
-        return self._format_results(keys, results)
+        formatted = self._format_results(keys, results)
+
+        if self.local_cache is not None:
+            self.local_cache.set_many(
+                {k: v for k, v in formatted.items() if v is not None}, self.randomized_ttl
+            )
+            formatted.update(local_results)
+
+        return formatted
 
     def set_many(self, key_values: Mapping[str, int]) -> None:
         cache_key_values = {self.make_cache_key(k): v for k, v in key_values.items()}
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.set_many(key_values, self.randomized_ttl)
 
     def delete(self, key: str) -> None:
         cache_key = self.make_cache_key(key)
         self.cache.delete(cache_key, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.delete_many([key])
 
     def delete_many(self, keys: Sequence[str]) -> None:
         cache_keys = [self.make_cache_key(key) for key in keys]
         self.cache.delete_many(cache_keys, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.delete_many(keys)
 
 
 class CachingIndexer(StringIndexer):
@@ -1,5 +1,8 @@
 import random
+import threading
 import time
+from collections import deque
+from typing import Callable, Deque, List, Sequence
 
 _VERSION_BITS = 4
 _TS_BITS = 32
@@ -52,3 +55,33 @@ def get_id() -> int:
     id |= rand
 
     return id
+
+
+class IdLease:
+    """
+    Hands out ids from blocks that are leased in bulk from a sequence, so
+    that storages which assign ids up front do not pay a roundtrip per
+    batch of new records.
+
+    `fetch_block(size)` must return `size` ids that no other lease will ever
+    hand out, for example by advancing a database sequence. Ids that are
+    leased but never written are simply skipped, the same way a sequence
+    skips values of rolled back inserts.
+    """
+
+    def __init__(self, fetch_block: Callable[[int], Sequence[int]], block_size: int) -> None:
+        assert block_size > 0
+        self.__fetch_block = fetch_block
+        self.block_size = block_size
+        self.__ids: Deque[int] = deque()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def take(self, count: int) -> List[int]:
+        with self.__lock:
+            missing = count - len(self.__ids)
+            if missing > 0:
+                self.__ids.extend(self.__fetch_block(max(missing, self.block_size)))
+            return [self.__ids.popleft() for _ in range(count)]
@@ -4,6 +4,7 @@ from typing import Any
 from django.conf import settings
 from django.db import connections, models, router
 from django.utils import timezone
+from psycopg2.extras import execute_values
 
 from sentry.db.models import Model, region_silo_only_model
 from sentry.db.models.fields.bounded import BoundedBigIntegerField
@@ -12,7 +13,7 @@ from sentry.sentry_metrics.configuration import UseCaseKey
 
 logger = logging.getLogger(__name__)
 
-from typing import Mapping, Type
+from typing import Mapping, Sequence, Set, Type
 
 
 @region_silo_only_model
@@ -56,6 +57,51 @@ class BaseIndexer(Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def get_next_values(cls, num: int) -> Sequence[int]:
+        """
+        Advances the id sequence of the table by `num` and returns the ids.
+        """
+        using = router.db_for_write(cls)
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [cls._meta.db_table, num],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def insert_ignoring_conflicts(cls, records: Sequence["BaseIndexer"]) -> Set[int]:
+        """
+        Inserts records that already have their ids assigned in a single
+        multi-row insert and returns the ids of the rows that were written.
+        Records that conflict with an existing row are skipped, like
+        `bulk_create(ignore_conflicts=True)` would.
+        """
+        if not records:
+            return set()
+
+        using = router.db_for_write(cls)
+        connection = connections[using]
+        fields = cls._meta.concrete_fields
+        for record in records:
+            assert record.id is not None, "ids must be assigned before inserting"
+
+        query = "INSERT INTO {} ({}) VALUES %s ON CONFLICT DO NOTHING RETURNING id".format(
+            connection.ops.quote_name(cls._meta.db_table),
+            ", ".join(connection.ops.quote_name(field.column) for field in fields),
+        )
+        values = [
+            tuple(
+                field.get_db_prep_save(getattr(record, field.attname), connection)
+                for field in fields
+            )
+            for record in records
+        ]
+        with connection.cursor() as cursor:
+            rows = execute_values(cursor, query, values, page_size=len(values), fetch=True)
+        return {row[0] for row in rows}
+
 
 @region_silo_only_model
 class StringIndexer(BaseIndexer):
@@ -1,7 +1,8 @@
+from collections import defaultdict
 from functools import reduce
 from operator import or_
 from time import sleep
-from typing import Any, Collection, Dict, Mapping, Optional, Sequence, Set
+from typing import Any, Collection, Dict, Mapping, MutableMapping, Optional, Sequence, Set
 
 import sentry_sdk
 from django.conf import settings
@@ -22,6 +23,7 @@ from sentry.sentry_metrics.indexer.base import (
     metric_path_key_compatible_rev_resolve,
 )
 from sentry.sentry_metrics.indexer.cache import CachingIndexer, StringIndexerCache
+from sentry.sentry_metrics.indexer.id_generator import IdLease
 from sentry.sentry_metrics.indexer.limiters.writes import writes_limiter_factory
 from sentry.sentry_metrics.indexer.postgres.models import TABLE_MAPPING, BaseIndexer, IndexerTable
 from sentry.sentry_metrics.indexer.strings import StaticStringIndexer
@@ -47,6 +49,26 @@ class PGStringIndexerV2(StringIndexer):
     and the corresponding reverse lookup.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._id_leases: MutableMapping[IndexerTable, IdLease] = {}
+
+    def _get_id_lease(self, table: IndexerTable) -> Optional[IdLease]:
+        """
+        Returns the lease of ids for `table` if writes with pre-assigned ids
+        are enabled, so that new records are written in a single insert
+        that reports which of them were actually created.
+        """
+        block_size = options.get("sentry-metrics.indexer.id-leasing.block-size")
+        if not block_size:
+            return None
+
+        lease = self._id_leases.get(table)
+        if lease is None:
+            lease = self._id_leases[table] = IdLease(table.get_next_values, block_size)
+        lease.block_size = block_size
+        return lease
+
     def _get_db_records(self, db_use_case_keys: UseCaseKeyCollection) -> Any:
         """
         The order of operations for our changes needs to be:
@@ -79,26 +101,42 @@ class PGStringIndexerV2(StringIndexer):
 
     def _bulk_create_with_retry(
         self, table: IndexerTable, new_records: Sequence[BaseIndexer]
-    ) -> None:
+    ) -> Optional[Sequence[BaseIndexer]]:
         """
         With multiple instances of the Postgres indexer running, we found that
         rather than direct insert conflicts we were actually observing deadlocks
         on insert. Here we surround bulk_create with a catch for the deadlock error
         specifically so that we don't interrupt processing or raise an error for a
         fairly normal event.
+
+        If ids are leased, the records are inserted with their ids assigned and
+        the ones that were created are returned. Otherwise it is unknown which
+        records were created and `None` is returned.
         """
         retry_count = 0
         sleep_ms = 5
         last_seen_exception: Optional[BaseException] = None
 
-        with metrics.timer("sentry_metrics.indexer.pg_bulk_create"):
+        id_lease = self._get_id_lease(table)
+        if id_lease is not None:
+            for record, id in zip(new_records, id_lease.take(len(new_records))):
+                record.id = id
+
+        with metrics.timer(
+            "sentry_metrics.indexer.pg_bulk_create",
+            tags={"leased_ids": "true" if id_lease is not None else "false"},
+        ):
             # We use `ignore_conflicts=True` here to avoid race conditions where metric indexer
             # records might have be created between when we queried in `bulk_record` and the
             # attempt to create the rows down below.
             while retry_count + 1 < settings.SENTRY_POSTGRES_INDEXER_RETRY_COUNT:
                 try:
+                    if id_lease is not None:
+                        created_ids = table.insert_ignoring_conflicts(new_records)
+                        return [record for record in new_records if record.id in created_ids]
+
                     table.objects.bulk_create(new_records, ignore_conflicts=True)
-                    return
+                    return None
                 except OperationalError as e:
                     sentry_sdk.capture_message(
                         f"retryable deadlock exception encountered; pgcode={e.pgcode}, pgerror={e.pgerror}"
@@ -115,6 +153,50 @@ class PGStringIndexerV2(StringIndexer):
             assert isinstance(last_seen_exception, BaseException)
             raise last_seen_exception
 
+    def _get_written_records(
+        self, keys: UseCaseKeyCollection, created_records: Optional[Sequence[BaseIndexer]]
+    ) -> Sequence[BaseIndexer]:
+        """
+        Returns the records for `keys` after they have been written by
+        `_bulk_create_with_retry`. Only keys that were not created by this
+        process, because a concurrent writer got there first, are read back
+        from the database.
+        """
+        if created_records is None:
+            return list(self._get_db_records(keys))
+
+        is_performance = self._get_metric_path_key(keys.mapping.keys()) is UseCaseKey.PERFORMANCE
+        created_keys = {
+            (
+                record.use_case_id if is_performance else None,  # type: ignore[attr-defined]
+                record.organization_id,
+                record.string,
+            )
+            for record in created_records
+        }
+
+        conflicting_keys: Dict[UseCaseID, Dict[OrgId, Set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        for use_case_id, org_id, string in keys.as_tuples():
+            key = (use_case_id.value if is_performance else None, int(org_id), string)
+            if key not in created_keys:
+                conflicting_keys[use_case_id][org_id].add(string)
+
+        metrics.incr(
+            "sentry_metrics.indexer.pg_bulk_create.conflicts",
+            amount=sum(
+                len(strings) for orgs in conflicting_keys.values() for strings in orgs.values()
+            ),
+        )
+        if not conflicting_keys:
+            return created_records
+
+        return [
+            *created_records,
+            *self._get_db_records(UseCaseKeyCollection(conflicting_keys)),
+        ]
+
     def _uca_bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, Set[str]]]
     ) -> UseCaseKeyResults:
@@ -212,7 +294,7 @@ class PGStringIndexerV2(StringIndexer):
                     for _, organization_id, string in accepted_keys.as_tuples()
                 ]
 
-            self._bulk_create_with_retry(table, new_records)
+            created_records = self._bulk_create_with_retry(table, new_records)
 
         db_write_key_results = UseCaseKeyResults()
         db_write_key_results.add_use_case_key_results(
@@ -227,7 +309,7 @@ class PGStringIndexerV2(StringIndexer):
                     string=db_obj.string,
                     id=db_obj.id,
                 )
-                for db_obj in self._get_db_records(accepted_keys)
+                for db_obj in self._get_written_records(accepted_keys, created_records)
             ],
             fetch_type=FetchType.FIRST_SEEN,
         )
@@ -339,7 +421,7 @@ class PGStringIndexerV2(StringIndexer):
                     for organization_id, string in filtered_db_write_keys.as_tuples()
                 ]
 
-            self._bulk_create_with_retry(
+            created_records = self._bulk_create_with_retry(
                 self._get_table_from_use_case_ids(strings.keys()), new_records
             )
 
@@ -352,8 +434,8 @@ class PGStringIndexerV2(StringIndexer):
                     string=db_obj.string,
                     id=db_obj.id,
                 )
-                for db_obj in self._get_db_records(
-                    UseCaseKeyCollection({use_case_id: filtered_db_write_keys})
+                for db_obj in self._get_written_records(
+                    UseCaseKeyCollection({use_case_id: filtered_db_write_keys}), created_records
                 )
             ],
             fetch_type=FetchType.FIRST_SEEN,
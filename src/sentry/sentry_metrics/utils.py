@@ -1,8 +1,9 @@
-from typing import Optional, Sequence, Union
+from typing import Collection, Dict, Mapping, Optional, Sequence, Union
 
 from sentry.api.utils import InvalidParams
 from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.configuration import UseCaseKey
+from sentry.sentry_metrics.use_case_id_registry import REVERSE_METRIC_PATH_MAPPING
 
 #: Special integer used to represent a string missing from the indexer
 STRING_NOT_FOUND = -1
@@ -37,6 +38,50 @@ def reverse_resolve(use_case_id: UseCaseKey, org_id: int, index: int) -> str:
     return resolved
 
 
+def bulk_reverse_resolve(
+    use_case_id: UseCaseKey, org_id: int, indexes: Collection[int]
+) -> Mapping[int, str]:
+    """
+    Resolve multiple index values back to strings with a single indexer lookup.
+
+    Unlike `reverse_resolve`, indexes missing from the indexer are left out
+    of the result instead of raising.
+    """
+    assert all(index > 0 for index in indexes)
+    if not indexes:
+        return {}
+    return indexer.bulk_reverse_resolve(REVERSE_METRIC_PATH_MAPPING[use_case_id], org_id, indexes)
+
+
+def bulk_reverse_resolve_tag_value(
+    use_case_id: UseCaseKey,
+    org_id: int,
+    indexes: Collection[Union[int, str, None]],
+    weak: bool = False,
+) -> Mapping[Union[int, str, None], Optional[str]]:
+    """
+    A version of `reverse_resolve_tag_value` for multiple values, which
+    returns a mapping from every value to its string.
+    """
+    rv: Dict[Union[int, str, None], Optional[str]] = {}
+    ids = set()
+    for index in indexes:
+        if isinstance(index, str) or index is None:
+            rv[index] = index
+        elif weak and index == TAG_NOT_SET:
+            rv[index] = None
+        else:
+            ids.add(index)
+
+    resolved = bulk_reverse_resolve(use_case_id, org_id, ids)
+    if len(resolved) != len(ids):
+        # The indexer should never miss integers > 0:
+        raise MetricIndexNotFound()
+
+    rv.update(resolved)
+    return rv
+
+
 def reverse_resolve_weak(use_case_id: UseCaseKey, org_id: int, index: int) -> Optional[str]:
     """
     Resolve an index value back to a string, special-casing 0 to return None.
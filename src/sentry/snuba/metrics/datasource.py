@@ -27,9 +27,10 @@ from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.utils import (
     MetricIndexNotFound,
+    bulk_reverse_resolve,
+    bulk_reverse_resolve_tag_value,
     resolve_tag_key,
     reverse_resolve,
-    reverse_resolve_tag_value,
 )
 from sentry.snuba.dataset import Dataset, EntityKey
 from sentry.snuba.metrics.fields import run_metrics_query
@@ -183,16 +184,29 @@ def get_custom_measurements(
 ) -> Sequence[MetricMeta]:
     assert project_ids
 
-    metrics_meta = []
-    for metric_type in CUSTOM_MEASUREMENT_DATASETS:
-        for row in _get_metrics_for_entity(
+    rows_by_type = {
+        metric_type: _get_metrics_for_entity(
             entity_key=METRIC_TYPE_TO_ENTITY[metric_type],
             project_ids=project_ids,
             org_id=organization_id,
             start=start,
             end=end,
-        ):
-            mri = reverse_resolve(use_case_id, organization_id, row["metric_id"])
+        )
+        for metric_type in CUSTOM_MEASUREMENT_DATASETS
+    }
+    mris = bulk_reverse_resolve(
+        use_case_id,
+        organization_id,
+        {row["metric_id"] for rows in rows_by_type.values() for row in rows},
+    )
+
+    metrics_meta = []
+    for metric_type, rows in rows_by_type.items():
+        for row in rows:
+            try:
+                mri = mris[row["metric_id"]]
+            except KeyError:
+                raise MetricIndexNotFound()
             parsed_mri = parse_mri(mri)
             if parsed_mri is not None and is_custom_measurement(parsed_mri):
                 metrics_meta.append(
@@ -399,23 +413,21 @@ def _fetch_tags_or_values_for_mri(
 
     if column.startswith(("tags[", "tags_raw[")):
         tag_id = column.split("[")[1].split("]")[0]
-        tags_or_values = [
-            {
-                "key": reverse_resolve(use_case_id, org_id, int(tag_id)),
-                "value": reverse_resolve_tag_value(use_case_id, org_id, value_id),
-            }
-            for value_id in tag_or_value_ids
-        ]
+        tags_or_values = []
+        if tag_or_value_ids:
+            tag_key = reverse_resolve(use_case_id, org_id, int(tag_id))
+            tag_values = bulk_reverse_resolve_tag_value(use_case_id, org_id, tag_or_value_ids)
+            tags_or_values = [
+                {"key": tag_key, "value": tag_values[value_id]} for value_id in tag_or_value_ids
+            ]
         tags_or_values.sort(key=lambda tag: (tag["key"], tag["value"]))
     else:
-        tags_or_values = []
-        for tag_id in tag_or_value_ids:
-            try:
-                resolved = reverse_resolve(use_case_id, org_id, tag_id)
-                if resolved not in UNALLOWED_TAGS:
-                    tags_or_values.append({"key": resolved})
-            except MetricIndexNotFound:
-                continue
+        # Tag keys unknown to the indexer are skipped.
+        tags_or_values = [
+            {"key": resolved}
+            for resolved in bulk_reverse_resolve(use_case_id, org_id, tag_or_value_ids).values()
+            if resolved not in UNALLOWED_TAGS
+        ]
 
         tags_or_values.sort(key=itemgetter("key"))
 
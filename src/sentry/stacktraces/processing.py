@@ -1,12 +1,18 @@
 import logging
+import threading
 from collections import namedtuple
+from copy import deepcopy
 from datetime import datetime
+from typing import Optional
 
 import sentry_sdk
+from cachetools import TTLCache
 from django.utils import timezone
 
+from sentry import options
 from sentry.models import Project, Release
 from sentry.stacktraces.functions import set_in_app, trim_function_name
+from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
 from sentry.utils.safe import get_path, safe_execute
@@ -21,6 +27,27 @@ StacktraceInfo.__hash__ = lambda x: id(x)
 StacktraceInfo.__eq__ = lambda a, b: a is b
 StacktraceInfo.__ne__ = lambda a, b: a is not b
 
+# In-memory tier of the frame cache in front of the default cache, see `lookup_frame_cache`.
+_local_frame_cache: Optional[TTLCache] = None
+_local_frame_cache_lock = threading.Lock()
+
+
+def get_local_frame_cache() -> Optional[TTLCache]:
+    global _local_frame_cache
+
+    max_size = options.get("processing.frame-cache.local-max-size")
+    ttl = options.get("processing.frame-cache.ttl")
+    with _local_frame_cache_lock:
+        if max_size <= 0:
+            _local_frame_cache = None
+        elif (
+            _local_frame_cache is None
+            or _local_frame_cache.maxsize != max_size
+            or _local_frame_cache.ttl != ttl
+        ):
+            _local_frame_cache = TTLCache(maxsize=max_size, ttl=ttl)
+        return _local_frame_cache
+
 
 class ProcessableFrame:
     def __init__(self, frame, idx, processor, stacktrace_info, processable_frames):
@@ -65,7 +92,13 @@ class ProcessableFrame:
 
     def set_cache_value(self, value):
         if self.cache_key is not None:
-            cache.set(self.cache_key, value, 3600)
+            cache.set(self.cache_key, value, options.get("processing.frame-cache.ttl"))
+            local_cache = get_local_frame_cache()
+            if local_cache is not None:
+                # the caller keeps modifying the frames of the value
+                value = deepcopy(value)
+                with _local_frame_cache_lock:
+                    local_cache[self.cache_key] = value
             return True
         return False
 
@@ -74,7 +107,13 @@ class ProcessableFrame:
             self.cache_key = None
             return
 
-        h = hash_values(values, seed=self.processor.__class__.__name__)
+        try:
+            h = hash_values(values, seed=self.processor.__class__.__name__)
+        except TypeError:
+            # values that cannot be hashed, such as floats in frame variables
+            self.cache_key = None
+            return
+
         self.cache_key = rv = "pf:%s" % h
         return rv
 
@@ -451,9 +490,37 @@ def get_crash_frame_from_event_data(data, frame_filter=None):
 
 
 def lookup_frame_cache(keys):
+    """Looks up processed frames in the in-memory tier of the frame cache
+    first, and in the default cache for the remaining keys.
+    """
     rv = {}
+    local_cache = get_local_frame_cache()
+    missing = []
     for key in keys:
-        rv[key] = cache.get(key)
+        value = None
+        if local_cache is not None:
+            with _local_frame_cache_lock:
+                value = local_cache.get(key)
+        if value is not None:
+            # every event gets its own copy to modify
+            rv[key] = deepcopy(value)
+        else:
+            missing.append(key)
+
+    if missing:
+        values = cache.get_many(missing)
+        for key in missing:
+            value = rv[key] = values.get(key)
+            if value is not None and local_cache is not None:
+                with _local_frame_cache_lock:
+                    local_cache[key] = deepcopy(value)
+
+    if rv:
+        hits = sum(1 for value in rv.values() if value is not None)
+        metrics.incr("stacktraces.frame_cache.lookup", amount=hits, tags={"result": "hit"})
+        metrics.incr(
+            "stacktraces.frame_cache.lookup", amount=len(rv) - hits, tags={"result": "miss"}
+        )
     return rv
 
 
@@ -478,11 +545,16 @@ def get_stacktrace_processing_task(infos, processors):
                 processable_frame
             )
             if processable_frame.cache_key is not None:
-                to_lookup[processable_frame.cache_key] = processable_frame
+                to_lookup.setdefault(processable_frame.cache_key, []).append(processable_frame)
 
     frame_cache = lookup_frame_cache(to_lookup)
-    for cache_key, processable_frame in to_lookup.items():
-        processable_frame.cache_value = frame_cache.get(cache_key)
+    for cache_key, processable_frames in to_lookup.items():
+        for processable_frame in processable_frames:
+            # identical frames of an event each get their own copy
+            cache_value = frame_cache.get(cache_key)
+            if cache_value is not None and len(processable_frames) > 1:
+                cache_value = deepcopy(cache_value)
+            processable_frame.cache_value = cache_value
 
     return StacktraceProcessingTask(
         processable_stacktraces=by_stacktrace_info, processors=by_processor
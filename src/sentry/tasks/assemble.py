@@ -5,7 +5,7 @@ import logging
 import uuid
 from datetime import datetime
 from os import path
-from typing import List, Optional, Set, Tuple
+from typing import List, NamedTuple, Optional, Set, Tuple
 
 from django.db import IntegrityError, router
 from django.db.models import Q
@@ -19,6 +19,7 @@ from sentry.cache import default_cache
 from sentry.models import File, Organization, Release, ReleaseFile
 from sentry.models.artifactbundle import (
     ArtifactBundle,
+    ArtifactBundleIndex,
     DebugIdArtifactBundle,
     ProjectArtifactBundle,
     ReleaseArtifactBundle,
@@ -258,11 +259,23 @@ def _normalize_debug_id(debug_id: Optional[str]) -> Optional[str]:
         return None
 
 
-def _extract_debug_ids_from_manifest(
+class IndexedFile(NamedTuple):
+    file_path: str
+    url: str
+    debug_id: Optional[str]
+    source_file_type: Optional[SourceFileType]
+
+
+def _parse_artifact_bundle_manifest(
     manifest: dict,
-) -> Tuple[Optional[str], Set[Tuple[SourceFileType, str]]]:
+) -> Tuple[Optional[str], Set[Tuple[SourceFileType, str]], List[IndexedFile]]:
+    """
+    Walks the files of the manifest once and returns the bundle id, the debug ids of the bundle with their file types
+    and the files to index by url.
+    """
     # We use a set, since we might have the same debug_id and file_type.
     debug_ids_with_types = set()
+    indexed_files = []
 
     # We also want to extract the bundle_id which is also known as the bundle debug_id. This id is used to uniquely
     # identify a specific ArtifactBundle in case for example of future deletion.
@@ -275,9 +288,11 @@ def _extract_debug_ids_from_manifest(
 
     files = manifest.get("files", {})
     for file_path, info in files.items():
+        debug_id = None
+        source_file_type = None
         headers = _normalize_headers(info.get("headers", {}))
-        if (debug_id := headers.get("debug-id")) is not None:
-            debug_id = _normalize_debug_id(debug_id)
+        if (raw_debug_id := headers.get("debug-id")) is not None:
+            debug_id = _normalize_debug_id(raw_debug_id)
             file_type = info.get("type")
             if (
                 debug_id is not None
@@ -285,8 +300,14 @@ def _extract_debug_ids_from_manifest(
                 and (source_file_type := SourceFileType.from_lowercase_key(file_type)) is not None
             ):
                 debug_ids_with_types.add((source_file_type, debug_id))
+            else:
+                debug_id = None
+                source_file_type = None
+
+        if url := info.get("url"):
+            indexed_files.append(IndexedFile(file_path, url, debug_id, source_file_type))
 
-    return bundle_id, debug_ids_with_types
+    return bundle_id, debug_ids_with_types, indexed_files
 
 
 def _remove_duplicate_artifact_bundles(org_id: int, ids: List[int]):
@@ -361,86 +382,174 @@ def _bind_or_create_artifact_bundle(
         return existing_artifact_bundle, False
 
 
+def _index_artifact_bundle(
+    org_id: int,
+    release_name: str,
+    dist_name: str,
+    artifact_bundle: ArtifactBundle,
+    indexed_files: List[IndexedFile],
+    created: bool,
+    date_added: datetime,
+):
+    # When an existing bundle is uploaded again its contents might have changed, thus we drop the entries of all the
+    # release/dist pairs pointing to it. Lookups for the other pairs will fall back to scanning their bundles.
+    if not created:
+        ArtifactBundleIndex.objects.filter(artifact_bundle=artifact_bundle).delete()
+
+    ArtifactBundleIndex.objects.bulk_create(
+        [
+            ArtifactBundleIndex(
+                organization_id=org_id,
+                release_name=release_name,
+                dist_name=dist_name,
+                url=indexed_file.url,
+                file_path=indexed_file.file_path,
+                debug_id=indexed_file.debug_id,
+                source_file_type=indexed_file.source_file_type.value
+                if indexed_file.source_file_type
+                else None,
+                artifact_bundle=artifact_bundle,
+                date_added=date_added,
+            )
+            for indexed_file in indexed_files
+        ],
+        batch_size=1000,
+    )
+
+
+def _bulk_upsert_artifact_bundle_rows(
+    org_id: int,
+    project_ids: List[int],
+    debug_ids_with_types: Set[Tuple[SourceFileType, str]],
+    artifact_bundle: ArtifactBundle,
+    created: bool,
+    date_added: datetime,
+):
+    # This is the bulk equivalent of `create_or_update` for every row: the rows which already exist for a re-uploaded
+    # bundle get their `date_added` bumped, and the missing ones are inserted while skipping the existing ones.
+    if not created:
+        ProjectArtifactBundle.objects.filter(
+            artifact_bundle=artifact_bundle, project_id__in=project_ids
+        ).update(date_added=date_added)
+        DebugIdArtifactBundle.objects.filter(
+            artifact_bundle=artifact_bundle,
+            debug_id__in=[debug_id for _, debug_id in debug_ids_with_types],
+        ).update(date_added=date_added)
+
+    ProjectArtifactBundle.objects.bulk_create(
+        [
+            ProjectArtifactBundle(
+                organization_id=org_id,
+                project_id=project_id,
+                artifact_bundle=artifact_bundle,
+                date_added=date_added,
+            )
+            for project_id in project_ids
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    DebugIdArtifactBundle.objects.bulk_create(
+        [
+            DebugIdArtifactBundle(
+                organization_id=org_id,
+                debug_id=debug_id,
+                artifact_bundle=artifact_bundle,
+                source_file_type=source_file_type.value,
+                date_added=date_added,
+            )
+            for source_file_type, debug_id in debug_ids_with_types
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
 def _create_artifact_bundle(
     version: Optional[str],
     dist: Optional[str],
     org_id: int,
     project_ids: Optional[List[int]],
     archive_file: File,
-    artifact_count: int,
+    archive: ReleaseArchive,
 ) -> None:
-    with ReleaseArchive(archive_file.getfile()) as archive:
-        bundle_id, debug_ids_with_types = _extract_debug_ids_from_manifest(archive.manifest)
-
-        analytics.record(
-            "artifactbundle.manifest_extracted",
-            organization_id=org_id,
-            project_ids=project_ids,
-            has_debug_ids=len(debug_ids_with_types) > 0,
+    with metrics.timer("tasks.assemble.artifact_bundle.parse_manifest"):
+        bundle_id, debug_ids_with_types, indexed_files = _parse_artifact_bundle_manifest(
+            archive.manifest
         )
 
-        # We want to save an artifact bundle only if we have found debug ids in the manifest or if the user specified
-        # a release for the upload.
-        if len(debug_ids_with_types) > 0 or version:
-            now = timezone.now()
-            # We have to add this dictionary to both `values` and `defaults` since we want to update the date_added in
-            # case of a re-upload because the `date_added` of the ArtifactBundle is also updated.
-            new_date_added = {"date_added": now}
-
-            # We want to run everything in a transaction, since we don't want the database to be in an inconsistent
-            # state after all of these updates.
-            with atomic_transaction(
-                using=(
-                    router.db_for_write(ArtifactBundle),
-                    router.db_for_write(File),
-                    router.db_for_write(ReleaseArtifactBundle),
-                    router.db_for_write(ProjectArtifactBundle),
-                    router.db_for_write(DebugIdArtifactBundle),
+    analytics.record(
+        "artifactbundle.manifest_extracted",
+        organization_id=org_id,
+        project_ids=project_ids,
+        has_debug_ids=len(debug_ids_with_types) > 0,
+    )
+
+    # We want to save an artifact bundle only if we have found debug ids in the manifest or if the user specified
+    # a release for the upload.
+    if len(debug_ids_with_types) > 0 or version:
+        now = timezone.now()
+        # We have to add this dictionary to both `values` and `defaults` since we want to update the date_added in
+        # case of a re-upload because the `date_added` of the ArtifactBundle is also updated.
+        new_date_added = {"date_added": now}
+
+        # We want to run everything in a transaction, since we don't want the database to be in an inconsistent
+        # state after all of these updates.
+        with metrics.timer("tasks.assemble.artifact_bundle.insert_rows"), atomic_transaction(
+            using=(
+                router.db_for_write(ArtifactBundle),
+                router.db_for_write(File),
+                router.db_for_write(ReleaseArtifactBundle),
+                router.db_for_write(ProjectArtifactBundle),
+                router.db_for_write(DebugIdArtifactBundle),
+                router.db_for_write(ArtifactBundleIndex),
+            )
+        ):
+            artifact_bundle, created = _bind_or_create_artifact_bundle(
+                bundle_id=bundle_id,
+                date_added=now,
+                org_id=org_id,
+                archive_file=archive_file,
+                artifact_count=archive.artifact_count,
+            )
+
+            # If a release version is passed, we want to create the weak association between a bundle and a release.
+            if version:
+                ReleaseArtifactBundle.objects.create_or_update(
+                    organization_id=org_id,
+                    release_name=version,
+                    # In case no dist is provided, we will fall back to "" which is the NULL equivalent for our
+                    # tables.
+                    dist_name=dist or "",
+                    artifact_bundle=artifact_bundle,
+                    values=new_date_added,
+                    defaults=new_date_added,
                 )
-            ):
-                artifact_bundle, created = _bind_or_create_artifact_bundle(
-                    bundle_id=bundle_id,
-                    date_added=now,
+
+                # We precompute the lookup of the files by url and debug_id, so that processing can directly
+                # open the bundle containing a file.
+                _index_artifact_bundle(
                     org_id=org_id,
-                    archive_file=archive_file,
-                    artifact_count=artifact_count,
+                    release_name=version,
+                    dist_name=dist or "",
+                    artifact_bundle=artifact_bundle,
+                    indexed_files=indexed_files,
+                    created=created,
+                    date_added=now,
                 )
 
-                # If a release version is passed, we want to create the weak association between a bundle and a release.
-                if version:
-                    ReleaseArtifactBundle.objects.create_or_update(
-                        organization_id=org_id,
-                        release_name=version,
-                        # In case no dist is provided, we will fall back to "" which is the NULL equivalent for our
-                        # tables.
-                        dist_name=dist or "",
-                        artifact_bundle=artifact_bundle,
-                        values=new_date_added,
-                        defaults=new_date_added,
-                    )
-
-                for project_id in project_ids or ():
-                    ProjectArtifactBundle.objects.create_or_update(
-                        organization_id=org_id,
-                        project_id=project_id,
-                        artifact_bundle=artifact_bundle,
-                        values=new_date_added,
-                        defaults=new_date_added,
-                    )
-
-                for source_file_type, debug_id in debug_ids_with_types:
-                    DebugIdArtifactBundle.objects.create_or_update(
-                        organization_id=org_id,
-                        debug_id=debug_id,
-                        artifact_bundle=artifact_bundle,
-                        source_file_type=source_file_type.value,
-                        values=new_date_added,
-                        defaults=new_date_added,
-                    )
-        else:
-            raise AssembleArtifactsError(
-                "uploading a bundle without debug ids or release is prohibited"
+            _bulk_upsert_artifact_bundle_rows(
+                org_id=org_id,
+                project_ids=list(project_ids or ()),
+                debug_ids_with_types=debug_ids_with_types,
+                artifact_bundle=artifact_bundle,
+                created=created,
+                date_added=now,
             )
+    else:
+        raise AssembleArtifactsError(
+            "uploading a bundle without debug ids or release is prohibited"
+        )
 
 
 def handle_assemble_for_release_file(bundle, archive, organization, version):
@@ -484,9 +593,9 @@ def handle_assemble_for_artifact_bundle(bundle, archive, organization, version,
     # contents.
     version = version or archive.manifest.get("release")
     dist = dist or archive.manifest.get("dist")
-    _create_artifact_bundle(
-        version, dist, organization.id, project_ids, bundle, archive.artifact_count
-    )
+    # The archive was already opened from the assembled temporary file, thus the bundle is not downloaded and parsed
+    # a second time.
+    _create_artifact_bundle(version, dist, organization.id, project_ids, bundle, archive)
 
 
 @instrumented_task(name="sentry.tasks.assemble.assemble_artifacts", queue="assemble")
@@ -523,14 +632,15 @@ def assemble_artifacts(
         file_type = "artifact.bundle" if upload_as_artifact_bundle else "release.bundle"
 
         # Assemble the chunks into a temporary file
-        rv = assemble_file(
-            assemble_task,
-            organization,
-            archive_filename,
-            checksum,
-            chunks,
-            file_type,
-        )
+        with metrics.timer("tasks.assemble.assemble_chunks", tags={"type": file_type}):
+            rv = assemble_file(
+                assemble_task,
+                organization,
+                archive_filename,
+                checksum,
+                chunks,
+                file_type,
+            )
 
         # If not file has been created this means that the file failed to
         # assemble because of bad input data. In this case, assemble_file
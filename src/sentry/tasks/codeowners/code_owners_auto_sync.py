@@ -78,6 +78,7 @@ def code_owners_auto_sync(commit_id: int, **kwargs):
         codeowners.update_schema(
             organization=organization,
             raw=codeowner_contents["raw"],
+            use_cache=True,
         )
 
         # TODO(Nisanthan): Record analytics on auto-sync success
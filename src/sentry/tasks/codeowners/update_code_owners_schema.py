@@ -45,6 +45,8 @@ def update_code_owners_schema(
                 repository_project_path_config__in=code_mapping_ids
             )
 
+        # This task runs when teams, external actors or code mappings change, which changes how
+        # owners resolve. Thus it must not use the cache of resolved actors.
         for code_owner in code_owners:
             code_owner.update_schema(organization=organization)
 
@@ -1,12 +1,14 @@
 import logging
 import time
 
+from sentry import options
 from sentry.digests import get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import build_digest, build_digest_from_chunks, split_key
 from sentry.models import Project, ProjectOption
 from sentry.tasks.base import instrumented_task
 from sentry.utils import snuba
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,14 @@ def schedule_digests():
     timeout = 300
     digests.maintenance(deadline - timeout)
 
+    # Timelines are scheduled partition by partition, so batching consecutive
+    # entries lets the delivery task claim them with very few round trips.
+    batch_size = options.get("digests.delivery.batch-size")
+    if batch_size > 1:
+        for batch in chunked(digests.schedule(deadline), batch_size):
+            deliver_digests.delay([entry.key for entry in batch])
+        return
+
     for entry in digests.schedule(deadline):
         deliver_digest.delay(entry.key, entry.timestamp)
 
@@ -35,7 +45,6 @@ def schedule_digests():
 @instrumented_task(name="sentry.tasks.digests.deliver_digest", queue="digests.delivery")
 def deliver_digest(key, schedule_timestamp=None):
     from sentry import digests
-    from sentry.mail import mail_adapter
 
     try:
         project, target_type, target_identifier, fallthrough_choice = split_key(key)
@@ -50,28 +59,87 @@ def deliver_digest(key, schedule_timestamp=None):
 
     with snuba.options_override({"consistent": True}):
         try:
-            with digests.digest(key, minimum_delay=minimum_delay) as records:
-                digest, logs = build_digest(project, records)
+            if options.get("digests.streaming.enabled"):
+                with digests.digest_chunks(
+                    key,
+                    chunk_size=options.get("digests.streaming.chunk-size"),
+                    minimum_delay=minimum_delay,
+                ) as chunks:
+                    digest, logs = build_digest_from_chunks(
+                        project, chunks, max_groups=options.get("digests.streaming.max-groups")
+                    )
+            else:
+                with digests.digest(key, minimum_delay=minimum_delay) as records:
+                    digest, logs = build_digest(project, records)
         except InvalidState as error:
             logger.info(f"Skipped digest delivery: {error}", exc_info=True)
             return
 
-        if digest:
-            mail_adapter.notify_digest(
-                project,
-                digest,
-                target_type,
-                target_identifier,
-                fallthrough_choice=fallthrough_choice,
-            )
-        else:
-            logger.info(
-                "Skipped digest delivery due to empty digest",
-                extra={
-                    "project": project.id,
-                    "target_type": target_type.value,
-                    "target_identifier": target_identifier,
-                    "build_digest_logs": logs,
-                    "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
-                },
-            )
+        _notify_digest(project, target_type, target_identifier, fallthrough_choice, digest, logs)
+
+
+@instrumented_task(name="sentry.tasks.digests.deliver_digests", queue="digests.delivery")
+def deliver_digests(keys):
+    """
+    Deliver the digests for several timelines, claiming them from the backend
+    in bulk rather than one at a time.
+    """
+    from sentry import digests
+
+    timelines = {}
+    for key in keys:
+        try:
+            timelines[key] = split_key(key)
+        except Project.DoesNotExist as error:
+            logger.info(f"Cannot deliver digest {key} due to error: {error}")
+            digests.delete(key)
+
+    minimum_delays = {
+        key: ProjectOption.objects.get_value(project, get_option_key("mail", "minimum_delay"))
+        for key, (project, _, _, _) in timelines.items()
+    }
+
+    built = {}
+    with snuba.options_override({"consistent": True}):
+        with digests.digest_many(minimum_delays) as records_by_key:
+            for key in list(records_by_key):
+                project = timelines[key][0]
+                try:
+                    built[key] = build_digest(project, records_by_key[key])
+                except Exception:
+                    # Leave the records in place so they are retried later,
+                    # without holding up the rest of the batch.
+                    logger.exception("Failed to build digest", extra={"key": key})
+                    del records_by_key[key]
+
+        # The records are gone once the batch is closed, thus a failing notification must not
+        # take the digests after it in the batch down with it.
+        for key, (digest, logs) in built.items():
+            try:
+                _notify_digest(*timelines[key], digest, logs)
+            except Exception:
+                logger.exception("Failed to deliver digest", extra={"key": key})
+
+
+def _notify_digest(project, target_type, target_identifier, fallthrough_choice, digest, logs):
+    from sentry.mail import mail_adapter
+
+    if digest:
+        mail_adapter.notify_digest(
+            project,
+            digest,
+            target_type,
+            target_identifier,
+            fallthrough_choice=fallthrough_choice,
+        )
+    else:
+        logger.info(
+            "Skipped digest delivery due to empty digest",
+            extra={
+                "project": project.id,
+                "target_type": target_type.value,
+                "target_identifier": target_identifier,
+                "build_digest_logs": logs,
+                "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
+            },
+        )
@@ -0,0 +1,12 @@
+from sentry.ratelimits.utils import concurrent_limiter
+from sentry.tasks.base import instrumented_task
+
+
+@instrumented_task(
+    name="sentry.tasks.ratelimits.reap_concurrent_requests", time_limit=65, soft_time_limit=60
+)
+def reap_concurrent_requests():
+    """
+    Sweeps requests that never finished out of the concurrent rate limiter.
+    """
+    concurrent_limiter().reap_expired_requests()
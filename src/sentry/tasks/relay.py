@@ -122,31 +122,37 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
+            projects = {}
             for project in Project.objects.filter(organization_id=organization_id):
                 project.set_cached_field_value("organization", organization)
-                for key in ProjectKey.objects.filter(project_id=project.id):
-                    key.set_cached_field_value("project", project)
-                    # If we find the config in the cache it means it was active.  As such we want to
-                    # recalculate it.  If the config was not there at all, we leave it and avoid the
-                    # cost of re-computation.
-                    if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
-                    else:
-                        action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "organization"},
-                    )
+                projects[project.id] = project
+
+            keys = []
+            for key in ProjectKey.objects.filter(project_id__in=projects):
+                key.set_cached_field_value("project", projects[key.project_id])
+                # If we find the config in the cache it means it was active.  As such we want to
+                # recalculate it.  If the config was not there at all, we leave it and avoid the
+                # cost of re-computation.
+                if projectconfig_cache.backend.get(key.public_key) is not None:
+                    keys.append(key)
+                    action = "recompute"
+                else:
+                    action = "not-cached"
+                metrics.incr(
+                    "relay.projectconfig_cache.invalidation.recompute",
+                    tags={"action": action, "scope": "organization"},
+                )
+            configs.update(compute_projectkey_configs(keys))
     elif project_id:
         for project in Project.objects.filter(id=project_id):
+            keys = []
             for key in ProjectKey.objects.filter(project_id=project_id):
                 key.set_cached_field_value("project", project)
                 # If we find the config in the cache it means it was active.  As such we want to
                 # recalculate it.  If the config was not there at all, we leave it and avoid the
                 # cost of re-computation.
                 if projectconfig_cache.backend.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
+                    keys.append(key)
                     action = "recompute"
                 else:
                     action = "not-cached"
@@ -154,6 +160,7 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                         "relay.projectconfig_cache.invalidation.recompute",
                         tags={"action": action, "scope": "project"},
                     )
+            configs.update(compute_projectkey_configs(keys))
     elif public_key:
         try:
             key = ProjectKey.objects.get(public_key=public_key)
@@ -190,6 +197,31 @@ def compute_projectkey_config(key):
         return get_project_config(key.project, project_keys=[key], full_config=True).to_dict()
 
 
+def compute_projectkey_configs(keys):
+    """Computes the configs of many :class:`ProjectKey` at once.
+
+    Equivalent to calling :func:`compute_projectkey_config` for every key, but
+    the inputs of all projects are loaded in bulk.
+
+    :returns: A dict mapping the public keys to their project config.
+    """
+    from sentry.models import ProjectKeyStatus
+    from sentry.relay.config import get_project_configs
+
+    configs = {}
+    active_keys = []
+    for key in keys:
+        if key.status != ProjectKeyStatus.ACTIVE:
+            configs[key.public_key] = {"disabled": True}
+        else:
+            active_keys.append(key)
+
+    for public_key, config in get_project_configs(active_keys, full_config=True).items():
+        configs[public_key] = config.to_dict()
+
+    return configs
+
+
 @instrumented_task(
     name="sentry.tasks.relay.invalidate_project_config",
     queue="relay_config_bulk",
@@ -238,7 +270,7 @@ def invalidate_project_config(
     updated_configs = compute_configs(
         organization_id=organization_id, project_id=project_id, public_key=public_key
     )
-    projectconfig_cache.backend.set_many(updated_configs)
+    projectconfig_cache.backend.update_many(updated_configs)
 
 
 def schedule_invalidate_project_config(
@@ -242,7 +242,14 @@ class WithProgressBar:
 
 
 def bulk_delete_objects(
-    model, limit=10000, transaction_id=None, logger=None, partition_key=None, **filters
+    model,
+    limit=10000,
+    transaction_id=None,
+    logger=None,
+    partition_key=None,
+    num_shards=None,
+    shard_id=None,
+    **filters,
 ):
     connection = connections[router.db_for_write(model)]
     quote_name = connection.ops.quote_name
@@ -265,6 +272,11 @@ def bulk_delete_objects(
             query.append(f"{quote_name(column)} = %s")
             params.append(value)
 
+    if num_shards:
+        assert num_shards > 1
+        assert shard_id < num_shards
+        query.append(f"{quote_name('id')} %% {int(num_shards)} = {int(shard_id)}")
+
     query = """
         delete from %(table)s
         where %(partition_query)s id = any(array(
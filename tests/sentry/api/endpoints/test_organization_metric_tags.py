@@ -5,7 +5,6 @@ import pytest
 
 from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
-from sentry.sentry_metrics.utils import MetricIndexNotFound
 from sentry.snuba.metrics.naming_layer import get_mri
 from sentry.snuba.metrics.naming_layer.mri import SessionMRI
 from sentry.snuba.metrics.naming_layer.public import SessionMetricKey
@@ -19,8 +18,8 @@ from tests.sentry.api.endpoints.test_organization_metrics import (
 pytestmark = pytest.mark.sentry_metrics
 
 
-def mocked_reverse_resolve(use_case_id, org_id: int, index: int):
-    raise MetricIndexNotFound()
+def mocked_bulk_reverse_resolve(use_case_id, org_id: int, indexes):
+    return {}
 
 
 @region_silo_test(stable=True)
@@ -98,8 +97,8 @@ class OrganizationMetricsTagsIntegrationTest(OrganizationMetricMetaIntegrationTe
         assert response.data == []
 
     @patch(
-        "sentry.snuba.metrics.datasource.reverse_resolve",
-        mocked_reverse_resolve,
+        "sentry.snuba.metrics.datasource.bulk_reverse_resolve",
+        mocked_bulk_reverse_resolve,
     )
     def test_unknown_tag(self):
         response = self.get_success_response(
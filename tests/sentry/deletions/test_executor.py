@@ -0,0 +1,74 @@
+from sentry.deletions import default_manager
+from sentry.deletions.executor import DeletionExecutor, TokenBucket
+from sentry.models import (
+    Group,
+    GroupAssignee,
+    Project,
+    ProjectCodeOwners,
+    RepositoryProjectPathConfig,
+    UserReport,
+)
+from sentry.monitors.models import Monitor
+from sentry.testutils import TestCase, TransactionTestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+class TokenBucketTest(TestCase):
+    def test_acquire(self):
+        now = [0.0]
+
+        def sleep(delay):
+            now[0] += delay
+
+        bucket = TokenBucket(rate=10, clock=lambda: now[0], sleep=sleep)
+        assert bucket.acquire(10) == 0
+        # The bucket is empty, 5 tokens are refilled in half a second.
+        assert bucket.acquire(5) == 0.5
+        now[0] += 10
+        # The bucket never holds more than its capacity.
+        assert bucket.acquire(10) == 0
+        assert bucket.acquire(100) == 1.0
+
+
+@region_silo_test
+class DeletionExecutorTest(TransactionTestCase):
+    def test_plan(self):
+        project = self.create_project()
+        task = default_manager.get(model=Project, query={"id": project.id})
+        relations = task.get_child_relations(project)
+        waves = DeletionExecutor(task, concurrency=4).plan(relations)
+
+        assert [relation for wave in waves for relation in wave] == relations
+        models = [[relation.params["model"] for relation in wave] for wave in waves]
+        assert len(waves) < len(relations)
+        for wave in models:
+            # A model is deleted by one relation at the time.
+            assert len(set(wave)) == len(wave)
+            # Relations deleting more than just rows are never run in parallel.
+            if Group in wave or Monitor in wave:
+                assert len(wave) == 1
+            # Models related by a foreign key are never deleted in parallel.
+            assert not (ProjectCodeOwners in wave and RepositoryProjectPathConfig in wave)
+
+        # The order of the relations is kept.
+        code_owners_wave = next(i for i, wave in enumerate(models) if ProjectCodeOwners in wave)
+        assert any(RepositoryProjectPathConfig in wave for wave in models[code_owners_wave + 1 :])
+
+    def test_delete_project(self):
+        project = self.create_project()
+        group = self.create_group(project=project)
+        GroupAssignee.objects.create(group=group, project=project, user_id=self.user.id)
+        for i in range(5):
+            self.create_userreport(group=group, event_id=str(i) * 32)
+
+        with override_options(
+            {"deletions.executor.concurrency": 4, "deletions.executor.num-shards": 2}
+        ):
+            task = default_manager.get(model=Project, query={"id": project.id})
+            while task.chunk():
+                pass
+
+        assert not Project.objects.filter(id=project.id).exists()
+        assert not GroupAssignee.objects.filter(project_id=project.id).exists()
+        assert not UserReport.objects.filter(project_id=project.id).exists()
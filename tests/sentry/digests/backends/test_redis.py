@@ -151,3 +151,102 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_digest_chunks(self):
+        backend = RedisBackend()
+
+        n = 25
+        t = time.time()
+        for i in range(n):
+            backend.add("timeline", Record(f"record:{i}", f"{i}", t + i))
+
+        with backend.digest_chunks("timeline", chunk_size=10, minimum_delay=0) as chunks:
+            chunks = list(chunks)
+            assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+            # Records are returned newest first.
+            assert [record.key for chunk in chunks for record in chunk] == [
+                f"record:{i}" for i in reversed(range(n))
+            ]
+
+        # Everything was read, so the digest was fully closed.
+        assert {entry.key for entry in backend.schedule(time.time())} == {"timeline"}
+        with backend.digest("timeline", 0) as records:
+            assert set(records) == set()
+
+    def test_digest_chunks_partially_consumed(self):
+        backend = RedisBackend()
+
+        t = time.time()
+        for i in range(5):
+            backend.add("timeline", Record(f"record:{i}", f"{i}", t + i))
+
+        with backend.digest_chunks("timeline", chunk_size=2, minimum_delay=0) as chunks:
+            assert [record.key for record in next(chunks)] == ["record:4", "record:3"]
+
+        # Records that were never read are kept for the next delivery.
+        assert {entry.key for entry in backend.schedule(time.time())} == {"timeline"}
+        with backend.digest("timeline", 0) as records:
+            assert {record.key for record in records} == {"record:0", "record:1", "record:2"}
+
+    def test_digest_chunks_invalid_state(self):
+        backend = RedisBackend()
+        with pytest.raises(InvalidState):
+            with backend.digest_chunks("timeline", minimum_delay=0):
+                pass
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        t = time.time()
+        for timeline in ("timeline:1", "timeline:2"):
+            backend.add(timeline, Record(f"{timeline}:record", "value", t))
+
+        with backend.digest_many(
+            {"timeline:1": 0, "timeline:2": 0, "timeline:missing": None}
+        ) as digests:
+            assert {key: [r.key for r in records] for key, records in digests.items()} == {
+                "timeline:1": ["timeline:1:record"],
+                "timeline:2": ["timeline:2:record"],
+            }
+
+        # Both timelines were closed and moved back to the waiting state.
+        assert {entry.key for entry in backend.schedule(time.time())} == {
+            "timeline:1",
+            "timeline:2",
+        }
+        with backend.digest("timeline:1", 0) as records:
+            assert records == []
+
+    def test_digest_many_skips_removed_timelines(self):
+        backend = RedisBackend()
+
+        record = Record("record:1", "value", time.time())
+        backend.add("timeline", record)
+
+        with backend.digest_many({"timeline": 0}) as digests:
+            del digests["timeline"]
+
+        # The digest was not closed, so the timeline is still ready and the
+        # record is delivered by the next digest.
+        with backend.digest("timeline", 0) as records:
+            assert records == [record]
+
+    def test_digest_many_locked(self):
+        backend = RedisBackend()
+        backend.add("timeline", Record("record:1", "value", time.time()))
+
+        with backend.digest("timeline", 0):
+            with backend.digest_many({"timeline": 0}) as digests:
+                assert digests == {}
+
+    def test_digest_many_releases_locks_on_error(self):
+        backend = RedisBackend()
+        record = Record("record:1", "value", time.time())
+        backend.add("timeline", record)
+
+        with pytest.raises(ValueError):
+            with backend.digest_many({"timeline": 0}):
+                raise ValueError
+
+        with backend.digest("timeline", 0) as records:
+            assert records == [record]
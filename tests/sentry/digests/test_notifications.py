@@ -1,9 +1,13 @@
 from collections import defaultdict
 from functools import cached_property, reduce
+from unittest import mock
 
+from sentry import tsdb
 from sentry.digests import Record
 from sentry.digests.notifications import (
     Notification,
+    build_digest,
+    build_digest_from_chunks,
     event_to_record,
     group_records,
     rewrite_record,
@@ -12,7 +16,7 @@ from sentry.digests.notifications import (
     split_key,
     unsplit_key,
 )
-from sentry.models import Rule
+from sentry.models import Group, GroupStatus, Rule
 from sentry.notifications.types import ActionTargetType, FallthroughChoiceType
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
@@ -80,6 +84,68 @@ class GroupRecordsTestCase(TestCase):
         }
 
 
+@region_silo_test
+class BuildDigestFromChunksTestCase(TestCase):
+    @cached_property
+    def rule(self):
+        return self.project.rule_set.all()[0]
+
+    def get_records(self, fingerprint, count):
+        events = [
+            self.store_event(data={"fingerprint": [fingerprint]}, project_id=self.project.id)
+            for i in range(count)
+        ]
+        return [event_to_record(event, (self.rule,)) for event in reversed(events)]
+
+    def test_matches_build_digest(self):
+        records = self.get_records("group-1", 3) + self.get_records("group-2", 2)
+
+        digest, _ = build_digest_from_chunks(self.project, [records[:2], records[2:]])
+        expected, _ = build_digest(self.project, records)
+        assert digest == expected
+
+    def test_empty(self):
+        assert build_digest_from_chunks(self.project, iter(()))[0] is None
+        assert build_digest_from_chunks(self.project, [[], []])[0] is None
+
+    def test_max_groups(self):
+        busy = self.get_records("busy", 3)
+        quiet = self.get_records("quiet", 1)
+        other = self.get_records("other", 2)
+
+        digest, _ = build_digest_from_chunks(
+            self.project, [busy, quiet, other], max_groups=2, max_records_per_group=1
+        )
+        assert digest is not None
+        groups = digest[self.rule]
+        assert {group.id for group in groups} == {
+            busy[0].value.event.group_id,
+            other[0].value.event.group_id,
+        }
+        # Only the newest record of each group is kept.
+        assert all(len(records) == 1 for records in groups.values())
+        assert groups[busy[0].value.event.group][0].key == busy[0].key
+
+    def test_filtered_groups(self):
+        unresolved = self.get_records("unresolved", 2)
+        resolved = self.get_records("resolved", 2)
+        resolved_group = resolved[0].value.event.group
+        resolved_group.update(status=GroupStatus.RESOLVED)
+
+        with mock.patch("sentry.tsdb.get_sums", side_effect=tsdb.get_sums) as get_sums, mock.patch(
+            "sentry.digests.notifications.Group.objects.in_bulk", wraps=Group.objects.in_bulk
+        ) as in_bulk:
+            digest, _ = build_digest_from_chunks(
+                self.project, [resolved[:1], unresolved, resolved[1:]]
+            )
+
+        assert digest is not None
+        assert {group.id for group in digest[self.rule]} == {unresolved[0].value.event.group_id}
+        # The resolved group is neither queried from tsdb nor loaded again.
+        assert get_sums.call_args[0][1] == [unresolved[0].value.event.group_id]
+        assert in_bulk.call_args_list[-1][0][0] == set()
+
+
 class SortRecordsTestCase(TestCase):
     def test_success(self):
         Rule.objects.create(
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from sentry.lang.javascript.cache import SourceCache
+from sentry.lang.javascript.cache import ParsedSourceCache, SourceCache
 
 
 class BasicCacheTest(TestCase):
@@ -34,3 +34,46 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class ParsedSourceCacheTest(TestCase):
+    def test_reuses_parsed_values(self):
+        cache = ParsedSourceCache(max_size=100)
+        parses = []
+
+        def parse(value):
+            def inner():
+                parses.append(value)
+                return value
+
+            return inner
+
+        key = ("sourceview", 1, None, "http://example.com/foo.js")
+        assert cache.get_or_parse(key, "a", 10, parse("foo")) == "foo"
+        assert cache.get_or_parse(key, "a", 10, parse("bar")) == "foo"
+        assert parses == ["foo"]
+
+        # the artifact was re-uploaded with other contents
+        assert cache.get_or_parse(key, "b", 20, parse("bar")) == "bar"
+        assert parses == ["foo", "bar"]
+        assert len(cache) == 1
+        assert cache.size == 20
+
+    def test_evicts_least_recently_used(self):
+        cache = ParsedSourceCache(max_size=25)
+        cache.get_or_parse(("sourceview", 1, None, "a"), "a", 10, lambda: "a")
+        cache.get_or_parse(("sourceview", 1, None, "b"), "b", 10, lambda: "b")
+        cache.get_or_parse(("sourceview", 1, None, "a"), "a", 10, lambda: "unused")
+        cache.get_or_parse(("sourceview", 1, None, "c"), "c", 10, lambda: "c")
+
+        assert len(cache) == 2
+        assert cache.size == 20
+        assert cache.get_or_parse(("sourceview", 1, None, "a"), "a", 10, lambda: "new") == "a"
+        assert cache.get_or_parse(("sourceview", 1, None, "b"), "b", 10, lambda: "new") == "new"
+
+        # values larger than the whole cache are never stored
+        assert cache.get_or_parse(("sourceview", 1, None, "d"), "d", 30, lambda: "d") == "d"
+        assert cache.size <= 25
+
+        cache.resize(10)
+        assert len(cache) == 1
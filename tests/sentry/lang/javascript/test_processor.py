@@ -1,7 +1,9 @@
 import errno
 import re
+import threading
 import unittest
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from io import BytesIO
 from time import time
@@ -12,6 +14,7 @@ import pytest
 import responses
 from requests.exceptions import RequestException
 from sentry_relay.processing import StoreNormalizer
+from symbolic.sourcemap import SourceView
 
 from sentry import http, options
 from sentry.constants import DEFAULT_STORE_NORMALIZER_ARGS
@@ -24,6 +27,7 @@ from sentry.lang.javascript.processor import (
     Fetcher,
     JavaScriptStacktraceProcessor,
     UnparseableSourcemap,
+    _artifact_bundle_index_lookups,
     cache,
     discover_sourcemap,
     fetch_release_archive_for_url,
@@ -39,6 +43,7 @@ from sentry.lang.javascript.processor import (
 )
 from sentry.models import (
     ArtifactBundle,
+    ArtifactBundleIndex,
     DebugIdArtifactBundle,
     EventError,
     File,
@@ -84,6 +89,92 @@ class JavaScriptStacktraceProcessorTest(TestCase):
         r = JavaScriptStacktraceProcessor({}, None, project)
         assert not r.fetcher.allow_scraping
 
+    @override_options({"sourcemaps.parsed-cache.max-size": 1024})
+    @patch("sentry.lang.javascript.processor.SourceView.from_bytes", wraps=SourceView.from_bytes)
+    def test_shares_parsed_sources_between_events(self, from_bytes):
+        project = self.create_project()
+        url = "http://example.com/foo.js"
+
+        first = JavaScriptStacktraceProcessor({}, None, project)
+        second = JavaScriptStacktraceProcessor({}, None, project)
+        assert first.parsed_source_cache is second.parsed_source_cache
+        first.parsed_source_cache.clear()
+
+        assert first._parse_sourceview(b"foo\nbar", url=url)[0] == "foo"
+        assert second._parse_sourceview(b"foo\nbar", url=url)[0] == "foo"
+        assert from_bytes.call_count == 1
+
+        # re-uploaded with other contents
+        assert second._parse_sourceview(b"baz", url=url)[0] == "baz"
+        assert from_bytes.call_count == 2
+
+    @override_options({"processing.frame-cache.javascript": True})
+    @patch("sentry.lang.javascript.processor.JavaScriptStacktraceProcessor.populate_source_cache")
+    def test_frame_cache(self, populate_source_cache):
+        project = self.create_project()
+        frames = [
+            {"abs_path": "http://example.com/foo.js", "lineno": 1, "colno": 1},
+            {"abs_path": "http://example.com/bar.js", "lineno": 2, "colno": 2},
+        ]
+        data = {
+            "platform": "javascript",
+            "project": project.id,
+            "release": "abc",
+            "debug_meta": {
+                "images": [
+                    {
+                        "type": "sourcemap",
+                        "code_file": frame["abs_path"],
+                        "debug_id": f"c941d872-af1f-4f0c-a7ff-ad3d295fe15{idx}",
+                    }
+                    for idx, frame in enumerate(frames)
+                ]
+            },
+            "stacktrace": {"frames": frames},
+        }
+        infos = find_stacktraces_in_data(data)
+        processor = JavaScriptStacktraceProcessor(data, infos, project)
+        processable_frames = [
+            ProcessableFrame(frame, len(frames) - idx - 1, processor, infos[0], [])
+            for idx, frame in enumerate(frames)
+        ]
+        for processable_frame in processable_frames:
+            processable_frame.processable_frames = processable_frames
+            processor.preprocess_frame(processable_frame)
+
+        foo, bar = processable_frames
+        assert foo.cache_key is not None
+        assert bar.cache_key is not None
+        # The call site is part of the key of the next frame.
+        assert processor.get_frame_cache_values(bar)[-1] == [
+            "http://example.com/foo.js",
+            1,
+            1,
+            "c941d872-af1f-4f0c-a7ff-ad3d295fe150",
+        ]
+
+        cached_frame = dict(frames[0], function="original")
+        foo.cache_value = {
+            "frames": [cached_frame],
+            "raw_frames": None,
+            "token_name": "caller",
+            "sourcemap_url": "http://example.com/foo.js.map",
+        }
+        processing_task = MagicMock()
+        processing_task.iter_processable_frames.return_value = processable_frames
+        processor.preprocess_step(processing_task)
+        # Only the files of frames missing from the cache are fetched.
+        assert populate_source_cache.call_args[0][0] == [frames[1]]
+
+        assert processor.process_frame(foo, processing_task) == ([cached_frame], None, [])
+        assert foo.data["token"].name == "caller"
+
+        # Files found by url can be re-uploaded under the same release, thus frames without a debug id are not
+        # cached.
+        processor = JavaScriptStacktraceProcessor(dict(data, debug_meta=None), infos, project)
+        processor.preprocess_frame(foo)
+        assert foo.cache_key is None
+
     @patch(
         "sentry.lang.javascript.processor.JavaScriptStacktraceProcessor.get_valid_frames",
         return_value=[1],
@@ -229,6 +320,20 @@ def test_build_fetch_retry_condition() -> None:
     assert should_retry_fetch(1, Exception("something else")) is False
 
 
+def test_fetch_artifact_bundle_file_from_disk_cache_retries() -> None:
+    stale_file_error = OSError()
+    stale_file_error.errno = errno.ESTALE
+    bundle_file = MagicMock()
+
+    with patch("sentry.lang.javascript.processor.ArtifactBundle.cache") as cache:
+        cache.enabled = True
+        cache.getfile.side_effect = [stale_file_error, bundle_file]
+
+        assert Fetcher._fetch_artifact_bundle_file(MagicMock()) is bundle_file
+
+    assert cache.getfile.call_count == 2
+
+
 class FetchReleaseFileTest(TestCase):
     def test_unicode(self):
         project = self.project
@@ -636,6 +741,74 @@ class FetchByUrlTest(FetchTest):
 
         assert result == result2
 
+    @responses.activate
+    def test_prefetch(self):
+        responses.add(
+            responses.GET,
+            "http://example.com/prefetch.js",
+            body="foo\n//# sourceMappingURL=prefetch.js.map",
+            content_type="application/javascript",
+        )
+        responses.add(
+            responses.GET,
+            "http://example.com/prefetch.js.map",
+            body="{}",
+            content_type="application/json",
+        )
+        responses.add(responses.GET, "http://example.com/prefetch-missing.js", status=404)
+
+        fetcher = Fetcher(self.organization)
+        with patch(
+            "sentry.lang.javascript.processor.close_old_connections"
+        ) as close_old_connections:
+            fetcher.prefetch(
+                [
+                    ("http://example.com/prefetch.js", None),
+                    ("http://example.com/prefetch-missing.js", None),
+                ],
+                max_workers=2,
+                max_per_organization=1,
+            )
+        assert len(responses.calls) == 3
+        # the pool threads release their database connections after every file
+        assert close_old_connections.call_count == 2
+
+        # the outcomes are handed out to the sequential fetches, errors included
+        assert fetcher.fetch_by_url("http://example.com/prefetch.js").body.startswith(b"foo")
+        assert fetcher.fetch_by_url("http://example.com/prefetch.js.map").body == b"{}"
+        with pytest.raises(http.CannotFetch):
+            fetcher.fetch_by_url("http://example.com/prefetch-missing.js")
+        assert len(responses.calls) == 3
+        assert fetcher.prefetched == {}
+
+    def test_open_archives_concurrently(self):
+        fetcher = Fetcher(self.organization)
+        # Both bundles have to be downloading at the same time to pass the barrier.
+        barrier = threading.Barrier(2, timeout=5)
+        fetched = []
+
+        def fetch_artifact_bundle_file(artifact_bundle):
+            fetched.append(artifact_bundle)
+            if artifact_bundle in ("a", "b"):
+                barrier.wait()
+            return BytesIO(b"")
+
+        with patch.object(
+            Fetcher, "_fetch_artifact_bundle_file", side_effect=fetch_artifact_bundle_file
+        ), patch("sentry.lang.javascript.processor.ArtifactBundleArchive") as archive_cls:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                archives = list(
+                    executor.map(
+                        lambda bundle: fetcher._open_archive(bundle, lambda: bundle),
+                        ["a", "b", "c", "c"],
+                    )
+                )
+
+        assert archives == [archive_cls.return_value] * 4
+        # A bundle shared by many files is only downloaded once.
+        assert sorted(fetched) == ["a", "b", "c"]
+        assert set(fetcher.open_archives) == {"a", "b", "c"}
+
     @responses.activate
     def test_with_token(self):
         responses.add(
@@ -1588,6 +1761,80 @@ class FetchByUrlNewTest(FetchTest):
 
         fetcher.close()
 
+    def test_indexed_archive(self):
+        _artifact_bundle_index_lookups.clear()
+        dist = self.release.add_dist("android")
+
+        artifact_bundles = []
+        for name, content in (("other.js", b"baz"), ("index.js", b"bar")):
+            file = self.get_compressed_zip_file(
+                "bundle.zip",
+                {
+                    name: {
+                        "url": f"~/{name}",
+                        "type": "minified_source",
+                        "content": content,
+                        "headers": {"content-type": "application/json"},
+                    },
+                },
+            )
+            artifact_bundle = ArtifactBundle.objects.create(
+                organization_id=self.organization.id,
+                bundle_id=uuid4(),
+                file=file,
+                artifact_count=1,
+            )
+            ReleaseArtifactBundle.objects.create(
+                organization_id=self.organization.id,
+                release_name=self.release.version,
+                dist_name=dist.name,
+                artifact_bundle=artifact_bundle,
+            )
+            ProjectArtifactBundle.objects.create(
+                organization_id=self.organization.id,
+                project_id=self.project.id,
+                artifact_bundle=artifact_bundle,
+            )
+            artifact_bundles.append(artifact_bundle)
+
+        other_bundle, indexed_bundle = artifact_bundles
+        ArtifactBundleIndex.objects.create(
+            organization_id=self.organization.id,
+            release_name=self.release.version,
+            dist_name=dist.name,
+            url="~/index.js",
+            file_path="index.js",
+            artifact_bundle=indexed_bundle,
+        )
+
+        # Only the bundle containing the file is opened.
+        fetcher = Fetcher(
+            organization=self.organization, project=self.project, release=self.release, dist=dist
+        )
+        result = fetcher.fetch_by_url_new("http://example.com/index.js")
+        assert result.body == b"bar"
+        assert result.headers == {"content-type": "application/json"}
+        assert list(fetcher.open_archives.keys()) == [indexed_bundle.id]
+
+        # Files missing from the index are looked up in all the bundles of the release.
+        result = fetcher.fetch_by_url_new("http://example.com/other.js")
+        assert result.body == b"baz"
+        assert set(fetcher.open_archives.keys()) == {indexed_bundle.id, other_bundle.id}
+        fetcher.close()
+
+        # The index lookups are cached, including the ones of files missing from the index.
+        fetcher = Fetcher(
+            organization=self.organization, project=self.project, release=self.release, dist=dist
+        )
+        with patch.object(ArtifactBundleIndex.objects, "filter") as filter:
+            assert fetcher._get_indexed_file(url="http://example.com/index.js") == (
+                indexed_bundle.id,
+                "index.js",
+            )
+            assert fetcher._get_indexed_file(url="http://example.com/other.js") is None
+        filter.assert_not_called()
+        fetcher.close()
+
 
 class FetchByDebugIdTest(FetchTest):
     def test_fetch_by_debug_id_with_valid_params(self):
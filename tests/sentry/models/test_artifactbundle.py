@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO
+from unittest.mock import patch
+
+from sentry.models import ArtifactBundle, File
+from sentry.models.artifactbundle import ArtifactBundleFileCache
+from sentry.models.files.utils import MappedFile
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test(stable=True)
+class ArtifactBundleFileCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_path)
+
+    def create_bundle(self, content):
+        file = self.create_file(name="bundle.zip")
+        file.putfile(BytesIO(content))
+        return ArtifactBundle.objects.create(
+            organization_id=self.organization.id, file=file, artifact_count=1
+        )
+
+    def test_getfile_fs_cache(self):
+        artifact_bundle = self.create_bundle(b"this is a test")
+        expected_path = os.path.join(
+            self.cache_path, str(self.organization.id), str(artifact_bundle.file_id)
+        )
+
+        with override_options(
+            {"artifactbundle.cache-path": self.cache_path, "artifactbundle.cache-max-size": 1024}
+        ):
+            assert ArtifactBundle.cache.enabled
+            with ArtifactBundle.cache.getfile(artifact_bundle) as f:
+                assert isinstance(f, MappedFile)
+                assert f.read() == b"this is a test"
+                assert f.name == expected_path
+
+            os.stat(expected_path)
+
+            # A cached bundle is not downloaded again.
+            with patch.object(File, "save_to") as save_to:
+                with ArtifactBundle.cache.getfile(artifact_bundle) as f:
+                    f.seek(8)
+                    assert f.read(4) == b"a te"
+                save_to.assert_not_called()
+
+    def test_getfile_too_large(self):
+        artifact_bundle = self.create_bundle(b"this is a test")
+
+        with override_options(
+            {"artifactbundle.cache-path": self.cache_path, "artifactbundle.cache-max-size": 4}
+        ):
+            with ArtifactBundle.cache.getfile(artifact_bundle) as f:
+                assert not isinstance(f, MappedFile)
+                assert f.read() == b"this is a test"
+
+        assert os.listdir(self.cache_path) == []
+
+    def test_evicts_least_recently_used(self):
+        first = self.create_bundle(b"a" * 10)
+        second = self.create_bundle(b"b" * 10)
+        third = self.create_bundle(b"c" * 10)
+
+        with override_options(
+            {"artifactbundle.cache-path": self.cache_path, "artifactbundle.cache-max-size": 25}
+        ):
+            ArtifactBundle.cache.getfile(first).close()
+            ArtifactBundle.cache.getfile(second).close()
+            # Backdate the bundles, then use the first one again.
+            past = time.time() - 60
+            for artifact_bundle in (first, second):
+                os.utime(ArtifactBundle.cache.get_path(artifact_bundle), (past, past))
+            ArtifactBundle.cache.getfile(first).close()
+
+            ArtifactBundle.cache.getfile(third).close()
+
+            assert os.path.exists(ArtifactBundle.cache.get_path(first))
+            assert not os.path.exists(ArtifactBundle.cache.get_path(second))
+            assert os.path.exists(ArtifactBundle.cache.get_path(third))
+
+    @patch("sentry.models.artifactbundle.evict_cached_files", return_value=0)
+    def test_eviction_throttled(self, evict_cached_files):
+        bundles = [self.create_bundle(b"%d" % i * 10) for i in range(12)]
+
+        with override_options(
+            {"artifactbundle.cache-path": self.cache_path, "artifactbundle.cache-max-size": 1000}
+        ), patch.object(ArtifactBundle, "cache", ArtifactBundleFileCache()):
+            for artifact_bundle in bundles:
+                ArtifactBundle.cache.getfile(artifact_bundle).close()
+
+        # The first download evicts, then every 100 downloaded bytes do.
+        assert evict_cached_files.call_count == 2
@@ -1,4 +1,7 @@
 import os
+import shutil
+import tempfile
+from hashlib import sha1
 from io import BytesIO
 from unittest.mock import patch
 
@@ -6,8 +9,12 @@ import pytest
 from django.core.files.base import ContentFile
 from django.db import DatabaseError
 
-from sentry.models import File, FileBlob, FileBlobIndex
+from sentry.locks import locks
+from sentry.models import File, FileBlob, FileBlobIndex, FileBlobOwner
+from sentry.models.files.abstractfileblob import FileBlobCache
+from sentry.models.files.utils import get_storage
 from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import region_silo_test
 
 
@@ -28,6 +35,112 @@ class FileBlobTest(TestCase):
         assert my_file1.checksum == my_file2.checksum
         assert my_file1.path == my_file2.path
 
+    def test_from_files(self):
+        existing = FileBlob.from_file(ContentFile(b"foo"))
+        files = [ContentFile(b"foo"), ContentFile(b"bar"), ContentFile(b"bar")]
+
+        FileBlob.from_files(files, organization=self.organization)
+
+        blobs = FileBlob.objects.filter(checksum__in=[existing.checksum, sha1(b"bar").hexdigest()])
+        assert len(blobs) == 2
+        assert FileBlob.objects.get(checksum=existing.checksum).path == existing.path
+        assert (
+            FileBlobOwner.objects.filter(
+                blob__in=blobs, organization_id=self.organization.id
+            ).count()
+            == 2
+        )
+        with FileBlob.objects.get(checksum=sha1(b"bar").hexdigest()).getfile() as f:
+            assert f.read() == b"bar"
+
+    def test_from_files_checksum_mismatch(self):
+        with pytest.raises(IOError):
+            FileBlob.from_files([(ContentFile(b"foo"), sha1(b"bar").hexdigest())])
+        assert not FileBlob.objects.exists()
+
+    def test_from_files_concurrent_upload(self):
+        # Simulate another request storing the same chunk while we upload it.
+        checksum = sha1(b"foo").hexdigest()
+        other = FileBlob(size=3, checksum=checksum, path=FileBlob.generate_unique_path())
+        get_storage().save(other.path, ContentFile(b"foo"))
+        bulk_create = FileBlob.objects.bulk_create
+
+        def _bulk_create(*args, **kwargs):
+            other.save()
+            return bulk_create(*args, **kwargs)
+
+        with patch.object(FileBlob.objects, "bulk_create", side_effect=_bulk_create), patch.object(
+            FileBlob, "generate_unique_path", return_value="ab/cdef/ours"
+        ):
+            FileBlob.from_files([ContentFile(b"foo")], organization=self.organization)
+
+        assert FileBlob.objects.get(checksum=checksum).path == other.path
+        FileBlobOwner.objects.get(blob=other, organization_id=self.organization.id)
+        # Our copy of the chunk is removed again.
+        assert not get_storage().exists("ab/cdef/ours")
+
+    def test_from_files_concurrent_delete(self):
+        # Simulate the existing blob being deleted before its owner is created.
+        existing = FileBlob.from_file(ContentFile(b"foo"))
+        get_lock = locks.get
+
+        def _get_lock(*args, **kwargs):
+            FileBlob.objects.filter(id=existing.id).delete()
+            return get_lock(*args, **kwargs)
+
+        with patch("sentry.models.files.abstractfileblob.locks.get", side_effect=_get_lock):
+            FileBlob.from_files([ContentFile(b"foo")], organization=self.organization)
+
+        blob = FileBlob.objects.get(checksum=existing.checksum)
+        assert blob.id != existing.id
+        FileBlobOwner.objects.get(blob=blob, organization_id=self.organization.id)
+        with blob.getfile() as f:
+            assert f.read() == b"foo"
+
+    def test_getfile_fs_cache(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+        blob = FileBlob.from_file(ContentFile(b"foo bar"))
+
+        with override_options({"fileblob.cache-path": cache_path, "fileblob.cache-max-size": 1024}):
+            with blob.getfile() as f:
+                assert f.read() == b"foo bar"
+            assert os.path.isfile(os.path.join(cache_path, blob.checksum[:2], blob.checksum))
+
+            # A cached blob is not downloaded again.
+            with patch.object(FileBlob, "_open_stored") as open_stored:
+                with blob.getfile() as f:
+                    assert f.read() == b"foo bar"
+            open_stored.assert_not_called()
+
+    @patch("sentry.models.files.abstractfileblob.evict_cached_files", return_value=0)
+    def test_getfile_fs_cache_eviction(self, evict_cached_files):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+        blobs = [FileBlob.from_file(ContentFile(b"%d" % i * 10)) for i in range(12)]
+
+        with override_options(
+            {"fileblob.cache-path": cache_path, "fileblob.cache-max-size": 1000}
+        ), patch.object(FileBlob, "cache", FileBlobCache()):
+            for blob in blobs:
+                with blob.getfile():
+                    pass
+
+        # The first download evicts, then every 100 downloaded bytes do.
+        assert evict_cached_files.call_count == 2
+
+    def test_getfile_fs_cache_checksum_mismatch(self):
+        cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_path)
+        blob = FileBlob.from_file(ContentFile(b"foo bar"))
+        blob.checksum = sha1(b"something else").hexdigest()
+
+        with override_options({"fileblob.cache-path": cache_path, "fileblob.cache-max-size": 1024}):
+            with blob.getfile() as f:
+                assert f.read() == b"foo bar"
+
+        assert os.listdir(os.path.join(cache_path, blob.checksum[:2])) == []
+
     def test_generate_unique_path(self):
         path = FileBlob.generate_unique_path()
         assert path
@@ -157,6 +270,35 @@ class FileTest(TestCase):
             with pytest.raises(ValueError):
                 fp.seek(0, 666)
 
+    def test_random_access(self):
+        data = os.urandom(1000)
+        file = File.objects.create(name="test.bin", type="default", size=len(data))
+        file.putfile(BytesIO(data), 10)
+
+        with patch.object(
+            FileBlob, "getfile", autospec=True, side_effect=FileBlob.getfile
+        ) as getfile:
+            with file.getfile() as fp:
+                fp.seek(-22, 2)
+                assert fp.read(4) == data[-22:-18]
+                fp.seek(505)
+                assert fp.read(10) == data[505:515]
+                assert fp.tell() == 515
+
+            # Only the chunks at the read offsets are fetched.
+            assert getfile.call_count == 4
+
+    def test_readahead(self):
+        data = os.urandom(1000)
+        file = File.objects.create(name="test.bin", type="default", size=len(data))
+        file.putfile(BytesIO(data), 10)
+
+        with file.getfile(readahead=3) as fp:
+            assert fp.read(7) == data[:7]
+            assert fp.read() == data[7:]
+            fp.seek(333)
+            assert fp.read(100) == data[333:433]
+
     def test_multi_chunk_prefetch(self):
         random_data = os.urandom(1 << 25)
 
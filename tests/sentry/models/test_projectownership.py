@@ -655,3 +655,19 @@ class ResolveActorsTestCase(TestCase):
 
         owner = Owner("user", user.email)
         resolve_actors([owner], project.id)
+
+    def test_use_cache(self):
+        owners = [
+            Owner("user", self.user.email),
+            Owner("team", self.team.slug),
+            Owner("team", "nope"),
+        ]
+        expected = {
+            owners[0]: ActorTuple(self.user.id, User),
+            owners[1]: ActorTuple(self.team.id, Team),
+            owners[2]: None,
+        }
+        assert resolve_actors(owners, self.project.id, use_cache=True) == expected
+
+        with self.assertNumQueries(0):
+            assert resolve_actors(owners, self.project.id, use_cache=True) == expected
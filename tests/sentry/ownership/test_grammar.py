@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from sentry.ownership.grammar import (
@@ -995,6 +997,42 @@ codeowners:docs-ui/ docs-sentry ecosystem
     )
 
 
+def test_convert_codeowners_syntax_cached():
+    code_mapping = type("", (), {})()
+    code_mapping.stack_root = "webpack://docs"
+    code_mapping.source_root = "docs"
+    associations = {"@getsentry/docs": "docs-sentry"}
+
+    with mock.patch(
+        "sentry.ownership.grammar._convert_codeowners_syntax",
+        return_value="codeowners:webpack://docs/* docs-sentry\n",
+    ) as mock_convert:
+        first = convert_codeowners_syntax(codeowners_fixture_data, associations, code_mapping)
+        second = convert_codeowners_syntax(codeowners_fixture_data, associations, code_mapping)
+        assert first == second
+        assert mock_convert.call_count == 1
+
+        # Any change to the associations or the code mapping is a cache miss
+        convert_codeowners_syntax(
+            codeowners_fixture_data, {**associations, "@AnotherUser": "a@sentry.io"}, code_mapping
+        )
+        assert mock_convert.call_count == 2
+
+        code_mapping.source_root = "other"
+        convert_codeowners_syntax(codeowners_fixture_data, associations, code_mapping)
+        assert mock_convert.call_count == 3
+
+
+def test_parse_code_owners_cached():
+    with mock.patch(
+        "sentry.ownership.grammar._parse_code_owners", return_value=(["@a/b"], ["@c"], [])
+    ) as mock_parse:
+        data = f"{codeowners_fixture_data}\n# cached\n"
+        assert parse_code_owners(data) == (["@a/b"], ["@c"], [])
+        assert parse_code_owners(data) == (["@a/b"], ["@c"], [])
+        assert mock_parse.call_count == 1
+
+
 def test_convert_schema_to_rules_text():
     assert (
         convert_schema_to_rules_text(
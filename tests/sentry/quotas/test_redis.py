@@ -5,7 +5,7 @@ from unittest import mock
 import pytest
 
 from sentry.constants import DataCategory
-from sentry.quotas.base import QuotaConfig, QuotaScope
+from sentry.quotas.base import QuotaConfig, QuotaItem, QuotaScope
 from sentry.quotas.redis import RedisQuota, is_rate_limited
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
@@ -64,6 +64,14 @@ def test_is_rate_limited_script():
     # test that refund key is used
     assert list(map(bool, is_rate_limited(client, ("orange", "apple"), (1, now + 60)))) == [False]
 
+    # An optional trailing argument specifies the quantity to consume.
+    assert list(map(bool, is_rate_limited(client, ("pear", "r:pear"), (10, now + 60, 8)))) == [
+        False
+    ]
+    assert client.get("pear") == b"8"
+    assert list(map(bool, is_rate_limited(client, ("pear", "r:pear"), (10, now + 60, 3)))) == [True]
+    assert client.get("pear") == b"8"
+
 
 @region_silo_test(stable=True)
 class RedisQuotaTest(TestCase):
@@ -453,3 +461,67 @@ class RedisQuotaTest(TestCase):
         # count for these quotas and None for the others.
         # The ``- 1`` is because we refunded once.
         assert usage == [n - 1 if q.id else None for q in quotas] + [0, 0]
+
+    def test_is_rate_limited_many(self):
+        timestamp = time.time()
+        self.get_project_quota.return_value = (3, 60)
+        self.get_organization_quota.return_value = (100, 60)
+
+        other_project = self.create_project(organization=self.organization)
+        items = [QuotaItem(self.project, timestamp=timestamp) for _ in range(4)] + [
+            QuotaItem(other_project, timestamp=timestamp)
+        ]
+
+        results = self.quota.is_rate_limited_many(items)
+        assert [r.is_limited for r in results] == [False, False, False, True, False]
+        assert results[3].reason_code == "project_quota"
+
+        quotas = self.quota.get_quotas(self.project)
+        assert self.quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp) == [
+            3,
+            4,
+        ]
+
+    def test_is_rate_limited_many_matches_single(self):
+        timestamp = time.time()
+        self.get_project_quota.return_value = (2, 60)
+        self.get_organization_quota.return_value = (100, 60)
+
+        single = [
+            self.quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+            for _ in range(3)
+        ]
+        other_project = self.create_project(organization=self.organization)
+        many = [
+            r.is_limited
+            for r in self.quota.is_rate_limited_many(
+                [QuotaItem(other_project, timestamp=timestamp) for _ in range(3)]
+            )
+        ]
+        assert single == many == [False, False, True]
+
+    @mock.patch.object(RedisQuota, "get_quotas", return_value=[])
+    def test_is_rate_limited_many_without_quotas(self, get_quotas):
+        results = self.quota.is_rate_limited_many([QuotaItem(self.project)])
+        assert not results[0].is_limited
+
+    def test_refund_many(self):
+        timestamp = time.time()
+        self.get_project_quota.return_value = (200, 60)
+        self.get_organization_quota.return_value = (300, 60)
+
+        for _ in range(10):
+            self.quota.is_rate_limited(self.project, timestamp=timestamp)
+
+        self.quota.refund_many(
+            [
+                QuotaItem(self.project, timestamp=timestamp),
+                QuotaItem(self.project, timestamp=timestamp, quantity=2),
+                # Not tracked by any error quota
+                QuotaItem(self.project, timestamp=timestamp, category=DataCategory.ATTACHMENT),
+            ]
+        )
+
+        quotas = self.quota.get_quotas(self.project)
+        usage = self.quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp)
+        assert usage == [7, 7]
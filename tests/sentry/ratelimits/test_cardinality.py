@@ -1,4 +1,5 @@
 from typing import Collection, Optional, Sequence
+from unittest import mock
 
 import pytest
 
@@ -227,3 +228,68 @@ def test_regression_mixed_order(limiter: RedisCardinalityLimiter):
     # there used to be a bug where anything after 10 (i.e. 5) was dropped as
     # well (due to a wrong `break` somewhere in a loop)
     assert helper.add_values([0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 5]) == [0, 1, 2, 3, 4, 6, 7, 8, 9, 5]
+
+
+@pytest.fixture
+def cached_limiter():
+    return RedisCardinalityLimiter(local_cache_size=100)
+
+
+def test_local_cache_skips_known_hashes(cached_limiter: RedisCardinalityLimiter):
+    helper = LimiterHelper(cached_limiter)
+
+    assert helper.add_values([1, 2, 3]) == [1, 2, 3]
+
+    with mock.patch.object(
+        cached_limiter.impl, "check_within_quotas", wraps=cached_limiter.impl.check_within_quotas
+    ) as check, mock.patch.object(
+        cached_limiter.impl, "use_quotas", wraps=cached_limiter.impl.use_quotas
+    ) as use:
+        # all hashes were admitted in this granule already, redis is not asked
+        assert helper.add_values([3, 2, 1]) == [3, 2, 1]
+        assert check.call_count == 0
+        assert use.call_count == 0
+
+        # only the unknown hash is sent to redis
+        assert helper.add_values([1, 4]) == [1, 4]
+        ((requests, _), _) = check.call_args
+        assert [list(request.unit_hashes) for request in requests] == [[4]]
+        ((grants, _), _) = use.call_args
+        assert [grant.granted_unit_hashes for grant in grants] == [[4]]
+
+
+def test_local_cache_respects_limit(cached_limiter: RedisCardinalityLimiter):
+    helper = LimiterHelper(cached_limiter)
+
+    assert helper.add_values(list(range(10))) == list(range(10))
+    assert helper.add_values(list(range(15))) == list(range(10))
+    assert helper.add_value(20) is None
+
+
+def test_local_cache_granule_rollover(cached_limiter: RedisCardinalityLimiter):
+    helper = LimiterHelper(cached_limiter)
+
+    assert helper.add_values([1, 2]) == [1, 2]
+
+    helper.timestamp += helper.quota.granularity_seconds
+
+    with mock.patch.object(
+        cached_limiter.impl, "check_within_quotas", wraps=cached_limiter.impl.check_within_quotas
+    ) as check:
+        # a new granule started, known hashes need to be written again
+        assert helper.add_values([1, 2]) == [1, 2]
+        assert check.call_count == 1
+
+
+def test_local_cache_max_size():
+    limiter = RedisCardinalityLimiter(local_cache_size=5)
+    helper = LimiterHelper(limiter)
+
+    assert helper.add_values([1, 2, 3]) == [1, 2, 3]
+    assert limiter.local_cache is not None
+    assert limiter.local_cache.get("hello", helper.quota, helper.timestamp) == {1, 2, 3}
+
+    # overflowing the cache drops it, redis remains the source of truth
+    assert helper.add_values([4, 5, 6]) == [4, 5, 6]
+    assert limiter.local_cache.get("hello", helper.quota, helper.timestamp) == frozenset()
+    assert helper.add_values([1, 6]) == [1, 6]
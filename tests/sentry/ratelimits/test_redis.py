@@ -67,3 +67,56 @@ class RedisRateLimiterTest(TestCase):
             assert not limited
             assert value == 1
             assert reset_time == expected_reset_time + 5
+
+
+@region_silo_test(stable=True)
+class RedisRateLimiterLeaseTest(TestCase):
+    def setUp(self):
+        self.backend = RedisRateLimiter(lease_size=10)
+
+    def test_leases_tokens(self):
+        with freeze_time("2000-01-01"):
+            for expected in range(1, 11):
+                limited, value, _ = self.backend.is_limited_with_value("foo", 1000)
+                assert not limited
+                assert value == expected
+
+            # The whole block was taken with the first request.
+            assert self.backend.current_value("foo") == 10
+
+            self.backend.is_limited("foo", 1000)
+            assert self.backend.current_value("foo") == 20
+
+    def test_never_grants_more_than_limit(self):
+        other = RedisRateLimiter(lease_size=10)
+        with freeze_time("2000-01-01"):
+            granted = 0
+            for i in range(200):
+                backend = self.backend if i % 2 else other
+                if not backend.is_limited("foo", 100):
+                    granted += 1
+            assert granted <= 100
+            # Leases are only lost at the end of the window, so the limit
+            # can only be undershot by the unused part of each block.
+            assert granted >= 100 - 2 * 9
+
+    def test_small_limit_does_not_lease(self):
+        with freeze_time("2000-01-01"):
+            assert not self.backend.is_limited("foo", 5)
+            assert self.backend.current_value("foo") == 1
+
+    def test_window_rollover(self):
+        with freeze_time("2000-01-01") as frozen_time:
+            self.backend.is_limited("foo", 1000, window=10)
+            assert self.backend.current_value("foo", window=10) == 10
+
+            frozen_time.tick(10)
+            limited, value, _ = self.backend.is_limited_with_value("foo", 1000, window=10)
+            assert not limited
+            assert value == 1
+
+    def test_project_key(self):
+        with freeze_time("2000-01-01"):
+            self.backend.is_limited("foo", 1000, self.project)
+            limited, value, _ = self.backend.is_limited_with_value("foo", 1000)
+            assert value == 1
@@ -53,6 +53,13 @@ class ConcurrentLimiterTest(TestCase):
         assert failed_request.limit_exceeded is False
         limiter.finish_request("key", "some_uid")
 
+        failed_requests = limiter.start_requests([("key", 100, "some_uid"), ("key", 5, "other")])
+        assert [(r.limit, r.current_executions, r.limit_exceeded) for r in failed_requests] == [
+            (100, -1, False),
+            (5, -1, False),
+        ]
+        limiter.finish_requests([("key", "some_uid")])
+
     def test_cleanup_stale(self):
         limit = 10
         num_stale = 5
@@ -71,6 +78,58 @@ class ConcurrentLimiterTest(TestCase):
                 self.backend.start_request("foo", limit, "updated_request").current_executions == 1
             )
 
+    def test_start_requests(self):
+        limit = 3
+        with freeze_time("2000-01-01"):
+            self.backend.start_request("foo", limit, "request_id0")
+            infos = self.backend.start_requests(
+                [
+                    ("foo", limit, "request_id1"),
+                    ("bar", limit, "request_id1"),
+                    ("foo", limit, "request_id2"),
+                    ("foo", limit, "request_id3"),
+                ]
+            )
+        assert [(info.current_executions, info.limit_exceeded) for info in infos] == [
+            (2, False),
+            (1, False),
+            (3, False),
+            (3, True),
+        ]
+        assert self.backend.get_concurrent_requests("foo") == limit
+        assert self.backend.get_concurrent_requests("bar") == 1
+
+    def test_start_requests_cleanup_stale(self):
+        request_date = datetime(2000, 1, 1)
+        with freeze_time(request_date):
+            self.backend.start_requests([("foo", 2, "request_id1"), ("foo", 2, "request_id2")])
+        with freeze_time(request_date + timedelta(seconds=DEFAULT_MAX_TTL_SECONDS + 1)):
+            (info,) = self.backend.start_requests([("foo", 2, "updated_request")])
+            assert info.current_executions == 1
+            assert not info.limit_exceeded
+
+    def test_finish_requests(self):
+        with freeze_time("2000-01-01"):
+            self.backend.start_requests(
+                [("foo", 10, "request_id1"), ("foo", 10, "request_id2"), ("bar", 10, "request_id1")]
+            )
+            self.backend.finish_requests(
+                [("foo", "request_id1"), ("bar", "request_id1"), ("baz", "request_id1")]
+            )
+        assert self.backend.get_concurrent_requests("foo") == 1
+        assert self.backend.get_concurrent_requests("bar") == 0
+
+    def test_reap_expired_requests(self):
+        request_date = datetime(2000, 1, 1)
+        with freeze_time(request_date):
+            self.backend.start_requests([("foo", 10, "stale1"), ("bar", 10, "stale2")])
+        with freeze_time(request_date + timedelta(seconds=1)):
+            self.backend.start_request("foo", 10, "fresh")
+        with freeze_time(request_date + timedelta(seconds=DEFAULT_MAX_TTL_SECONDS + 1)):
+            assert self.backend.reap_expired_requests(batch_size=1) == 2
+        assert self.backend.get_concurrent_requests("foo") == 1
+        assert self.backend.get_concurrent_requests("bar") == 0
+
     def test_finish_non_existent(self):
         # this shouldn't crash
         self.backend.finish_request("fasdlfkdsalfkjlasdkjlasdkjflsakj", "fsdlkajflsdakjsda")
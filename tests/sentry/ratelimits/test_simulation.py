@@ -0,0 +1,41 @@
+from sentry.ratelimits.simulation import SimulatedRequest, generate_requests, simulate
+from sentry.ratelimits.sliding_windows import Quota
+
+
+def test_generate_requests():
+    requests = generate_requests(100, 10, num_prefixes=3, max_units=5, start=1000, seed=1)
+
+    assert requests == generate_requests(100, 10, num_prefixes=3, max_units=5, start=1000, seed=1)
+    # roughly 10 requests per second
+    assert 800 < len(requests) < 1200
+    assert {request.prefix for request in requests} == {"org-0", "org-1", "org-2"}
+    assert all(1000 <= request.timestamp < 1100 for request in requests)
+    assert all(1 <= request.requested <= 5 for request in requests)
+    assert [request.timestamp for request in requests] == sorted(
+        request.timestamp for request in requests
+    )
+
+
+def test_simulate_exact_granularity():
+    quota = Quota(window_seconds=10, granularity_seconds=1, limit=5)
+    requests = [SimulatedRequest(timestamp=100 + i, prefix="org", requested=1) for i in range(30)]
+
+    result = simulate(quota, requests)
+
+    # with a granularity of one second the limiter is exact
+    assert result.granted == result.ideal_granted == 15
+    assert result.accuracy == 1.0
+    assert result.requests == result.requested == 30
+    # 10 GETs, one INCRBY and one EXPIRE per request
+    assert result.redis_ops_per_request == 12
+
+
+def test_simulate_coarse_granularity():
+    quota = Quota(window_seconds=60, granularity_seconds=60, limit=100)
+    requests = generate_requests(600, 5, num_prefixes=1, seed=2)
+
+    result = simulate(quota, requests)
+
+    # a window that resets at once admits more than a sliding one
+    assert result.granted >= result.ideal_granted
+    assert result.redis_ops_per_request == 3
@@ -1,16 +1,18 @@
 import pytest
 
+from sentry.ratelimits.simulation import generate_requests
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
+    InMemorySlidingWindowRateLimiter,
     Quota,
     RedisSlidingWindowRateLimiter,
     RequestedQuota,
 )
 
 
-@pytest.fixture
-def limiter():
-    return RedisSlidingWindowRateLimiter()
+@pytest.fixture(params=[RedisSlidingWindowRateLimiter, InMemorySlidingWindowRateLimiter])
+def limiter(request):
+    return request.param()
 
 
 TIMESTAMP_OFFSET = 100
@@ -71,3 +73,54 @@ def test_basic(limiter):
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_in_memory_matches_redis():
+    redis_limiter = RedisSlidingWindowRateLimiter()
+    memory_limiter = InMemorySlidingWindowRateLimiter()
+
+    global_quota = Quota(
+        window_seconds=10, granularity_seconds=1, limit=50, prefix_override="in-memory-all"
+    )
+    quotas = [global_quota, Quota(window_seconds=20, granularity_seconds=5, limit=15)]
+
+    for request in generate_requests(
+        60, 5, num_prefixes=3, max_units=3, start=TIMESTAMP_OFFSET, seed=42
+    ):
+        requests = [
+            RequestedQuota(
+                prefix=f"in-memory-{request.prefix}", requested=request.requested, quotas=quotas
+            )
+        ]
+        assert redis_limiter.check_and_use_quotas(
+            requests, timestamp=request.timestamp
+        ) == memory_limiter.check_and_use_quotas(requests, timestamp=request.timestamp)
+
+
+def test_in_memory_redis_ops():
+    limiter = InMemorySlidingWindowRateLimiter()
+    quotas = [
+        Quota(window_seconds=10, granularity_seconds=1, limit=10),
+        Quota(window_seconds=60, granularity_seconds=30, limit=100),
+    ]
+
+    limiter.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=1, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+
+    # one GET per granule of each quota, one INCRBY and EXPIRE per quota
+    assert limiter.redis_ops == (10 + 2) + 2 * 2
+
+
+def test_in_memory_expiry():
+    limiter = InMemorySlidingWindowRateLimiter()
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=1)]
+    requests = [RequestedQuota(prefix="foo", requested=1, quotas=quotas)]
+
+    assert limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET)[0].granted == 1
+    assert limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET + 9)[0].granted == 0
+    assert limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET + 10)[0].granted == 1
+
+    # counters that left their window are dropped eventually
+    limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET + 100)
+    assert len(limiter.counters) == 1
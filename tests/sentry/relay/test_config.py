@@ -20,7 +20,7 @@ from sentry.dynamic_sampling import (
 from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
 from sentry.models import ProjectKey, ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, get_project_config
+from sentry.relay.config import ProjectConfig, get_project_config, get_project_configs
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.factories import Factories
 from sentry.testutils.helpers import Feature
@@ -129,6 +129,40 @@ def test_get_project_config(default_project, insta_snapshot, django_cache, full)
     insta_snapshot(cfg)
 
 
+def _stable_config(cfg):
+    cfg = cfg.to_dict()
+    for key in ("lastChange", "lastFetch", "rev"):
+        cfg.pop(key, None)
+    return cfg
+
+
+@django_db_all
+@region_silo_test(stable=True)
+@pytest.mark.parametrize("full", [False, True], ids=["slim_config", "full_config"])
+def test_get_project_configs(default_project, default_organization, full):
+    other_project = Factories.create_project(organization=default_organization)
+    other_project.update_option("sentry:blacklisted_ips", ["127.0.0.1"])
+    disabled_project = Factories.create_project(organization=default_organization)
+    disabled_project.update(status=ObjectStatus.PENDING_DELETION)
+    second_key = Factories.create_project_key(default_project)
+    keys = list(
+        ProjectKey.objects.filter(
+            project__in=[default_project, other_project, disabled_project]
+        ).select_related("project__organization")
+    )
+    assert second_key in keys
+
+    configs = get_project_configs(keys, full_config=full)
+
+    assert set(configs) == {key.public_key for key in keys}
+    for key in keys:
+        expected = get_project_config(key.project, full_config=full, project_keys=[key])
+        assert _stable_config(configs[key.public_key]) == _stable_config(expected)
+    assert configs[second_key.public_key].to_dict()["publicKeys"][0]["publicKey"] == (
+        second_key.public_key
+    )
+
+
 SOME_EXCEPTION = RuntimeError("foo")
 
 
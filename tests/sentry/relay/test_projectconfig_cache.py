@@ -23,3 +23,45 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+@django_db_all
+def test_update_many_skips_unchanged(monkeypatch):
+    cache = redis.RedisProjectConfigCache()
+    incr_mock = mock.Mock()
+    monkeypatch.setattr(redis.metrics, "incr", incr_mock)
+    config = {"rev": "1", "config": {"filterSettings": {}, "quotas": [1]}}
+    cache.set_many({"a": config})
+
+    # volatile fields do not count as a change
+    assert cache.update_many({"a": {**config, "rev": "2"}, "b": config}) == {"b"}
+    assert cache.get("a") == config
+    assert incr_mock.call_args_list[-2:] == [
+        mock.call("relay.projectconfig_cache.write", amount=1, tags={"action": "unchanged"}),
+        mock.call("relay.projectconfig_cache.write", amount=1, tags={"action": "set"}),
+    ]
+
+    changed = {"rev": "3", "config": {"filterSettings": {}, "quotas": [2]}}
+    assert cache.update_many({"a": changed}) == {"a"}
+    assert cache.get("a") == changed
+    assert (
+        mock.call("relay.projectconfig_cache.section_changed", tags={"section": "config.quotas"})
+        in incr_mock.call_args_list
+    )
+
+
+@django_db_all
+def test_update_many_rewrites_evicted():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"a": {"disabled": True}})
+    # the hashes outlived the config
+    cache.cluster.delete("relayconfig:a")
+    assert cache.update_many({"a": {"disabled": True}}) == {"a"}
+    assert cache.get("a") == {"disabled": True}
+
+
+def test_section_hashes():
+    config = {"lastFetch": 1, "slug": "foo", "config": {"quotas": [], "features": ["a"]}}
+    hashes = redis.get_section_hashes(config)
+    assert set(hashes) == {"slug", "config.quotas", "config.features"}
+    assert redis.get_section_hashes({**config, "lastFetch": 2}) == hashes
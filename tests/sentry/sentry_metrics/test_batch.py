@@ -1664,3 +1664,39 @@ def test_cardinality_limiter(caplog, settings):
             ],
         )
     ]
+
+
+@patch("sentry.sentry_metrics.consumers.indexer.batch.UseCaseID", MockUseCaseID)
+def test_extract_strings_skips_undecodable_payloads():
+    """
+    Payloads are decoded straight from the raw message bytes; anything that
+    is not valid JSON or not valid UTF-8 is skipped without failing the batch.
+    """
+    message_batch = _construct_messages([(counter_payload, [])])
+    for i, raw_value in enumerate([b"{not json", b'{"name": "\xff\xfe"}'], start=1):
+        message_batch.append(
+            Message(
+                BrokerValue(
+                    KafkaPayload(None, raw_value, []),
+                    Partition(Topic("topic"), 0),
+                    i,
+                    BROKER_TIMESTAMP,
+                )
+            )
+        )
+    outer_message = Message(Value(message_batch, message_batch[-1].committable))
+
+    batch = IndexerBatch(outer_message, True, False, input_codec=_INGEST_CODEC)
+
+    assert batch.skipped_offsets == {PartitionIdxOffset(0, 1), PartitionIdxOffset(0, 2)}
+    assert batch.extract_strings() == {
+        MockUseCaseID.SESSIONS: {
+            1: {
+                "c:sessions/session@none",
+                "environment",
+                "production",
+                "session.status",
+                "init",
+            }
+        }
+    }
@@ -1,7 +1,8 @@
 import time
+from typing import List
 from unittest.mock import patch
 
-from sentry.sentry_metrics.indexer.id_generator import _INDEXER_EPOCH_START, get_id
+from sentry.sentry_metrics.indexer.id_generator import _INDEXER_EPOCH_START, IdLease, get_id
 
 
 def test_get_id() -> None:
@@ -35,3 +36,28 @@ def test_get_id_time_since() -> None:
         original_time = int(id_string[3:36], 2) + _INDEXER_EPOCH_START
 
         assert original_time == int(hardcoded_time)
+
+
+def test_id_lease() -> None:
+    blocks = []
+    next_id = iter(range(1, 1000))
+
+    def fetch_block(size: int) -> List[int]:
+        blocks.append(size)
+        return [next(next_id) for _ in range(size)]
+
+    lease = IdLease(fetch_block, block_size=5)
+
+    assert lease.take(3) == [1, 2, 3]
+    assert lease.take(2) == [4, 5]
+    assert blocks == [5]
+
+    # leases a new block once the current one is used up
+    assert lease.take(1) == [6]
+    assert blocks == [5, 5]
+    assert len(lease) == 4
+
+    # a request larger than a block leases exactly what is missing
+    assert lease.take(10) == list(range(7, 17))
+    assert blocks == [5, 5, 6]
+    assert len(lease) == 0
@@ -1,7 +1,8 @@
 import pytest
 from django.conf import settings
+from freezegun import freeze_time
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import LocalStringIndexerCache, StringIndexerCache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
@@ -81,3 +82,63 @@ def test_separate_namespacing() -> None:
     indexer_cache.set("transactions:3:what", 2)
     assert indexer_cache.get("sessions:3:what") == 1
     assert indexer_cache.get("transactions:3:what") == 2
+
+
+def test_local_cache(use_case_id: str) -> None:
+    cache.clear()
+    local_indexer_cache = StringIndexerCache(
+        **{**settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, "local_cache_size": 2},
+        partition_key=_PARTITION_KEY,
+    )
+    key = f"{use_case_id}:1:local"
+    local_indexer_cache.set(key, 1)
+
+    # Served from the local tier even when the remote entry is gone.
+    cache.clear()
+    assert local_indexer_cache.get(key) == 1
+    assert local_indexer_cache.get_many([key, f"{use_case_id}:1:missing"]) == {
+        key: 1,
+        f"{use_case_id}:1:missing": None,
+    }
+
+    local_indexer_cache.delete(key)
+    assert local_indexer_cache.get(key) is None
+
+
+def test_local_cache_populated_from_remote(use_case_id: str) -> None:
+    cache.clear()
+    local_indexer_cache = StringIndexerCache(
+        **{**settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, "local_cache_size": 10},
+        partition_key=_PARTITION_KEY,
+    )
+    indexer_cache.set_many({f"{use_case_id}:2:a": 1, f"{use_case_id}:2:b": 2})
+
+    assert local_indexer_cache.get_many([f"{use_case_id}:2:a", f"{use_case_id}:2:b"]) == {
+        f"{use_case_id}:2:a": 1,
+        f"{use_case_id}:2:b": 2,
+    }
+    cache.clear()
+    assert local_indexer_cache.get_many([f"{use_case_id}:2:a"]) == {f"{use_case_id}:2:a": 1}
+
+
+def test_local_cache_eviction() -> None:
+    local_cache = LocalStringIndexerCache(max_size=2)
+    local_cache.set_many({"sessions:1:a": 1, "sessions:1:b": 2}, ttl=60)
+    # Touch "a" so that "b" is the least recently used entry.
+    assert local_cache.get_many(["sessions:1:a"]) == {"sessions:1:a": 1}
+    local_cache.set_many({"sessions:1:c": 3}, ttl=60)
+
+    assert local_cache.get_many(["sessions:1:a", "sessions:1:b", "sessions:1:c"]) == {
+        "sessions:1:a": 1,
+        "sessions:1:c": 3,
+    }
+
+
+def test_local_cache_expiry() -> None:
+    local_cache = LocalStringIndexerCache(max_size=2)
+    with freeze_time("2000-01-01") as frozen_time:
+        local_cache.set_many({"sessions:1:a": 1}, ttl=60)
+        assert local_cache.get_many(["sessions:1:a"]) == {"sessions:1:a": 1}
+
+        frozen_time.tick(61)
+        assert local_cache.get_many(["sessions:1:a"]) == {}
@@ -14,7 +14,12 @@ from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 from sentry.ratelimits.cardinality import CardinalityLimiter
 from sentry.sentry_metrics.configuration import IndexerStorage, UseCaseKey, get_ingest_config
 from sentry.sentry_metrics.consumers.indexer.batch import invalid_metric_tags, valid_metric_name
-from sentry.sentry_metrics.consumers.indexer.common import BatchMessages, MetricsBatchBuilder
+from sentry.sentry_metrics.consumers.indexer.common import (
+    AdaptiveBatchController,
+    BatchMessages,
+    MetricsBatchBuilder,
+)
+from sentry.sentry_metrics.consumers.indexer.parallel import Unbatcher
 from sentry.sentry_metrics.consumers.indexer.processing import MessageProcessor
 from sentry.sentry_metrics.indexer.limiters.cardinality import (
     TimeseriesCardinalityLimiter,
@@ -162,6 +167,117 @@ def test_batch_messages_join():
     assert not next_step.submit.called
 
 
+def _adaptive_controller() -> AdaptiveBatchController:
+    return AdaptiveBatchController(
+        min_batch_size=10,
+        max_batch_size=80,
+        min_in_flight=2,
+        max_in_flight=4,
+        target_latency=1.0,
+        target_lag=5.0,
+        adjust_interval=10.0,
+    )
+
+
+def test_adaptive_batch_controller() -> None:
+    controller = _adaptive_controller()
+    now = time.time()
+
+    # nothing observed, both signals are healthy: batches shrink slowly
+    controller.maybe_adjust(now + 10)
+    assert (controller.batch_size, controller.in_flight_limit) == (60, 4)
+
+    # consumer is lagging behind, batches grow to catch up
+    old_message = Message(
+        BrokerValue(
+            KafkaPayload(None, b"value", []),
+            Partition(Topic("topic"), 0),
+            1,
+            datetime.fromtimestamp(now - 60, tz=timezone.utc),
+        )
+    )
+    controller.batch_submitted([old_message])
+    assert controller.in_flight == 1
+    controller.batch_finished()
+    assert controller.in_flight == 0
+    controller.maybe_adjust(now + 20)
+    assert (controller.batch_size, controller.in_flight_limit) == (80, 4)
+
+    # lag is gone, but the indexer is slow: batches shrink
+    fresh_message = Message(
+        BrokerValue(
+            KafkaPayload(None, b"value", []),
+            Partition(Topic("topic"), 0),
+            2,
+            datetime.now(tz=timezone.utc),
+        )
+    )
+    controller.batch_submitted([fresh_message])
+    controller._AdaptiveBatchController__in_flight[0] -= 5
+    controller.batch_finished()
+    controller.maybe_adjust(now + 30)
+    assert (controller.batch_size, controller.in_flight_limit) == (40, 4)
+
+    # lagging and slow: bigger batches, but fewer of them in flight
+    controller.batch_submitted([old_message])
+    controller._AdaptiveBatchController__in_flight[0] -= 5
+    controller.batch_finished()
+    controller.maybe_adjust(now + 40)
+    assert (controller.batch_size, controller.in_flight_limit) == (80, 3)
+
+    # adjustments only happen once per interval
+    controller.maybe_adjust(now + 45)
+    assert (controller.batch_size, controller.in_flight_limit) == (80, 3)
+
+
+def test_batch_messages_adaptive() -> None:
+    next_step = Mock()
+    controller = _adaptive_controller()
+    controller.batch_size = 1
+    controller.in_flight_limit = 1
+
+    batch_messages_step, message1, message2 = _batch_message_set_up(next_step, max_batch_size=2)
+    batch_messages_step._BatchMessages__controller = controller
+
+    # the controller's batch size takes precedence over the static one
+    batch_messages_step.submit(message=message1)
+    assert next_step.submit.call_args == call(Message(Value([message1], message1.committable)))
+    assert controller.in_flight == 1
+
+    # no more batches may be in flight until the previous one is done
+    with pytest.raises(MessageRejected):
+        batch_messages_step.submit(message=message2)
+
+    controller.batch_finished()
+    batch_messages_step.submit(message=message2)
+    assert next_step.submit.call_args == call(Message(Value([message2], message2.committable)))
+
+
+def test_unbatcher_rejected() -> None:
+    next_step = Mock()
+    next_step.submit.side_effect = [MessageRejected(), None]
+    controller = _adaptive_controller()
+    message = Message(
+        BrokerValue(
+            KafkaPayload(None, b"value", []),
+            Partition(Topic("topic"), 0),
+            1,
+            datetime.now(tz=timezone.utc),
+        )
+    )
+    controller.batch_submitted([message])
+    controller.batch_submitted([message])
+    unbatcher = Unbatcher(next_step, controller)
+    batch = Message(Value([message], message.committable))
+
+    # a rejected batch is submitted again and only finishes once
+    with pytest.raises(MessageRejected):
+        unbatcher.submit(batch)
+    assert controller.in_flight == 2
+    unbatcher.submit(batch)
+    assert controller.in_flight == 1
+
+
 def test_metrics_batch_builder():
     max_batch_time = 3.0  # seconds
     max_batch_size = 2
@@ -3,9 +3,11 @@ from typing import Mapping, Set
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.base import FetchType, Metadata, UseCaseKeyCollection
 from sentry.sentry_metrics.indexer.cache import CachingIndexer
+from sentry.sentry_metrics.indexer.postgres.models import PerfStringIndexer, StringIndexer
 from sentry.sentry_metrics.indexer.postgres.postgres_v2 import PGStringIndexerV2, indexer_cache
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
 
 
@@ -40,3 +42,56 @@ class PostgresIndexerV2Test(TestCase):
         )
 
         assert indexer_cache.get(key) is None
+
+    @override_options({"sentry-metrics.indexer.id-leasing.block-size": 10})
+    def test_bulk_record_with_leased_ids(self):
+        existing = StringIndexer.objects.create(organization_id=self.org2.id, string="hey")
+        indexer = PGStringIndexerV2()
+        get_db_records = indexer._get_db_records
+        reads = []
+
+        def read_records(keys):
+            reads.append(keys)
+            # the initial read misses "hey", as if it was written concurrently
+            return [] if len(reads) == 1 else get_db_records(keys)
+
+        indexer._get_db_records = read_records  # type: ignore[assignment]
+        results = indexer.bulk_record({self.use_case_id: {self.org2.id: self.strings}})
+
+        records = {
+            obj.string: obj.id for obj in StringIndexer.objects.filter(organization_id=self.org2.id)
+        }
+        assert records["hey"] == existing.id
+        assert results[self.use_case_id][self.org2.id] == records
+
+        meta = results.get_fetch_metadata()[self.use_case_id][self.org2.id]
+        assert_fetch_type_for_tag_string_set(meta, FetchType.FIRST_SEEN, self.strings)
+
+        # only the conflicting string is read back after the insert
+        assert len(reads) == 2
+        assert reads[1] == UseCaseKeyCollection({self.use_case_id: {self.org2.id: {"hey"}}})
+
+        # the remaining ids of the leased block are used for the next writes
+        lease = indexer._id_leases[StringIndexer]
+        assert len(lease) == 7
+        results = indexer.bulk_record({self.use_case_id: {self.org2.id: {"howdy"}}})
+        assert len(lease) == 6
+        assert results[self.use_case_id][self.org2.id]["howdy"] == (
+            StringIndexer.objects.get(organization_id=self.org2.id, string="howdy").id
+        )
+
+    @override_options({"sentry-metrics.indexer.id-leasing.block-size": 10})
+    def test_bulk_record_with_leased_ids_performance(self):
+        indexer = PGStringIndexerV2()
+        use_case_id = UseCaseID.TRANSACTIONS
+
+        results = indexer.bulk_record({use_case_id: {self.org2.id: self.strings}})
+
+        records = {
+            obj.string: obj.id
+            for obj in PerfStringIndexer.objects.filter(
+                organization_id=self.org2.id, use_case_id=use_case_id.value
+            )
+        }
+        assert results[use_case_id][self.org2.id] == records
+        assert len(indexer._id_leases[PerfStringIndexer]) == 7
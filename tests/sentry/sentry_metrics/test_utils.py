@@ -0,0 +1,37 @@
+import pytest
+
+from sentry.sentry_metrics.configuration import UseCaseKey
+from sentry.sentry_metrics.indexer.strings import SHARED_STRINGS
+from sentry.sentry_metrics.utils import (
+    TAG_NOT_SET,
+    MetricIndexNotFound,
+    bulk_reverse_resolve,
+    bulk_reverse_resolve_tag_value,
+)
+
+pytestmark = pytest.mark.sentry_metrics
+
+USE_CASE_ID = UseCaseKey.RELEASE_HEALTH
+PRODUCTION = SHARED_STRINGS["production"]
+RELEASE = SHARED_STRINGS["release"]
+
+
+def test_bulk_reverse_resolve():
+    assert bulk_reverse_resolve(USE_CASE_ID, 1, {PRODUCTION, RELEASE, 666}) == {
+        PRODUCTION: "production",
+        RELEASE: "release",
+    }
+    assert bulk_reverse_resolve(USE_CASE_ID, 1, set()) == {}
+
+
+def test_bulk_reverse_resolve_tag_value():
+    values = {PRODUCTION, "raw", None, TAG_NOT_SET}
+    assert bulk_reverse_resolve_tag_value(USE_CASE_ID, 1, values, weak=True) == {
+        PRODUCTION: "production",
+        "raw": "raw",
+        None: None,
+        TAG_NOT_SET: None,
+    }
+
+    with pytest.raises(MetricIndexNotFound):
+        bulk_reverse_resolve_tag_value(USE_CASE_ID, 1, {PRODUCTION, 666})
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from sentry.stacktraces import processing
+from sentry.stacktraces.processing import StacktraceProcessor, process_stacktraces
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.cache import cache
+
+
+class UppercaseProcessor(StacktraceProcessor):
+    calls = 0
+
+    def handles_frame(self, frame, stacktrace_info):
+        return True
+
+    def preprocess_frame(self, processable_frame):
+        processable_frame.set_cache_key_from_values([self.project.id, processable_frame.frame])
+
+    def process_frame(self, processable_frame, processing_task):
+        if processable_frame.cache_value is not None:
+            return processable_frame.cache_value
+
+        UppercaseProcessor.calls += 1
+        frame = dict(processable_frame.frame, function=processable_frame["function"].upper())
+        rv = [frame], None, []
+        processable_frame.set_cache_value(rv)
+        return rv
+
+
+class FrameCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        UppercaseProcessor.calls = 0
+        processing._local_frame_cache = None
+
+    def get_data(self):
+        return {
+            "project": self.project.id,
+            "stacktrace": {
+                "frames": [{"function": "foo"}, {"function": "bar"}, {"function": "foo"}]
+            },
+        }
+
+    def process(self):
+        data = self.get_data()
+        process_stacktraces(
+            data,
+            make_processors=lambda data, infos: [UppercaseProcessor(data, infos, self.project)],
+        )
+        return [frame["function"] for frame in data["stacktrace"]["frames"]]
+
+    def test_frame_cache(self):
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
+
+        # Every frame is restored from the cache, including identical frames.
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
+
+    def test_local_tier(self):
+        self.process()
+
+        # The in-memory tier is consulted before the default cache.
+        with patch.object(cache, "get_many") as get_many:
+            assert self.process() == ["FOO", "BAR", "FOO"]
+        get_many.assert_not_called()
+
+        # Values from the default cache are kept in memory too.
+        processing._local_frame_cache = None
+        assert self.process() == ["FOO", "BAR", "FOO"]
+        with patch.object(cache, "get_many") as get_many:
+            assert self.process() == ["FOO", "BAR", "FOO"]
+        get_many.assert_not_called()
+        assert UppercaseProcessor.calls == 3
+
+    def test_local_tier_disabled(self):
+        with override_options({"processing.frame-cache.local-max-size": 0}):
+            self.process()
+            assert processing.get_local_frame_cache() is None
+            assert self.process() == ["FOO", "BAR", "FOO"]
+        assert UppercaseProcessor.calls == 3
@@ -10,6 +10,7 @@ from freezegun import freeze_time
 from sentry.models import File, FileBlob, FileBlobOwner, ReleaseFile
 from sentry.models.artifactbundle import (
     ArtifactBundle,
+    ArtifactBundleIndex,
     DebugIdArtifactBundle,
     ProjectArtifactBundle,
     ReleaseArtifactBundle,
@@ -294,6 +295,74 @@ class AssembleArtifactsTest(BaseAssembleTest):
             # We expect to have only two entries, since we have duplicated debug_id, file_type pairs.
             assert len(debug_id_artifact_bundles) == 2
 
+    def test_artifacts_index(self):
+        bundle_file = self.create_artifact_bundle_zip(
+            fixture_path="artifact_bundle_debug_ids", project=self.project.id
+        )
+        blob1 = FileBlob.from_file(ContentFile(bundle_file))
+        total_checksum = sha1(bundle_file).hexdigest()
+
+        for version, dist in [(None, None), ("1.0", "android"), ("1.0", "android")]:
+            assemble_artifacts(
+                org_id=self.organization.id,
+                project_ids=[self.project.id],
+                version=version,
+                dist=dist,
+                checksum=total_checksum,
+                chunks=[blob1.checksum],
+                upload_as_artifact_bundle=True,
+            )
+
+        # Uploading the same bundle again replaces its entries.
+        entries = {
+            (entry.url, entry.file_path): entry
+            for entry in ArtifactBundleIndex.objects.filter(organization_id=self.organization.id)
+        }
+        assert len(entries) == 6
+        assert {entry.release_name for entry in entries.values()} == {"1.0"}
+        assert {entry.dist_name for entry in entries.values()} == {"android"}
+        assert len({entry.artifact_bundle_id for entry in entries.values()}) == 1
+
+        minified_entry = entries["~/index.min.js", "files/_/_/index.min.js"]
+        assert str(minified_entry.debug_id) == "eb6e60f1-65ff-4f6f-adff-f1bbeded627b"
+        assert minified_entry.source_file_type == SourceFileType.MINIFIED_SOURCE.value
+        source_map_entry = entries["~/index.js.map", "files/_/_/index.js.map"]
+        assert str(source_map_entry.debug_id) == "eb6e60f1-65ff-4f6f-adff-f1bbeded627b"
+        assert source_map_entry.source_file_type == SourceFileType.SOURCE_MAP.value
+        # Invalid debug ids are not indexed, but the files still are by url.
+        invalid_entry = entries["~/bundle1.min.js", "files/_/_/bundle1.min.js"]
+        assert invalid_entry.debug_id is None
+        assert invalid_entry.source_file_type is None
+
+    def test_artifact_bundle_read_once(self):
+        bundle_file = self.create_artifact_bundle_zip(
+            fixture_path="artifact_bundle_debug_ids", project=self.project.id
+        )
+        blob1 = FileBlob.from_file(ContentFile(bundle_file))
+        total_checksum = sha1(bundle_file).hexdigest()
+
+        # The bundle is only read from the file assembled from the chunks.
+        with patch.object(File, "getfile") as getfile:
+            assemble_artifacts(
+                org_id=self.organization.id,
+                project_ids=[self.project.id],
+                version="1.0",
+                dist="android",
+                checksum=total_checksum,
+                chunks=[blob1.checksum],
+                upload_as_artifact_bundle=True,
+            )
+        getfile.assert_not_called()
+
+        status, details = get_assemble_status(
+            AssembleTask.ARTIFACT_BUNDLE, self.organization.id, total_checksum
+        )
+        assert status == ChunkFileState.OK
+        assert (
+            DebugIdArtifactBundle.objects.filter(organization_id=self.organization.id).count() == 2
+        )
+        assert ArtifactBundleIndex.objects.filter(organization_id=self.organization.id).count() == 6
+
     def test_upload_multiple_artifacts_with_same_bundle_id(self):
         bundle_file = self.create_artifact_bundle_zip(
             fixture_path="artifact_bundle_debug_ids", project=self.project.id
@@ -8,6 +8,7 @@ from sentry.models import (
     ProjectOwnership,
     Repository,
 )
+from sentry.ownership.grammar import Owner, resolve_actors
 from sentry.tasks.codeowners import code_owners_auto_sync, update_code_owners_schema
 from sentry.testutils import TestCase
 
@@ -79,6 +80,26 @@ class CodeOwnersTest(TestCase):
 
         assert code_owners.schema == {"$version": 1, "rules": []}
 
+    def test_team_added_to_project(self):
+        team = self.create_team(organization=self.organization, slug="new-team")
+        self.create_external_team(team=team, integration=self.integration)
+        # The team was resolved before it had access to the project, eg. by a previous auto sync.
+        assert resolve_actors([Owner("team", "new-team")], self.project.id, use_cache=True) == {
+            Owner("team", "new-team"): None
+        }
+
+        with self.tasks() and self.feature({"organizations:integrations-codeowners": True}):
+            self.project.add_team(team)
+            update_code_owners_schema(organization=self.organization, projects=[self.project])
+
+        code_owners = ProjectCodeOwners.objects.get(id=self.code_owners.id)
+        assert code_owners.schema["rules"] == [
+            {
+                "matcher": {"type": "codeowners", "pattern": "docs/*"},
+                "owners": [{"type": "team", "identifier": "new-team"}],
+            }
+        ]
+
     @patch(
         "sentry.integrations.github.GitHubIntegration.get_codeowner_file",
         return_value=LATEST_GITHUB_CODEOWNERS,
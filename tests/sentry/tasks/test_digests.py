@@ -5,8 +5,9 @@ from django.core import mail
 import sentry
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.notifications import event_to_record
+from sentry.mail import mail_adapter
 from sentry.models import ProjectOwnership, Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.tasks.digests import deliver_digest, deliver_digests
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.helpers.features import with_feature
@@ -51,3 +52,66 @@ class DeliverDigestTest(TestCase):
     def test_no_records(self):
         # This shouldn't error if no records are present
         deliver_digest(f"mail:p:{self.project.id}:IssueOwners:")
+
+
+class DeliverDigestsTest(TestCase):
+    @patch.object(sentry, "digests")
+    def test_delivers_all_timelines(self, digests):
+        backend = RedisBackend()
+        digests.digest_many = backend.digest_many
+
+        rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+        ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
+        event = self.store_event(
+            data={"timestamp": iso_format(before_now(days=1)), "fingerprint": ["group-1"]},
+            project_id=self.project.id,
+        )
+        keys = [
+            f"mail:p:{self.project.id}:IssueOwners:",
+            f"mail:p:{self.project.id}:Member:{self.user.id}",
+        ]
+        for key in keys:
+            backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+
+        with self.tasks():
+            deliver_digests(keys)
+        assert len(mail.outbox) == 2
+
+    @patch.object(sentry, "digests")
+    def test_failing_notification(self, digests):
+        backend = RedisBackend()
+        digests.digest_many = backend.digest_many
+
+        rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+        ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
+        event = self.store_event(
+            data={"timestamp": iso_format(before_now(days=1)), "fingerprint": ["group-1"]},
+            project_id=self.project.id,
+        )
+        keys = [
+            f"mail:p:{self.project.id}:IssueOwners:",
+            f"mail:p:{self.project.id}:Member:{self.user.id}",
+        ]
+        for key in keys:
+            backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+
+        notify_digest = mail_adapter.notify_digest
+        calls = []
+
+        def fail_once(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise Exception("boom")
+            return notify_digest(*args, **kwargs)
+
+        with self.tasks(), patch.object(mail_adapter, "notify_digest", side_effect=fail_once):
+            deliver_digests(keys)
+
+        # The notification after the failing one is still delivered.
+        assert len(calls) == 2
+        assert len(mail.outbox) == 1
+
+    @patch.object(sentry, "digests")
+    def test_deleted_project(self, digests):
+        deliver_digests(["mail:p:0:IssueOwners:"])
+        digests.delete.assert_called_once_with("mail:p:0:IssueOwners:")
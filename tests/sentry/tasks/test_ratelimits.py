@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+
+from freezegun import freeze_time
+
+from sentry.ratelimits.concurrent import DEFAULT_MAX_TTL_SECONDS
+from sentry.ratelimits.utils import concurrent_limiter
+from sentry.tasks.ratelimits import reap_concurrent_requests
+from sentry.testutils import TestCase
+
+
+class ReapConcurrentRequestsTest(TestCase):
+    def test_task_persistent_name(self):
+        assert reap_concurrent_requests.name == "sentry.tasks.ratelimits.reap_concurrent_requests"
+
+    def test_simple(self):
+        limiter = concurrent_limiter()
+        request_date = datetime(2000, 1, 1)
+        with freeze_time(request_date):
+            limiter.start_request("foo", 10, "leaked")
+        with freeze_time(request_date + timedelta(seconds=DEFAULT_MAX_TTL_SECONDS + 1)):
+            limiter.start_request("bar", 10, "running")
+            reap_concurrent_requests()
+        assert limiter.get_concurrent_requests("foo") == 0
+        assert limiter.get_concurrent_requests("bar") == 1
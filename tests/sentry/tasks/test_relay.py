@@ -80,6 +80,7 @@ def redis_cache(monkeypatch):
 
     cache = RedisProjectConfigCache()
     monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", cache.set_many)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.update_many", cache.update_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.delete_many", cache.delete_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache.get)
 
@@ -89,3 +89,12 @@ class BulkDeleteObjectsTest(TestCase):
         result = bulk_delete_objects(UserReport, id__in=[r.id for r in records], limit=5)
         assert result, "Still more work to do"
         assert len(UserReport.objects.all()) == 5
+
+    def test_sharding(self):
+        records = [self.create_userreport(group=self.group, event_id=i) for i in range(10)]
+
+        result = bulk_delete_objects(
+            UserReport, id__in=[r.id for r in records], num_shards=2, shard_id=1
+        )
+        assert result, "Could be more work to do"
+        assert {r.id % 2 for r in UserReport.objects.all()} == {0}